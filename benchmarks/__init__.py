@@ -0,0 +1 @@
+"""Offline benchmarks for the scrapers (not part of the installed package)"""
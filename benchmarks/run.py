@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""Offline scraper benchmark against a local fixture reservation server.
+
+Serves the pages in benchmarks/fixtures/ from 127.0.0.1 and runs check_tent (and thus the
+configured scrapers) against them for a number of cycles. Reports latency percentiles per
+tent and per cycle, CPU time and peak RSS (including Chromium child processes on Linux).
+Concurrent checks share the browser, so a sequential pass afterwards attributes CPU time
+and peak RSS to each tent.
+
+Usage:
+    python -m benchmarks.run --cycles 5 --json bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from oktoberfest_bot import __version__
+from oktoberfest_bot.main import check_tent
+from oktoberfest_bot.metrics import STAGE_SECONDS
+from oktoberfest_bot.notifiers import BaseNotifier
+from oktoberfest_bot.scrapers import BrowserPool, create_http_session
+from oktoberfest_bot.state_manager import StateManager
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Time slots answered by the Livewire-style update endpoint, keyed by date value.
+LIVEWIRE_SLOTS: Dict[str, List[Dict[str, Any]]] = {
+    '19': [{'value': '101', 'text': 'Mittag 11:00 - 15:30'}, {'value': '102', 'text': 'Abend 16:30 - 23:00'}],
+    '20': [{'value': '103', 'text': 'Abend 16:30 - 23:00'}],
+    '24': [{'value': '104', 'text': 'Mittag 11:00 - 15:30', 'disabled': True}, {'value': '105', 'text': 'Abend 17:00'}],
+    '25': [{'value': '106', 'text': 'Abend 17:00 - 23:00'}],
+    '26': [{'value': '107', 'text': 'Mittag 11:00'}, {'value': '108', 'text': 'Abend 17:00'}],
+    '30': [],
+}
+
+# Static assets the fixture pages reference (sized like typical images/fonts).
+STATIC_SIZES = {'.png': 40_000, '.jpg': 250_000, '.woff2': 60_000, '.css': 15_000}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves fixture pages, static assets and the Livewire-style update endpoint."""
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _delay(self, query: Dict[str, List[str]]):
+        delay_ms = int(query.get('delay', ['0'])[0])
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        page = FIXTURES_DIR / f"{url.path.strip('/')}.html"
+        if url.path.startswith('/static/'):
+            size = STATIC_SIZES.get(Path(url.path).suffix, 1_000)
+            self._send(200, b'\0' * size, 'application/octet-stream')
+        elif page.is_file():
+            self._delay(query)
+            status = 403 if url.path == '/botcheck' else 200
+            self._send(status, page.read_bytes(), 'text/html; charset=utf-8')
+        else:
+            self._send(404, b'not found', 'text/plain')
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/livewire/update':
+            self._send(404, b'not found', 'text/plain')
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        self._delay(parse_qs(url.query))
+        value = (payload.get('updates') or [{}])[0].get('value', '')
+        body = json.dumps({'slots': LIVEWIRE_SLOTS.get(value, [])}).encode()
+        self._send(200, body, 'application/json')
+
+
+def start_fixture_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_tents(base_url: str, delay_ms: int, include_botcheck: bool) -> List[Dict[str, Any]]:
+    """One benchmark tent per fixture layout (mirrors the shapes in config/tents.json)."""
+    tents = [
+        {
+            'id': 'bench-plain',
+            'name': 'Bench Plain Select',
+            'url': f"{base_url}/plain?delay={delay_ms}",
+            'scraper_type': 'form_select',
+            'selector': 'select.form-select',
+        },
+        {
+            'id': 'bench-plain-http',
+            'name': 'Bench Plain Select (HTTP)',
+            'url': f"{base_url}/plain?delay={delay_ms}",
+            'scraper_type': 'http_select',
+            'selector': 'select.form-select',
+        },
+        {
+            'id': 'bench-livewire',
+            'name': 'Bench Livewire',
+            'url': f"{base_url}/livewire?delay={delay_ms}",
+            'scraper_type': 'form_select',
+            'selector': 'select[id="data.createBookingStepOneForm.date"]',
+        },
+        {
+            'id': 'bench-livewire-time',
+            'name': 'Bench Livewire (time selector)',
+            'url': f"{base_url}/livewire?delay={delay_ms}",
+            'scraper_type': 'form_select',
+            'selector': 'select[id="data.createBookingStepOneForm.date"]',
+            'time_selector': 'select[id="data.createBookingStepOneForm.booking_list_id"]',
+        },
+    ]
+    if include_botcheck:
+        tents.append({
+            'id': 'bench-botcheck',
+            'name': 'Bench Bot Check',
+            'url': f"{base_url}/botcheck",
+            'scraper_type': 'form_select',
+            'selector': 'select.form-select',
+            'selector_timeout': 2000,
+        })
+    return tents
+
+
+class RecordingNotifier(BaseNotifier):
+    """Notifier that only counts messages."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages: List[str] = []
+
+    async def send_notification(self, message: str) -> Optional[int]:
+        self.messages.append(message)
+        return len(self.messages)
+
+
+def _descendant_pids(root: int) -> List[int]:
+    """Linux-only: all live descendants of `root` (e.g. Chromium and its renderers)."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    result, stack = [], [root]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            result.append(child)
+            stack.append(child)
+    return result
+
+
+def _proc_cpu_seconds(pid: int) -> float:
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def _proc_rss_kb(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+class ResourceSampler:
+    """Tracks CPU seconds and peak RSS of this process plus its children."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_rss_kb = 0
+        self.linux = os.path.isdir('/proc')
+
+    def cpu_seconds(self) -> Dict[str, float]:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        children = 0.0
+        if self.linux:
+            children = sum(_proc_cpu_seconds(pid) for pid in _descendant_pids(os.getpid()))
+        return {'python': usage.ru_utime + usage.ru_stime, 'children': children}
+
+    def sample(self) -> int:
+        if self.linux:
+            rss = _proc_rss_kb(os.getpid()) + sum(_proc_rss_kb(p) for p in _descendant_pids(os.getpid()))
+        else:
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.peak_rss_kb = max(self.peak_rss_kb, rss)
+        return rss
+
+    def reset_peak(self) -> int:
+        """Restart peak tracking from the current RSS (returned)."""
+        self.peak_rss_kb = 0
+        return self.sample()
+
+    async def run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        'n': len(ordered),
+        'mean': round(statistics.fmean(ordered), 4),
+        'p50': round(pick(0.50), 4),
+        'p90': round(pick(0.90), 4),
+        'p99': round(pick(0.99), 4),
+        'max': round(ordered[-1], 4),
+    }
+
+
+def stage_summary() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Per tent and stage: count, mean and max seconds from the metrics registry."""
+    stages: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for (stage, tent), data in STAGE_SECONDS.values.items():
+        count = data[-2]
+        if count:
+            stages.setdefault(tent or '_global', {})[stage] = {
+                'n': int(count),
+                'mean': round(data[-3] / count, 4),
+                'max': round(data[-1], 4),
+            }
+    return stages
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    logger = logging.getLogger('benchmark')
+    server = start_fixture_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    tents = build_tents(base_url, args.delay, args.botcheck)
+    if args.tents:
+        tents = [t for t in tents if t['id'] in args.tents]
+    for tent in tents:
+        if args.no_block:
+            tent['block_resources'] = False
+
+    workdir = tempfile.mkdtemp(prefix='okb-bench-')
+    state_manager = StateManager(os.path.join(workdir, 'state.json'))
+    notifier = RecordingNotifier()
+    browser_pool = BrowserPool()
+    http_session = create_http_session()
+    sampler = ResourceSampler()
+    sampler_task = asyncio.create_task(sampler.run())
+
+    latencies: Dict[str, List[float]] = {t['id']: [] for t in tents}
+    errors: Dict[str, int] = {t['id']: 0 for t in tents}
+    cycles: List[Dict[str, Any]] = []
+    per_tent: Dict[str, Dict[str, Any]] = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(tent: Dict[str, Any]):
+        async with semaphore:
+            start = time.perf_counter()
+            await check_tent(tent, state_manager, notifier, logger, browser_pool, http_session)
+            latencies[tent['id']].append(time.perf_counter() - start)
+            if state_manager.get_consecutive_errors(tent['id']):
+                errors[tent['id']] += 1
+
+    try:
+        for cycle in range(args.cycles):
+            cpu_before = sampler.cpu_seconds()
+            start = time.perf_counter()
+            await asyncio.gather(*(one(t) for t in tents))
+            wall = time.perf_counter() - start
+            cpu_after = sampler.cpu_seconds()
+            cycles.append({
+                'cycle': cycle,
+                'wall_seconds': round(wall, 4),
+                'cpu_seconds_python': round(cpu_after['python'] - cpu_before['python'], 4),
+                # Live child processes only; the first cycle includes the browser launch.
+                'cpu_seconds_children': round(max(0.0, cpu_after['children'] - cpu_before['children']), 4),
+                'rss_kb': sampler.sample(),
+            })
+            print(f"cycle {cycle}: {wall:.2f}s", file=sys.stderr)
+
+        # Sequential pass with a warm browser: one tent at a time, so CPU and RSS are its own.
+        overall_peak_kb = sampler.peak_rss_kb
+        for tent in tents if args.per_tent_runs > 0 else []:
+            rss_before = sampler.reset_peak()
+            cpu_before = sampler.cpu_seconds()
+            for _ in range(args.per_tent_runs):
+                await check_tent(tent, state_manager, notifier, logger, browser_pool, http_session)
+            cpu_after = sampler.cpu_seconds()
+            sampler.sample()
+            per_tent[tent['id']] = {
+                'runs': args.per_tent_runs,
+                'cpu_seconds_python': round((cpu_after['python'] - cpu_before['python']) / args.per_tent_runs, 4),
+                'cpu_seconds_children': round(
+                    max(0.0, cpu_after['children'] - cpu_before['children']) / args.per_tent_runs, 4),
+                'peak_rss_kb': sampler.peak_rss_kb,
+                'rss_growth_kb': max(0, sampler.peak_rss_kb - rss_before),
+            }
+            overall_peak_kb = max(overall_peak_kb, sampler.peak_rss_kb)
+        sampler.peak_rss_kb = overall_peak_kb
+    finally:
+        sampler_task.cancel()
+        await browser_pool.close()
+        await http_session.close()
+        server.shutdown()
+
+    return {
+        'meta': {
+            'version': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cycles': args.cycles,
+            'concurrency': args.concurrency,
+            'server_delay_ms': args.delay,
+            'per_tent_runs': args.per_tent_runs,
+            'block_resources': not args.no_block,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'tents': {
+            tent_id: {
+                'latency_seconds': percentiles(values),
+                'errors': errors[tent_id],
+                'resources': per_tent.get(tent_id, {}),
+            }
+            for tent_id, values in latencies.items()
+        },
+        'cycles': {
+            'wall_seconds': percentiles([c['wall_seconds'] for c in cycles]),
+            'detail': cycles,
+        },
+        'stages': stage_summary(),
+        'peak_rss_kb': sampler.peak_rss_kb,
+        'notifications': len(notifier.messages),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{'tent':<24} {'n':>3} {'p50':>8} {'p90':>8} {'max':>8} {'errors':>6}")
+    for tent_id, data in report['tents'].items():
+        lat = data['latency_seconds']
+        if lat:
+            print(f"{tent_id:<24} {lat['n']:>3} {lat['p50']:>8.3f} {lat['p90']:>8.3f} {lat['max']:>8.3f} {data['errors']:>6}")
+    resources = {tent_id: data['resources'] for tent_id, data in report['tents'].items() if data['resources']}
+    if resources:
+        print(f"{'tent (sequential)':<24} {'cpu py':>8} {'cpu ch':>8} {'peak MB':>8} {'+MB':>6}")
+        for tent_id, res in resources.items():
+            print(
+                f"{tent_id:<24} {res['cpu_seconds_python']:>8.3f} {res['cpu_seconds_children']:>8.3f}"
+                f" {res['peak_rss_kb'] / 1024:>8.0f} {res['rss_growth_kb'] / 1024:>6.1f}"
+            )
+    wall = report['cycles']['wall_seconds']
+    if wall:
+        print(f"cycle wall: p50={wall['p50']:.3f}s p90={wall['p90']:.3f}s max={wall['max']:.3f}s")
+    print(f"peak RSS: {report['peak_rss_kb'] / 1024:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--cycles', type=int, default=5, help='number of check cycles (default 5)')
+    parser.add_argument('--concurrency', type=int, default=3, help='concurrent checks per cycle (default 3)')
+    parser.add_argument('--delay', type=int, default=150, help='server response delay in ms (default 150)')
+    parser.add_argument('--per-tent-runs', type=int, default=3,
+                        help='sequential checks per tent for CPU/RSS attribution (default 3, 0 to skip)')
+    parser.add_argument('--tents', nargs='*', help='only run these benchmark tent ids')
+    parser.add_argument('--botcheck', action='store_true', help='include the bot-check interstitial tent')
+    parser.add_argument('--no-block', action='store_true', help='disable resource blocking')
+    parser.add_argument('--json', metavar='PATH', help="write the machine-readable report here ('-' for stdout)")
+    parser.add_argument('--verbose', action='store_true', help='show scraper logs')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+    )
+
+    report = asyncio.run(run_benchmark(args))
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Per-tent circuit breaker for failing sites"""
+
+import logging
+import random
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import CIRCUIT_STATE, CIRCUIT_TRANSITIONS
+from .polling import tent_setting
+from .state_manager import StateManager
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+_STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_BACKOFF_BASE = 300
+DEFAULT_BACKOFF_MAX = 3600
+
+
+class CircuitBreaker:
+    """Backs off tents whose checks keep failing.
+
+    - closed: checks run at the normal interval
+    - open: after `breaker_threshold` consecutive errors the next check is delayed by
+      `breaker_backoff_base * 2 ** (errors - threshold)` seconds (with +-20% jitter),
+      capped at `breaker_backoff_max`
+    - half-open: that delayed check is a probe; success closes the circuit, another
+      failure re-opens it with a doubled delay
+
+    The failure count is StateManager's consecutive_errors, so a restart resumes the
+    backoff instead of hammering a site that was already failing. Settings come from the
+    tent config and fall back to the main config; `circuit_breaker: false` disables it.
+    """
+
+    def __init__(
+        self,
+        state_manager: StateManager,
+        config: Optional[Dict[str, Any]] = None,
+        interval_fn: Optional[Callable[[Dict[str, Any]], float]] = None,
+    ):
+        self.state_manager = state_manager
+        self.config = config or {}
+        self.interval_fn = interval_fn
+        self._states: Dict[str, str] = {}
+
+    def state(self, tent_id: str) -> str:
+        return self._states.get(tent_id, CLOSED)
+
+    def _set_state(self, tent_id: str, state: str):
+        if self._states.get(tent_id, CLOSED) != state:
+            CIRCUIT_TRANSITIONS.inc(tent=tent_id, state=state)
+        self._states[tent_id] = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state], tent=tent_id)
+
+    def _base_interval(self, tent: Dict[str, Any]) -> float:
+        if self.interval_fn is not None:
+            return float(self.interval_fn(tent))
+        return float(tent.get('check_interval', 180))
+
+    def backoff(self, tent: Dict[str, Any]) -> Optional[float]:
+        """Seconds to hold the circuit open, or None while it is closed."""
+        if not tent_setting(tent, self.config, 'circuit_breaker', True):
+            return None
+        threshold = max(1, int(tent_setting(tent, self.config, 'breaker_threshold', DEFAULT_FAILURE_THRESHOLD)))
+        errors = self.state_manager.get_consecutive_errors(tent['id'])
+        if errors < threshold:
+            return None
+        base = float(tent_setting(tent, self.config, 'breaker_backoff_base', DEFAULT_BACKOFF_BASE))
+        ceiling = float(tent_setting(tent, self.config, 'breaker_backoff_max', DEFAULT_BACKOFF_MAX))
+        delay = min(ceiling, base * (2 ** min(errors - threshold, 16)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def interval_for(self, tent: Dict[str, Any]) -> float:
+        """Next check delay for a tent; also moves the circuit after each check."""
+        tent_id = tent['id']
+        interval = self._base_interval(tent)
+        delay = self.backoff(tent)
+        previous = self.state(tent_id)
+
+        if delay is None:
+            if previous != CLOSED:
+                logger.info(f"{tent_id}: Circuit closed; back to normal checks")
+            self._set_state(tent_id, CLOSED)
+            return interval
+
+        errors = self.state_manager.get_consecutive_errors(tent_id)
+        if previous == HALF_OPEN:
+            logger.warning(f"{tent_id}: Probe failed; circuit stays open for {delay:.0f}s ({errors} consecutive errors)")
+        elif previous == CLOSED:
+            logger.warning(f"{tent_id}: Circuit opened after {errors} consecutive errors; next probe in {delay:.0f}s")
+        self._set_state(tent_id, OPEN)
+        return max(interval, delay)
+
+    def before_check(self, tent: Dict[str, Any]):
+        """Mark a check of an open circuit as the half-open probe."""
+        if self.state(tent['id']) == OPEN:
+            logger.info(f"{tent['id']}: Circuit half-open; sending probe check")
+            self._set_state(tent['id'], HALF_OPEN)
+
+    def initial_delay(self, tent: Dict[str, Any]) -> float:
+        """Delay before the first check after startup (non-zero if failures were persisted)."""
+        if self.backoff(tent) is None:
+            self._set_state(tent['id'], CLOSED)
+            return 0.0
+        return self.interval_for(tent)
@@ -3,7 +3,11 @@
 import json
 import os
 import sys
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+
+class ConfigError(Exception):
+    """A configuration file is missing or invalid"""
 
 
 class ConfigLoader:
@@ -12,61 +16,107 @@ class ConfigLoader:
     def __init__(self, config_path: str, tents_path: str):
         self.config_path = config_path
         self.tents_path = tents_path
-        self.config = self._load_config()
-        self.tents = self._load_tents()
+        try:
+            self.config = self._load_config()
+            self.tents = self._load_tents()
+        except ConfigError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        self._stamp = self._file_stamp()
 
     def _load_config(self) -> Dict[str, Any]:
         """Load main configuration file"""
         if not os.path.exists(self.config_path):
-            print(f"Error: Config file not found: {self.config_path}")
-            print(f"Please copy config.example.json to config.json and update with your settings")
-            sys.exit(1)
+            raise ConfigError(
+                f"Config file not found: {self.config_path}\n"
+                "Please copy config.example.json to config.json and update with your settings"
+            )
 
-        with open(self.config_path, 'r') as f:
-            config = json.load(f)
+        try:
+            with open(self.config_path, 'r') as f:
+                config = json.load(f)
+        except ValueError as e:
+            raise ConfigError(f"Invalid JSON in {self.config_path}: {e}")
 
         # Validate required fields
         required_fields = ['telegram_bot_token', 'telegram_chat_id', 'state_file', 'log_file']
         missing = [field for field in required_fields if field not in config]
 
         if missing:
-            print(f"Error: Missing required config fields: {', '.join(missing)}")
-            sys.exit(1)
+            raise ConfigError(f"Missing required config fields: {', '.join(missing)}")
 
         return config
 
     def _load_tents(self) -> List[Dict[str, Any]]:
         """Load tent configurations"""
         if not os.path.exists(self.tents_path):
-            print(f"Error: Tents config file not found: {self.tents_path}")
-            sys.exit(1)
+            raise ConfigError(f"Tents config file not found: {self.tents_path}")
 
-        with open(self.tents_path, 'r') as f:
-            tents_data = json.load(f)
+        try:
+            with open(self.tents_path, 'r') as f:
+                tents_data = json.load(f)
+        except ValueError as e:
+            raise ConfigError(f"Invalid JSON in {self.tents_path}: {e}")
 
         tents = tents_data.get('tents', [])
 
         if not tents:
-            print("Error: No tents configured in tents.json")
-            sys.exit(1)
+            raise ConfigError("No tents configured in tents.json")
 
         # Filter only enabled tents
         enabled_tents = [tent for tent in tents if tent.get('enabled', True)]
 
         if not enabled_tents:
-            print("Error: No enabled tents found")
-            sys.exit(1)
+            raise ConfigError("No enabled tents found")
 
         # Validate tent configurations
+        seen = set()
         for tent in enabled_tents:
             required = ['id', 'name', 'url', 'scraper_type']
             missing = [field for field in required if field not in tent]
             if missing:
-                print(f"Error: Tent '{tent.get('id', 'unknown')}' missing fields: {', '.join(missing)}")
-                sys.exit(1)
+                raise ConfigError(f"Tent '{tent.get('id', 'unknown')}' missing fields: {', '.join(missing)}")
+            if tent['id'] in seen:
+                raise ConfigError(f"Duplicate tent id: {tent['id']}")
+            seen.add(tent['id'])
 
         return enabled_tents
 
+    def _file_stamp(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        stamps = []
+        for path in (self.config_path, self.tents_path):
+            try:
+                st = os.stat(path)
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def reload(self, validate: Optional[Callable[[Dict[str, Any], List[Dict[str, Any]]], List[str]]] = None) -> bool:
+        """Re-read both files if they changed on disk.
+
+        Returns True if new settings were swapped in. Raises ConfigError (and keeps the
+        current settings) if the new files are invalid, or if `validate` returns problems
+        for them; the same broken version is reported only once. The config dict is
+        updated in place so holders of it see the new values.
+        """
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+
+        config = self._load_config()
+        tents = self._load_tents()
+        if config == self.config and tents == self.tents:
+            return False
+        problems = validate(config, tents) if validate else []
+        if problems:
+            raise ConfigError('; '.join(problems))
+        self.config.clear()
+        self.config.update(config)
+        self.tents = tents
+        return True
+
     def get_config(self) -> Dict[str, Any]:
         """Get main configuration"""
         return self.config
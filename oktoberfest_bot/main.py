@@ -1,16 +1,36 @@
 #!/usr/bin/env python3
 """Main orchestrator for Oktoberfest tent reservation monitoring"""
 
+import argparse
 import asyncio
+import inspect
 import logging
+import os
+import socket
 import sys
+import tempfile
 from pathlib import Path
-from typing import Dict, List
-
-from .config_loader import ConfigLoader
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .circuit_breaker import CircuitBreaker
+from .config_loader import ConfigError, ConfigLoader
+from .metrics import CHECKS, log_summary_periodically, start_metrics_server, timed
+from .polling import AdaptivePollingPolicy, berlin_now
+from .scheduler import DEFAULT_CHECK_TIMEOUT, DEFAULT_MAX_CONCURRENT, TentScheduler
+from .sharding import DEFAULT_SHARD_HOST, ShardCoordinator, ShardWorker, is_loopback_host
 from .state_manager import StateManager
-from .notifiers import TelegramNotifier
-from .scrapers import FormSelectScraper
+from .notifiers.digest import DEFAULT_BATCH_DELAY
+from .scrapers.base_scraper import ScrapeResult
+from .scrapers.display_pool import DEFAULT_DISPLAY_COUNT, DEFAULT_FIRST_DISPLAY, DisplayPool
+from .scrapers.recording import DEFAULT_RECORDING_BODY_LIMIT, DEFAULT_RECORDING_MAX_BYTES, RecordingStore
+from .scrapers.registry import default_registry
+from .scrapers.storage_cache import DEFAULT_STORAGE_TTL, StorageStateCache
+
+# Backends that pull in Playwright, aiohttp or sqlite3 are imported where they are
+# first used, so the worker handshake starts quickly.
+if TYPE_CHECKING:
+    from .notifiers import TelegramNotifier
+    from .scrapers import BrowserPool
 
 # Default paths
 BASE_DIR = Path(__file__).parent.parent
@@ -18,6 +38,18 @@ CONFIG_DIR = BASE_DIR / "config"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 TENTS_FILE = CONFIG_DIR / "tents.json"
 
+DEFAULT_STATE_FLUSH_INTERVAL = 5
+DEFAULT_METRICS_LOG_INTERVAL = 600
+DEFAULT_CONFIG_RELOAD_INTERVAL = 5
+
+# Main config keys that are only read at startup.
+RESTART_ONLY_KEYS = {
+    'telegram_bot_token', 'telegram_chat_id', 'state_file', 'log_file', 'state_backend', 'state_db',
+    'state_fsync', 'state_flush_interval', 'notification_outbox', 'max_concurrent_checks', 'sharding',
+    'metrics_port', 'metrics_host', 'metrics_log_interval', 'config_reload_interval',
+    'session_recording', 'recording_dir', 'recording_max_bytes', 'recording_body_limit',
+}
+
 
 def setup_logging(log_file: str):
     """Configure logging"""
@@ -33,159 +65,571 @@ def setup_logging(log_file: str):
     )
 
 
-def create_scraper(tent_config: Dict):
-    """Factory function to create appropriate scraper for tent"""
-    scraper_type = tent_config.get('scraper_type', 'form_select')
+def create_scraper(tent_config: Dict, browser_pool: Optional['BrowserPool'] = None, http_session=None):
+    """Return the tent's scraper (built once per config and reused between checks)"""
+    return default_registry.get(tent_config, browser_pool, http_session)
+
+
+def create_http_session():
+    """Keep-alive aiohttp session shared by http_select checks"""
+    from .scrapers.http_select import create_http_session as _create_http_session
+    return _create_http_session()
+
+
+def create_storage_cache(config: Dict) -> Optional[StorageStateCache]:
+    """Per-tent browser storage cache next to the state file (None if disabled)"""
+    if not config.get('browser_storage', True):
+        return None
+    directory = Path(config['state_file']).with_suffix('.browser-storage')
+    return StorageStateCache(str(directory), ttl=config.get('browser_storage_ttl', DEFAULT_STORAGE_TTL))
+
+
+def create_recording_store(config: Dict) -> Optional[RecordingStore]:
+    """Archive of recorded browser checks next to the state file (None unless enabled)"""
+    if not config.get('session_recording', False):
+        return None
+    directory = config.get('recording_dir') or str(Path(config['state_file']).with_suffix('.recordings'))
+    return RecordingStore(
+        directory,
+        max_bytes=int(config.get('recording_max_bytes', DEFAULT_RECORDING_MAX_BYTES)),
+        body_limit=int(config.get('recording_body_limit', DEFAULT_RECORDING_BODY_LIMIT)),
+    )
+
+
+def create_state_manager(config: Dict) -> StateManager:
+    """Factory function to create the configured state backend"""
+    backend = config.get('state_backend', 'json')
+    fsync = config.get('state_fsync', False)
 
-    if scraper_type == 'form_select':
-        return FormSelectScraper(tent_config)
-    raise ValueError(f"Unknown scraper type: {scraper_type}")
+    if backend == 'json':
+        return StateManager(config['state_file'], fsync=fsync)
+    if backend == 'sqlite':
+        db_file = config.get('state_db') or str(Path(config['state_file']).with_suffix('.sqlite'))
+        # Seed a fresh database from the JSON state so switching backends keeps dedup state.
+        from .sqlite_state_manager import SqliteStateManager
+        return SqliteStateManager(db_file, fsync=fsync, import_json=config['state_file'])
+    raise ValueError(f"Unknown state backend: {backend}")
+
+
+async def release_tent(tent_id: str, browser_pool: Optional['BrowserPool']):
+    """Forget a removed or changed tent's scraper and close its watch-mode page"""
+    default_registry.forget(tent_id)
+    if browser_pool and tent_id in browser_pool.live_pages:
+        await browser_pool.live_pages.pop(tent_id).close()
 
 
 def _values(items: List[Dict]) -> set:
     return {i.get('value') for i in items if i.get('value') is not None}
 
 
-async def check_tent(
+async def scrape_tent(
     tent_config: Dict,
+    logger: logging.Logger,
+    browser_pool: Optional['BrowserPool'] = None,
+    http_session=None,
+    previous_fingerprint: Optional[Dict] = None,
+    previous_times: Optional[Dict] = None,
+) -> ScrapeResult:
+    """Run the tent's scraper once; unexpected errors become a failed result"""
+    tent_id = tent_config['id']
+    try:
+        scraper = create_scraper(tent_config, browser_pool, http_session)
+        scraper.previous_fingerprint = previous_fingerprint
+        scraper.previous_times = previous_times or {}
+        with timed('check', tent_id):
+            result = await scraper.check_availability()
+        CHECKS.inc(tent=tent_id, result='success' if result.success else 'error')
+        return result
+    except Exception as e:
+        logger.error(f"{tent_config['name']}: Unexpected error - {e}")
+        CHECKS.inc(tent=tent_id, result='exception')
+        return ScrapeResult(success=False, error=str(e))
+
+
+async def _record_failure(tent_config: Dict, error_msg: str, state_manager: StateManager, notifier: 'TelegramNotifier'):
+    tent_id = tent_config['id']
+    state_manager.mark_check_error(tent_id)
+
+    if not state_manager.is_error_notified(tent_id):
+        error_count = state_manager.get_consecutive_errors(tent_id)
+        await notifier.send_error_notification(tent_config['name'], error_msg, error_count)
+        state_manager.mark_error_notified(tent_id)
+
+
+async def process_result(
+    tent_config: Dict,
+    result: ScrapeResult,
     state_manager: StateManager,
-    notifier: TelegramNotifier,
+    notifier: 'TelegramNotifier',
     logger: logging.Logger,
 ):
-    """Check a single tent for availability"""
+    """Compare a scrape result with the stored state, update it and send notifications"""
     tent_id = tent_config['id']
     tent_name = tent_config['name']
 
-    try:
-        scraper = create_scraper(tent_config)
-        result = await scraper.check_availability()
-
-        if result.success:
-            was_available = state_manager.is_dates_available(tent_id)
-            was_in_error_state = state_manager.is_error_notified(tent_id)
-
-            prev_times = state_manager.get_available_times(tent_id)
-            prev_dates = state_manager.get_available_dates(tent_id)
-            prev_date_values = _values(prev_dates)
-
-            if was_in_error_state:
-                notifier.send_recovery_notification(tent_name)
-
-            # Detect newly added date options (even if dates were already available)
-            new_dates = [d for d in result.available_dates if d.get('value') not in prev_date_values]
-
-            # Detect newly available times (best-effort; only if scraper provides them)
-            newly_available_times = []
-            if result.available_times:
-                for date_value, info in result.available_times.items():
-                    prev_for_date = prev_times.get(date_value, {})
-                    prev_time_values = _values(prev_for_date.get('times', []))
-                    current_times = info.get('times', [])
-                    new_times = [t for t in current_times if t.get('value') not in prev_time_values]
-                    if new_times:
-                        newly_available_times.append((info.get('date_text') or date_value, new_times))
-
-            # Update state
-            state_manager.mark_check_success(
-                tent_id,
-                result.dates_available,
-                result.available_dates,
-                result.available_times,
-            )
-
-            # State change: dates
-            if result.dates_available and not was_available:
-                logger.info(f"{tent_name}: NEW DATES AVAILABLE!")
-                notifier.send_dates_available(tent_name, tent_config['url'], result.available_dates)
-
-                # If the page also exposes time slots, announce them too.
-                for date_text, new_times in newly_available_times:
-                    notifier.send_times_available(tent_name, tent_config['url'], date_text, new_times)
+    if result.success:
+        was_available = state_manager.is_dates_available(tent_id)
+        was_in_error_state = state_manager.is_error_notified(tent_id)
+
+        prev_times = state_manager.get_available_times(tent_id)
+        prev_dates = state_manager.get_available_dates(tent_id)
+        prev_date_values = _values(prev_dates)
+
+        if was_in_error_state:
+            await notifier.send_recovery_notification(tent_name)
+
+        # Detect newly added date options (even if dates were already available)
+        new_dates = [d for d in result.available_dates if d.get('value') not in prev_date_values]
+
+        # Detect newly available times (best-effort; only if scraper provides them)
+        newly_available_times = []
+        if result.available_times:
+            for date_value, info in result.available_times.items():
+                prev_for_date = prev_times.get(date_value, {})
+                prev_time_values = _values(prev_for_date.get('times', []))
+                current_times = info.get('times', [])
+                new_times = [t for t in current_times if t.get('value') not in prev_time_values]
+                if new_times:
+                    newly_available_times.append((info.get('date_text') or date_value, new_times))
+
+        # Update state
+        state_manager.mark_check_success(
+            tent_id,
+            result.dates_available,
+            result.available_dates,
+            result.available_times,
+            fingerprint=result.fingerprint,
+            full_scan=result.full_scan,
+        )
+        if new_dates or newly_available_times or result.dates_available != was_available:
+            state_manager.record_change(tent_id, berlin_now())
+
+        # State change: dates
+        if result.dates_available and not was_available:
+            logger.info(f"{tent_name}: NEW DATES AVAILABLE!")
+            await notifier.send_dates_available(tent_name, tent_config['url'], result.available_dates)
+
+            # If the page also exposes time slots, announce them too.
+            for date_text, new_times in newly_available_times:
+                await notifier.send_times_available(tent_name, tent_config['url'], date_text, new_times)
+
+        elif not result.dates_available and was_available:
+            logger.info(f"{tent_name}: Dates no longer available")
+            await notifier.send_dates_unavailable(tent_name)
 
-            elif not result.dates_available and was_available:
-                logger.info(f"{tent_name}: Dates no longer available")
-                notifier.send_dates_unavailable(tent_name)
+        else:
+            # No change in overall date availability
+            if result.dates_available:
+                dates_str = ", ".join(d.get("text", "") for d in result.available_dates)
+                logger.info(f"{tent_name}: Dates still available ({len(result.available_dates)}): {dates_str}")
 
-            else:
-                # No change in overall date availability
-                if result.dates_available:
-                    dates_str = ", ".join(d.get("text", "") for d in result.available_dates)
-                    logger.info(f"{tent_name}: Dates still available ({len(result.available_dates)}): {dates_str}")
-
-                    # If additional dates appeared, announce them.
-                    if new_dates:
-                        logger.info(f"{tent_name}: New dates added: {len(new_dates)}")
-                        notifier.send_new_dates_added(tent_name, tent_config['url'], new_dates)
-
-                    # New time slots can appear even if dates stay available.
-                    for date_text, new_times in newly_available_times:
-                        logger.info(f"{tent_name}: New time slots for {date_text}: {len(new_times)}")
-                        notifier.send_times_available(tent_name, tent_config['url'], date_text, new_times)
-                else:
-                    logger.info(f"{tent_name}: No dates available yet")
+                # If additional dates appeared, announce them.
+                if new_dates:
+                    logger.info(f"{tent_name}: New dates added: {len(new_dates)}")
+                    await notifier.send_new_dates_added(tent_name, tent_config['url'], new_dates)
 
-        else:
-            error_msg = result.error
-            logger.error(f"{tent_name}: Check failed - {error_msg}")
+                # New time slots can appear even if dates stay available.
+                for date_text, new_times in newly_available_times:
+                    logger.info(f"{tent_name}: New time slots for {date_text}: {len(new_times)}")
+                    await notifier.send_times_available(tent_name, tent_config['url'], date_text, new_times)
+            else:
+                logger.info(f"{tent_name}: No dates available yet")
 
-            state_manager.mark_check_error(tent_id)
+    else:
+        logger.error(f"{tent_name}: Check failed - {result.error}")
+        await _record_failure(tent_config, result.error, state_manager, notifier)
 
-            if not state_manager.is_error_notified(tent_id):
-                error_count = state_manager.get_consecutive_errors(tent_id)
-                notifier.send_error_notification(tent_name, error_msg, error_count)
-                state_manager.mark_error_notified(tent_id)
 
+async def handle_result(
+    tent_config: Dict,
+    result: ScrapeResult,
+    state_manager: StateManager,
+    notifier: 'TelegramNotifier',
+    logger: logging.Logger,
+):
+    """process_result, counting an unexpected error while processing as a failed check"""
+    try:
+        await process_result(tent_config, result, state_manager, notifier, logger)
     except Exception as e:
-        logger.error(f"{tent_name}: Unexpected error - {e}")
-        state_manager.mark_check_error(tent_id)
+        logger.error(f"{tent_config['name']}: Unexpected error - {e}")
+        await _record_failure(tent_config, str(e), state_manager, notifier)
 
-        if not state_manager.is_error_notified(tent_id):
-            error_count = state_manager.get_consecutive_errors(tent_id)
-            notifier.send_error_notification(tent_name, str(e), error_count)
-            state_manager.mark_error_notified(tent_id)
+
+def reusable_state(tent_config: Dict, state_manager: StateManager) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Fingerprint and time slots the tent's next check may carry over (fingerprinting tents only)"""
+    tent_id = tent_config['id']
+    if tent_config.get('content_fingerprint'):
+        return state_manager.get_fingerprint(tent_id), state_manager.get_available_times(tent_id)
+    return None, None
+
+
+async def check_tent(
+    tent_config: Dict,
+    state_manager: StateManager,
+    notifier: 'TelegramNotifier',
+    logger: logging.Logger,
+    browser_pool: Optional['BrowserPool'] = None,
+    http_session=None,
+):
+    """Check a single tent for availability"""
+    previous_fingerprint, previous_times = reusable_state(tent_config, state_manager)
+    result = await scrape_tent(tent_config, logger, browser_pool, http_session, previous_fingerprint, previous_times)
+    await handle_result(tent_config, result, state_manager, notifier, logger)
+
+
+async def flush_state_periodically(state_manager: StateManager, interval: float, logger: logging.Logger):
+    """Write batched state changes to disk at most once per interval"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            state_manager.flush()
+        except Exception as e:
+            logger.error(f"Failed to save state: {e}")
+
+
+async def watch_config(
+    config_loader: ConfigLoader,
+    scheduler,
+    notifier: 'TelegramNotifier',
+    logger: logging.Logger,
+    interval: float,
+    initial_delay: Callable[[Dict], float],
+    release_tent: Optional[Callable[[str], Awaitable[None]]] = None,
+):
+    """Apply edits to config.json and tents.json without restarting.
+
+    Added tents are scheduled, removed ones cancelled, changed ones use their new
+    settings from their next check on. Invalid files (including settings that
+    validate_settings rejects) are reported and ignored. `release_tent` drops per-tent
+    resources such as a watch-mode page of removed and changed tents.
+    """
+    config = config_loader.get_config()
+    current = {t['id']: t for t in config_loader.get_tents()}
+    while True:
+        await asyncio.sleep(interval)
+        old_config = dict(config)
+        try:
+            if not config_loader.reload(validate=validate_settings):
+                continue
+        except ConfigError as e:
+            logger.error(f"Config change ignored, keeping the running settings: {e}")
+            continue
+
+        new = {t['id']: t for t in config_loader.get_tents()}
+        added = [t for tent_id, t in new.items() if tent_id not in current]
+        removed = [tent_id for tent_id in current if tent_id not in new]
+        updated = [t for tent_id, t in new.items() if tent_id in current and current[tent_id] != t]
+        for tent in added:
+            scheduler.add(tent, delay=initial_delay(tent))
+        for tent in updated:
+            scheduler.update(tent)
+            if release_tent:
+                await release_tent(tent['id'])
+        for tent_id in removed:
+            scheduler.remove(tent_id)
+            if release_tent:
+                await release_tent(tent_id)
+        current = new
+
+        # Settings read on every use apply as is; these few are copied into objects.
+        notifier.batch_delay = config.get('notify_batch_delay', DEFAULT_BATCH_DELAY)
+        if notifier.outbox:
+            from .notifiers.outbox import DEFAULT_MIN_INTERVAL
+            notifier.outbox.min_interval = config.get('notify_min_interval', DEFAULT_MIN_INTERVAL)
+        if isinstance(scheduler, TentScheduler):
+            scheduler.check_timeout = config.get('check_timeout', DEFAULT_CHECK_TIMEOUT)
+
+        changed_keys = sorted(k for k in set(old_config) | set(config) if old_config.get(k) != config.get(k))
+        parts = [f"{len(added)} added", f"{len(removed)} removed", f"{len(updated)} changed tent(s)"]
+        if changed_keys:
+            parts.append(f"settings: {', '.join(changed_keys)}")
+        logger.info(f"Configuration reloaded: {'; '.join(parts)}")
+        restart = [k for k in changed_keys if k in RESTART_ONLY_KEYS or k.startswith(('shard_', 'xvfb_', 'browser_storage'))]
+        if restart:
+            logger.warning(f"Changed settings take effect after a restart: {', '.join(restart)}")
+
+
+def create_browser_pool(config: Dict) -> 'BrowserPool':
+    """Shared browser with its Xvfb displays, storage cache and session recorder"""
+    from .scrapers.browser_pool import BrowserPool
+    return BrowserPool(DisplayPool(
+        size=config.get('xvfb_displays', DEFAULT_DISPLAY_COUNT),
+        first_display=config.get('xvfb_first_display', DEFAULT_FIRST_DISPLAY),
+    ), storage=create_storage_cache(config), recorder=create_recording_store(config))
+
+
+async def _shutdown_step(name: str, close: Callable[[], object], logger: logging.Logger):
+    """Run one cleanup step; a failure is logged so the remaining steps still run"""
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        logger.error(f"Failed to close {name}: {e}")
 
 
 async def monitor_loop(
     config_loader: ConfigLoader,
     state_manager: StateManager,
-    notifier: TelegramNotifier,
+    notifier: 'TelegramNotifier',
     logger: logging.Logger,
 ):
     """Main monitoring loop"""
+    config = config_loader.get_config()
     tents = config_loader.get_tents()
 
     logger.info("Starting Oktoberfest Monitor...")
     logger.info(f"Monitoring {len(tents)} tent(s)")
 
+    # Deliver queued notifications (including any left over from a previous run) in order.
+    outbox_worker = asyncio.create_task(notifier.outbox.run(notifier)) if notifier.outbox else None
+
     tent_names = [tent['name'] for tent in tents]
     min_interval = min(tent.get('check_interval', 180) for tent in tents)
-    notifier.send_startup_notification(tent_names, min_interval)
+    await notifier.send_startup_notification(tent_names, min_interval)
+
+    polling_policy = AdaptivePollingPolicy(state_manager, config)
+    breaker = CircuitBreaker(state_manager, config, interval_fn=polling_policy.interval_for)
+
+    browser_pool = http_session = None
+    if config.get('sharding'):
+        # Scraping happens in worker processes; state and notifications stay here.
+        async def _process(tent: Dict, result: ScrapeResult):
+            await handle_result(tent, result, state_manager, notifier, logger)
+
+        def _tent_state(tent: Dict) -> Dict:
+            fingerprint, times = reusable_state(tent, state_manager)
+            return {'fingerprint': fingerprint, 'times': times}
+
+        scheduler = ShardCoordinator(
+            config, tents, _process,
+            interval_fn=breaker.interval_for,
+            before_check=breaker.before_check,
+            tent_state=_tent_state,
+            initial_delay=breaker.initial_delay,
+        )
+    else:
+        # One warm browser for the whole session; each check leases its own context.
+        browser_pool = create_browser_pool(config)
+        # Keep-alive HTTP session for scrapers that can skip the browser.
+        http_session = create_http_session()
+
+        async def _run_check(tent: Dict):
+            breaker.before_check(tent)
+            await check_tent(tent, state_manager, notifier, logger, browser_pool, http_session)
+
+        scheduler = TentScheduler(
+            _run_check,
+            max_concurrent=config.get('max_concurrent_checks', DEFAULT_MAX_CONCURRENT),
+            check_timeout=config.get('check_timeout', DEFAULT_CHECK_TIMEOUT),
+            interval_fn=breaker.interval_for,
+        )
+        for tent in tents:
+            scheduler.add(tent, delay=breaker.initial_delay(tent))
+        logger.info(f"Scheduler running with up to {scheduler.max_concurrent} concurrent check(s)")
+
+    flusher = asyncio.create_task(
+        flush_state_periodically(state_manager, config.get('state_flush_interval', DEFAULT_STATE_FLUSH_INTERVAL), logger)
+    )
 
-    while True:
+    metrics_server = None
+    if config.get('metrics_port'):
+        metrics_server = await start_metrics_server(config.get('metrics_host', '127.0.0.1'), int(config['metrics_port']))
+    metrics_logger = asyncio.create_task(
+        log_summary_periodically(config.get('metrics_log_interval', DEFAULT_METRICS_LOG_INTERVAL), logger)
+    )
+
+    async def _release(tent_id: str):
+        await release_tent(tent_id, browser_pool)
+
+    config_watcher = None
+    reload_interval = config.get('config_reload_interval', DEFAULT_CONFIG_RELOAD_INTERVAL)
+    if reload_interval:
+        config_watcher = asyncio.create_task(watch_config(
+            config_loader, scheduler, notifier, logger, reload_interval,
+            initial_delay=breaker.initial_delay, release_tent=_release,
+        ))
+
+    try:
+        await scheduler.run()
+    finally:
+        if config_watcher:
+            config_watcher.cancel()
+        flusher.cancel()
+        metrics_logger.cancel()
+        await _shutdown_step('scheduler', scheduler.close, logger)
+        # Flush batched alerts first: with an outbox they are queued there for delivery.
+        await _shutdown_step('notifier', notifier.flush, logger)
+        if outbox_worker:
+            outbox_worker.cancel()
+            await asyncio.gather(outbox_worker, return_exceptions=True)
+            await _shutdown_step('notification outbox', notifier.outbox.close, logger)
+        # Closed last, so no delivery still in flight reopens the HTTP session.
+        await _shutdown_step('notifier session', notifier.close, logger)
+        if metrics_server:
+            metrics_server.close()
+        await _shutdown_step('state', state_manager.close, logger)
+        if browser_pool:
+            logger.info("Closing browser pool...")
+            await _shutdown_step('browser pool', browser_pool.close, logger)
+        if http_session:
+            await _shutdown_step('HTTP session', http_session.close, logger)
+
+
+async def worker_loop(address: str, worker_id: str, capacity: Optional[int], logger: logging.Logger):
+    """Sharded mode worker: scrape the tents leased by the coordinator at `address`"""
+    resources: Dict = {}
+
+    async def _scrape(tent: Dict, previous_fingerprint, previous_times, config: Dict) -> ScrapeResult:
+        if 'browser_pool' not in resources:
+            resources['browser_pool'] = create_browser_pool(config)
+            resources['http_session'] = create_http_session()
+        return await scrape_tent(
+            tent, logger, resources['browser_pool'], resources['http_session'], previous_fingerprint, previous_times,
+        )
+
+    async def _release(tent_id: str):
+        await release_tent(tent_id, resources.get('browser_pool'))
+
+    worker = ShardWorker(
+        address, worker_id, _scrape, capacity=capacity, secret=os.environ.get('OKTOBERFEST_SHARD_TOKEN'),
+        release=_release,
+    )
+    try:
+        await worker.run()
+    finally:
+        if 'browser_pool' in resources:
+            await resources['browser_pool'].close()
+            await resources['http_session'].close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Monitor Oktoberfest tent reservation pages")
+    parser.add_argument('--config', default=str(CONFIG_FILE), help="path of config.json")
+    parser.add_argument('--tents', default=str(TENTS_FILE), help="path of tents.json")
+    parser.add_argument(
+        '--check-config', '--dry-run', dest='check_config', action='store_true',
+        help="validate config.json and tents.json, then exit",
+    )
+    parser.add_argument('--worker', metavar='HOST:PORT', help="run as a sharded-mode worker for this coordinator")
+    parser.add_argument('--worker-id', default=None, help="worker name (default: host name and process id)")
+    parser.add_argument('--capacity', type=int, default=None, help="concurrent checks on this worker")
+    parser.add_argument(
+        '--replay', nargs='+', metavar='PATH',
+        help="replay recorded checks (archives or directories of them) offline, then exit",
+    )
+    return parser.parse_args(argv)
+
+
+def validate_settings(config: Dict, tents: List[Dict]) -> List[str]:
+    """Problems ConfigLoader does not catch itself (unknown scraper types, bad values)"""
+    problems = []
+    if config.get('state_backend', 'json') not in ('json', 'sqlite'):
+        problems.append(f"state_backend must be 'json' or 'sqlite', not {config['state_backend']!r}")
+    shard_host = config.get('shard_host', DEFAULT_SHARD_HOST)
+    if config.get('sharding') and not config.get('shard_token') and not is_loopback_host(shard_host):
+        problems.append(f"shard_host {shard_host} is reachable from other machines; set shard_token")
+    for tent in tents:
+        tent_id = tent['id']
+        interval = tent.get('check_interval', 180)
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            problems.append(f"Tent '{tent_id}': check_interval must be a positive number")
+        if tent['scraper_type'] not in default_registry.types():
+            problems.append(f"Tent '{tent_id}': unknown scraper_type {tent['scraper_type']!r}")
+            continue
+        # The compile step checks the settings (patterns, numbers) without importing Playwright.
         try:
-            tasks = [check_tent(tent, state_manager, notifier, logger) for tent in tents]
-            await asyncio.gather(*tasks)
+            default_registry.compile_spec(tent)
+        except ImportError as e:
+            problems.append(f"Tent '{tent_id}': cannot load scraper_type {tent['scraper_type']!r}: {e}")
+        except ValueError as e:
+            problems.append(str(e))
+    return problems
+
+
+def check_config(config_loader: ConfigLoader) -> List[str]:
+    """Problems with the loaded configuration (see validate_settings)"""
+    return validate_settings(config_loader.get_config(), config_loader.get_tents())
+
+
+def run_check_config(args: argparse.Namespace):
+    """Entry point for `--check-config`; exits non-zero on the first broken file"""
+    config_loader = ConfigLoader(args.config, args.tents)
+    problems = check_config(config_loader)
+    for problem in problems:
+        print(f"Error: {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"Configuration OK: {len(config_loader.get_tents())} enabled tent(s)")
 
-            logger.info(f"Waiting {min_interval} seconds until next check...")
-            await asyncio.sleep(min_interval)
 
-        except Exception as e:
-            logger.error(f"Error in monitoring loop: {e}")
-            await asyncio.sleep(60)
+def run_worker(args: argparse.Namespace):
+    """Entry point for `--worker`; needs no local config files"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+    worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    try:
+        asyncio.run(worker_loop(args.worker, worker_id, args.capacity, logger))
+    except KeyboardInterrupt:
+        logger.info("Worker stopped by user")
+
+
+async def replay_loop(paths: List[str], logger: logging.Logger) -> Dict:
+    """Replay archives against a throwaway state; notifications are only logged"""
+    from .replay import ReplayNotifier, replay_archives
+
+    with tempfile.TemporaryDirectory(prefix='okb-replay-') as workdir:
+        state_manager = StateManager(os.path.join(workdir, 'state.json'))
+        return await replay_archives(paths, state_manager, ReplayNotifier(logger), process_result, logger)
+
+
+def run_replay(args: argparse.Namespace):
+    """Entry point for `--replay`; needs no config files, browser or network"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+    report = asyncio.run(replay_loop(args.replay, logger))
+
+    mean_ms = report['seconds'] / report['archives'] * 1000 if report['archives'] else 0.0
+    print(
+        f"Replayed {report['archives']} archive(s) in {report['seconds']:.2f}s ({mean_ms:.1f} ms each): "
+        f"{len(report['mismatches'])} mismatch(es), {report['notifications']} notification(s)"
+    )
+    for path in report['mismatches']:
+        print(f"Mismatch: {path}")
+    if report['mismatches'] or report['unreadable']:
+        sys.exit(1)
 
 
 def main():
     """Main entry point"""
+    args = parse_args()
+    if args.check_config:
+        run_check_config(args)
+        return
+    if args.replay:
+        run_replay(args)
+        return
+    if args.worker:
+        run_worker(args)
+        return
+
     try:
-        config_loader = ConfigLoader(str(CONFIG_FILE), str(TENTS_FILE))
+        config_loader = ConfigLoader(args.config, args.tents)
         config = config_loader.get_config()
 
         setup_logging(config['log_file'])
         logger = logging.getLogger(__name__)
 
-        state_manager = StateManager(config['state_file'])
+        state_manager = create_state_manager(config)
+
+        from .notifiers import TelegramNotifier
+        from .notifiers.outbox import DEFAULT_MIN_INTERVAL, Outbox
 
         notifier = TelegramNotifier(config['telegram_bot_token'], config['telegram_chat_id'])
+        notifier.batch_delay = config.get('notify_batch_delay', DEFAULT_BATCH_DELAY)
+        if config.get('notification_outbox', True):
+            outbox_file = str(Path(config['state_file']).with_suffix('.outbox.sqlite'))
+            notifier.outbox = Outbox(outbox_file, min_interval=config.get('notify_min_interval', DEFAULT_MIN_INTERVAL))
 
         asyncio.run(monitor_loop(config_loader, state_manager, notifier, logger))
 
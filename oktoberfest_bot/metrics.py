@@ -0,0 +1,233 @@
+"""Lightweight latency/counter metrics with a Prometheus text endpoint"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(str(labels.get(n, '')) for n in self.labelnames)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_label_str(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Gauge:
+    """Settable value with labels"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str):
+        key = tuple(str(labels.get(n, '')) for n in self.labelnames)
+        self.values[key] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_label_str(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels (plus max, for log summaries)"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., sum, count, max]
+        self.values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(n, '')) for n in self.labelnames)
+        data = self.values.get(key)
+        if data is None:
+            data = self.values[key] = [0] * len(self.buckets) + [0.0, 0, 0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                data[i] += 1
+        data[-3] += value
+        data[-2] += 1
+        data[-1] = max(data[-1], value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, data in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, data):
+                le = _label_str(self.labelnames, key, f'le="{bound:g}"')
+                lines.append(f"{self.name}_bucket{le} {count:g}")
+            inf = _label_str(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {data[-2]:g}")
+            lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {data[-3]:.6f}")
+            lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {data[-2]:g}")
+        return lines
+
+
+class Registry:
+    """Holds all metrics of the process"""
+
+    def __init__(self):
+        self.metrics: List[object] = []
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, help_text, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'oktoberfest_stage_seconds', 'Duration of monitoring stages', ['stage', 'tent'],
+)
+CHECKS = REGISTRY.counter(
+    'oktoberfest_checks_total', 'Completed tent checks by result', ['tent', 'result'],
+)
+NOTIFICATIONS = REGISTRY.counter(
+    'oktoberfest_notifications_total', 'Notifications produced, by tent', ['tent'],
+)
+DELIVERIES = REGISTRY.counter(
+    'oktoberfest_notification_deliveries_total', 'Notification API calls by result', ['result'],
+)
+CIRCUIT_STATE = REGISTRY.gauge(
+    'oktoberfest_circuit_state', 'Per-tent circuit breaker state (0=closed, 1=open, 2=half-open)', ['tent'],
+)
+CIRCUIT_TRANSITIONS = REGISTRY.counter(
+    'oktoberfest_circuit_transitions_total', 'Circuit breaker state changes', ['tent', 'state'],
+)
+
+
+@contextmanager
+def timed(stage: str, tent: str = '') -> Iterator[None]:
+    """Record the duration of the enclosed block (also on error) under `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage, tent=tent)
+
+
+def summary_lines() -> List[str]:
+    """Per-stage totals across tents: count, average and max seconds."""
+    totals: Dict[str, List[float]] = {}
+    for (stage, _tent), data in STAGE_SECONDS.values.items():
+        agg = totals.setdefault(stage, [0.0, 0, 0.0])
+        agg[0] += data[-3]
+        agg[1] += data[-2]
+        agg[2] = max(agg[2], data[-1])
+    lines = [
+        f"{stage}: n={int(n)} avg={total / n:.2f}s max={mx:.2f}s"
+        for stage, (total, n, mx) in sorted(totals.items()) if n
+    ]
+    checks: Dict[str, float] = {}
+    for (_tent, result), value in CHECKS.values.items():
+        checks[result] = checks.get(result, 0) + value
+    if checks:
+        lines.append("checks: " + ", ".join(f"{k}={int(v)}" for k, v in sorted(checks.items())))
+    return lines
+
+
+async def _handle_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        # Drain headers
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout=5)
+            if not line or line in (b'\r\n', b'\n'):
+                break
+        parts = request_line.decode('latin-1').split()
+        path = parts[1] if len(parts) > 1 else ''
+        if path.split('?')[0] == '/metrics':
+            status, body = '200 OK', REGISTRY.render().encode()
+        else:
+            status, body = '404 Not Found', b'not found\n'
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except Exception:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(host: str, port: int) -> Optional[asyncio.AbstractServer]:
+    """Serve GET /metrics on host:port; returns None if the port cannot be bound."""
+    try:
+        server = await asyncio.start_server(_handle_http, host, port)
+    except OSError as e:
+        logger.error(f"Could not start metrics endpoint on {host}:{port}: {e}")
+        return None
+    logger.info(f"Metrics available at http://{host}:{port}/metrics")
+    return server
+
+
+async def log_summary_periodically(interval: float, log: logging.Logger):
+    """Write a short per-stage latency summary to the log every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        lines = summary_lines()
+        if lines:
+            log.info("Metrics summary: " + " | ".join(lines))
@@ -1,6 +1,23 @@
-"""Notifier implementations"""
+"""Notifier implementations
 
-from .base_notifier import BaseNotifier
-from .telegram import TelegramNotifier
+TelegramNotifier (aiohttp) and Outbox (sqlite3) are imported on first access.
+"""
 
-__all__ = ['BaseNotifier', 'TelegramNotifier']
+from importlib import import_module
+
+_LAZY_EXPORTS = {
+    'BaseNotifier': '.base_notifier',
+    'DeliveryError': '.outbox',
+    'Outbox': '.outbox',
+    'TelegramNotifier': '.telegram',
+}
+
+__all__ = ['BaseNotifier', 'DeliveryError', 'Outbox', 'TelegramNotifier']
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,26 +1,39 @@
 """Base notifier interface for sending notifications"""
 
+import asyncio
+import re
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Dict, List, Optional
 
-try:
-    from zoneinfo import ZoneInfo
-except Exception:  # pragma: no cover
-    ZoneInfo = None  # type: ignore
+from ..metrics import NOTIFICATIONS
+from ..polling import berlin_now
+from .digest import PendingMessage, build_digests, with_link
+from .outbox import DeliveryError
+
+_CLOCK_TIME_RE = re.compile(r"\b(\d{1,2}):(\d{2})\b")
 
 
 class BaseNotifier(ABC):
     """Abstract base class for notification services"""
 
+    def __init__(self):
+        self._background_tasks = set()
+        # Optional durable queue; when attached, messages are enqueued instead of sent inline.
+        self.outbox = None
+        # Seconds to collect tent notifications before sending them as one digest (0 = send at once).
+        self.batch_delay = 0.0
+        self._batch: List[PendingMessage] = []
+        self._batch_timer: Optional[asyncio.Future] = None
+
+    @property
+    def chat_key(self) -> str:
+        """Identifies the destination for per-chat ordering and rate limiting."""
+        return str(getattr(self, 'chat_id', 'default'))
+
     def _now_local(self) -> datetime:
         """Best-effort local time for notification policies."""
-        if ZoneInfo is None:
-            return datetime.utcnow()
-        try:
-            return datetime.now(ZoneInfo('Europe/Berlin'))
-        except Exception:
-            return datetime.utcnow()
+        return berlin_now()
 
     def _is_midday_slot(self, time_text: str) -> Optional[bool]:
         """Return True if the time_text clearly indicates a midday/lunch slot.
@@ -38,8 +51,7 @@ class BaseNotifier(ABC):
             return False
 
         # Try parsing leading HH:MM
-        import re
-        m = re.search(r"\b(\d{1,2}):(\d{2})\b", t)
+        m = _CLOCK_TIME_RE.search(t)
         if not m:
             return None
         hour = int(m.group(1))
@@ -62,22 +74,92 @@ class BaseNotifier(ABC):
         return is_midday is True
 
     @abstractmethod
-    def send_notification(self, message: str) -> Any:
+    async def send_notification(self, message: str) -> Any:
         """Send a notification message."""
         raise NotImplementedError
 
+    async def deliver(self, message: str, chat_id: Optional[str] = None) -> Any:
+        """Send one message for the outbox worker; raise DeliveryError on failure.
+
+        Notifiers that can classify failures (rate limits, permanent errors) override this.
+        """
+        message_id = await self.send_notification(message)
+        if message_id is None:
+            raise DeliveryError("Notification was not sent")
+        return message_id
+
+    async def _dispatch(
+        self,
+        message: str,
+        reaction: Optional[str] = None,
+        tent: Optional[str] = None,
+        link: Optional[str] = None,
+    ):
+        """Route a message: into the digest batch for tent notifications, otherwise send it."""
+        NOTIFICATIONS.inc(tent=tent or '')
+        if self.batch_delay and tent is not None:
+            self._batch.append(PendingMessage(tent, message, reaction, link))
+            if self._batch_timer is None or self._batch_timer.done():
+                self._batch_timer = asyncio.ensure_future(self._flush_batch_later())
+            return
+        await self._send_now(with_link(message, link), reaction)
+
+    async def _flush_batch_later(self):
+        # Alerts that arrive while a flush is sending start no timer of their own.
+        while self._batch:
+            await asyncio.sleep(self.batch_delay)
+            await self.flush_batch()
+
+    async def flush_batch(self):
+        """Send all collected tent notifications as merged, size-limited digests."""
+        items, self._batch = self._batch, []
+        for text, reaction in build_digests(items):
+            await self._send_now(text, reaction)
+
+    async def _send_now(self, message: str, reaction: Optional[str] = None):
+        """Enqueue into the outbox if attached, otherwise send immediately."""
+        if self.outbox is not None:
+            self.outbox.enqueue(self.chat_key, message, reaction)
+            return
+        message_id = await self.send_notification(message)
+        if reaction:
+            self._maybe_react(message_id, reaction)
+
     def _maybe_react(self, message_id: Any, emoji: str):
-        """Best-effort reaction helper for notifiers that support it."""
+        """Best-effort reaction helper for notifiers that support it.
+
+        The reaction runs as a background task so it never adds a roundtrip to the caller.
+        """
         if message_id is None:
             return
         react_fn = getattr(self, 'react_to_message', None)
         if callable(react_fn):
             try:
-                react_fn(message_id, emoji)
+                self._spawn(react_fn(message_id, emoji))
             except Exception:
                 pass
 
-    def send_startup_notification(self, tent_names: List[str], check_interval: int):
+    def _spawn(self, coro: Awaitable[Any]):
+        """Run a fire-and-forget coroutine, keeping a reference until it finishes."""
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def close(self):
+        """Flush and release the notifier's resources."""
+        await self.flush()
+
+    async def flush(self):
+        """Send any batched notifications and wait for background work (e.g. reactions)."""
+        if self._batch_timer is not None and not self._batch_timer.done():
+            self._batch_timer.cancel()
+        if self._batch:
+            await self.flush_batch()
+        tasks = list(self._background_tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def send_startup_notification(self, tent_names: List[str], check_interval: int):
         """Send notification when monitoring starts"""
         tents_list = "\n".join([f"• {name}" for name in tent_names])
         message = (
@@ -86,9 +168,9 @@ class BaseNotifier(ABC):
             f"{tents_list}\n\n"
             f"Check interval: {check_interval} seconds"
         )
-        self.send_notification(message)
+        await self._dispatch(message)
 
-    def send_dates_available(self, tent_name: str, tent_url: str, available_dates: List[Dict]):
+    async def send_dates_available(self, tent_name: str, tent_url: str, available_dates: List[Dict]):
         """Send notification when dates become available.
 
         Policy: Mon–Thu, suppress options that clearly indicate a midday/lunch slot.
@@ -106,13 +188,11 @@ class BaseNotifier(ABC):
         message = (
             f"🍺🎉 <b>{tent_name.upper()} - DATES AVAILABLE!</b> 🎉🍺\n\n"
             f"Found {len(filtered)} available option(s):\n"
-            f"{dates_text}\n\n"
-            f"🔗 Book now: {tent_url}"
+            f"{dates_text}"
         )
-        message_id = self.send_notification(message)
-        self._maybe_react(message_id, "🍺")
+        await self._dispatch(message, reaction="🍺", tent=tent_name, link=tent_url)
 
-    def send_new_dates_added(self, tent_name: str, tent_url: str, new_dates: List[Dict]):
+    async def send_new_dates_added(self, tent_name: str, tent_url: str, new_dates: List[Dict]):
         """Send notification when additional dates are added while dates were already available.
 
         Policy: Mon–Thu, suppress options that clearly indicate a midday/lunch slot.
@@ -129,13 +209,11 @@ class BaseNotifier(ABC):
         message = (
             f"🆕📅 <b>{tent_name.upper()} - NEW DATES ADDED!</b> 📅🆕\n\n"
             f"Newly added option(s) ({len(filtered)}):\n"
-            f"{dates_text}\n\n"
-            f"🔗 Book now: {tent_url}"
+            f"{dates_text}"
         )
-        message_id = self.send_notification(message)
-        self._maybe_react(message_id, "📅")
+        await self._dispatch(message, reaction="📅", tent=tent_name, link=tent_url)
 
-    def send_times_available(self, tent_name: str, tent_url: str, date_text: str, new_times: List[Dict]):
+    async def send_times_available(self, tent_name: str, tent_url: str, date_text: str, new_times: List[Dict]):
         """Send notification when new time slots become available for an already-available date.
 
         Policy: Mon–Thu, suppress clear midday/lunch-only slot notifications. If we're unsure,
@@ -154,22 +232,20 @@ class BaseNotifier(ABC):
             f"⏰🎉 <b>{tent_name.upper()} - NEW TIME SLOTS!</b> 🎉⏰\n\n"
             f"Date: <b>{safe_date_text}</b>\n"
             f"New time option(s) found ({len(filtered)}):\n"
-            f"{times_text}\n\n"
-            f"🔗 Book now: {tent_url}"
+            f"{times_text}"
         )
-        message_id = self.send_notification(message)
-        self._maybe_react(message_id, "⏰")
+        await self._dispatch(message, reaction="⏰", tent=tent_name, link=tent_url)
 
-    def send_dates_unavailable(self, tent_name: str):
+    async def send_dates_unavailable(self, tent_name: str):
         """Send notification when dates become unavailable"""
         message = (
             f"❌ <b>{tent_name} - Dates No Longer Available</b>\n\n"
             "The previously available dates have been booked.\n"
             "Will continue monitoring..."
         )
-        self.send_notification(message)
+        await self._dispatch(message, tent=tent_name)
 
-    def send_error_notification(self, tent_name: str, error_msg: str, error_count: int):
+    async def send_error_notification(self, tent_name: str, error_msg: str, error_count: int):
         """Send notification about monitoring errors"""
         import html
 
@@ -181,13 +257,13 @@ class BaseNotifier(ABC):
             f"<code>{escaped_error[:500]}</code>\n\n"
             "Monitor will continue trying..."
         )
-        self.send_notification(message)
+        await self._dispatch(message, tent=tent_name)
 
-    def send_recovery_notification(self, tent_name: str):
+    async def send_recovery_notification(self, tent_name: str):
         """Send notification when monitoring recovers from errors"""
         message = (
             f"✅ <b>{tent_name} - Monitor Recovered</b>\n\n"
             "Successfully reconnected to reservation page.\n"
             "Monitoring continues normally."
         )
-        self.send_notification(message)
+        await self._dispatch(message, tent=tent_name)
@@ -0,0 +1,84 @@
+"""Merging of per-tent notifications into size-limited digest messages"""
+
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+# Telegram rejects messages longer than this (counted after entity parsing; raw HTML is a safe upper bound)
+MAX_MESSAGE_LENGTH = 4096
+
+DEFAULT_BATCH_DELAY = 5.0
+
+TENT_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+
+class PendingMessage(NamedTuple):
+    """A tent notification waiting to be merged into a digest"""
+    tent: str
+    text: str
+    reaction: Optional[str] = None
+    link: Optional[str] = None
+
+
+def with_link(text: str, link: Optional[str]) -> str:
+    """Append the booking link footer used by all availability alerts."""
+    if not link:
+        return text
+    return f"{text}\n\n🔗 Book now: {link}"
+
+
+def split_message(text: str, limit: int = MAX_MESSAGE_LENGTH) -> List[str]:
+    """Split text into chunks of at most `limit` characters, preferring line boundaries."""
+    if len(text) <= limit:
+        return [text]
+
+    chunks: List[str] = []
+    current = ''
+    for line in text.split('\n'):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return [c.strip('\n') for c in chunks if c.strip()]
+
+
+def split_digest(text: str) -> List[str]:
+    """The tent blocks a digest was merged from (a single-tent message stays whole)."""
+    return [part for part in text.split(TENT_SEPARATOR) if part.strip()]
+
+
+def build_digests(items: List[PendingMessage], limit: int = MAX_MESSAGE_LENGTH) -> List[Tuple[str, Optional[str]]]:
+    """Merge pending messages per tent, then pack tents into as few messages as fit.
+
+    Each tent block keeps its messages in arrival order and ends with a single booking link.
+    Returns (text, reaction) pairs; the reaction is the first one requested in that digest.
+    """
+    by_tent: "OrderedDict[str, List[PendingMessage]]" = OrderedDict()
+    for item in items:
+        by_tent.setdefault(item.tent, []).append(item)
+
+    blocks: List[Tuple[str, Optional[str]]] = []
+    for tent_items in by_tent.values():
+        link = next((i.link for i in reversed(tent_items) if i.link), None)
+        text = with_link("\n\n".join(i.text for i in tent_items), link)
+        reaction = next((i.reaction for i in tent_items if i.reaction), None)
+        for chunk in split_message(text, limit):
+            blocks.append((chunk, reaction))
+
+    digests: List[Tuple[str, Optional[str]]] = []
+    for text, reaction in blocks:
+        if digests and len(digests[-1][0]) + len(TENT_SEPARATOR) + len(text) <= limit:
+            prev_text, prev_reaction = digests[-1]
+            digests[-1] = (prev_text + TENT_SEPARATOR + text, prev_reaction or reaction)
+        else:
+            digests.append((text, reaction))
+    return digests
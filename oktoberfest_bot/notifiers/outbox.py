@@ -0,0 +1,183 @@
+"""Durable notification outbox with ordered, rate-limited, retrying delivery"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .digest import split_digest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 1.0
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id TEXT NOT NULL,
+    message TEXT NOT NULL,
+    reaction TEXT,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_chat ON outbox (chat_id, id);
+"""
+
+
+class DeliveryError(Exception):
+    """A notification could not be delivered.
+
+    retry_after: seconds the service asked us to wait (e.g. Telegram 429)
+    permanent: retrying cannot succeed (e.g. malformed message); the entry is dropped
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, permanent: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.permanent = permanent
+
+
+class Outbox:
+    """SQLite-backed FIFO of pending notifications.
+
+    Messages are delivered strictly in order per chat: a failing head entry is retried
+    with exponential backoff (or the service's retry_after) before anything behind it.
+    """
+
+    def __init__(self, db_file: str, min_interval: float = DEFAULT_MIN_INTERVAL):
+        self.db_file = db_file
+        self.min_interval = min_interval
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(_SCHEMA)
+        self._last_sent: Dict[str, float] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _event(self) -> asyncio.Event:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        return self._wakeup
+
+    def enqueue(self, chat_id: Any, message: str, reaction: Optional[str] = None):
+        """Persist a message for delivery; it survives restarts until sent."""
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO outbox (chat_id, message, reaction, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?)',
+                (str(chat_id), message, reaction, now, now),
+            )
+        self._event().set()
+
+    def pending_count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM outbox').fetchone()[0]
+
+    def _heads(self) -> List[Dict[str, Any]]:
+        """Oldest pending entry of every chat"""
+        rows = self.conn.execute(
+            'SELECT id, chat_id, message, reaction, attempts, next_attempt_at FROM outbox '
+            'WHERE id IN (SELECT MIN(id) FROM outbox GROUP BY chat_id)'
+        ).fetchall()
+        return [
+            {'id': r[0], 'chat_id': r[1], 'message': r[2], 'reaction': r[3], 'attempts': r[4], 'next_attempt_at': r[5]}
+            for r in rows
+        ]
+
+    def _ready_at(self, entry: Dict[str, Any]) -> float:
+        return max(entry['next_attempt_at'], self._last_sent.get(entry['chat_id'], 0.0) + self.min_interval)
+
+    def _split(self, entry: Dict[str, Any]) -> bool:
+        """Replace a rejected digest by one entry per tent, so one bad block does not
+        drop the other tents' alerts. False if the entry holds a single message."""
+        parts = split_digest(entry['message'])
+        if len(parts) < 2:
+            return False
+        now = time.time()
+        rows = [(entry['chat_id'], part, entry['reaction'] if i == 0 else None, now, 0, now) for i, part in enumerate(parts)]
+        with self.conn:
+            # Re-insert the entries queued behind it as well, so the chat keeps its order.
+            rows += self.conn.execute(
+                'SELECT chat_id, message, reaction, created_at, attempts, next_attempt_at FROM outbox '
+                'WHERE chat_id = ? AND id > ? ORDER BY id',
+                (entry['chat_id'], entry['id']),
+            ).fetchall()
+            self.conn.execute('DELETE FROM outbox WHERE chat_id = ? AND id >= ?', (entry['chat_id'], entry['id']))
+            self.conn.executemany(
+                'INSERT INTO outbox (chat_id, message, reaction, created_at, attempts, next_attempt_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+        return True
+
+    def _delete(self, entry_id: int):
+        with self.conn:
+            self.conn.execute('DELETE FROM outbox WHERE id = ?', (entry_id,))
+
+    def _reschedule(self, entry: Dict[str, Any], error: DeliveryError):
+        attempts = entry['attempts'] + 1
+        if error.retry_after is not None:
+            delay = float(error.retry_after)
+        else:
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (attempts - 1)))
+            delay *= random.uniform(0.8, 1.2)
+        with self.conn:
+            self.conn.execute(
+                'UPDATE outbox SET attempts = ?, next_attempt_at = ? WHERE id = ?',
+                (attempts, time.time() + delay, entry['id']),
+            )
+        logger.warning(f"Notification delivery failed (attempt {attempts}): {error}; retrying in {delay:.0f}s")
+
+    async def _deliver(self, notifier: Any, entry: Dict[str, Any]):
+        try:
+            message_id = await notifier.deliver(entry['message'], chat_id=entry['chat_id'])
+        except DeliveryError as e:
+            if e.permanent:
+                if self._split(entry):
+                    logger.warning(f"Digest rejected ({e}); re-queued its tents as separate messages")
+                else:
+                    logger.error(f"Dropping undeliverable notification: {e}")
+                    self._delete(entry['id'])
+            else:
+                self._reschedule(entry, e)
+            return
+        except Exception as e:
+            self._reschedule(entry, DeliveryError(str(e)))
+            return
+
+        self._delete(entry['id'])
+        self._last_sent[entry['chat_id']] = time.time()
+        if entry['reaction']:
+            notifier._maybe_react(message_id, entry['reaction'])
+
+    async def run(self, notifier: Any):
+        """Drain the outbox forever through `notifier.deliver`."""
+        wakeup = self._event()
+        pending = self.pending_count()
+        if pending:
+            logger.info(f"Resuming delivery of {pending} queued notification(s)")
+        while True:
+            wakeup.clear()
+            heads = self._heads()
+            if not heads:
+                await wakeup.wait()
+                continue
+
+            entry = min(heads, key=self._ready_at)
+            delay = self._ready_at(entry) - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._deliver(notifier, entry)
+
+    def close(self):
+        self.conn.close()
@@ -1,60 +1,115 @@
 """Telegram notification implementation"""
 
 import logging
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
-import requests
+import aiohttp
 
+from ..metrics import DELIVERIES, timed
 from .base_notifier import BaseNotifier
+from .outbox import DeliveryError
 
 logger = logging.getLogger(__name__)
 
+API_TIMEOUT = 20
+
 
 class TelegramNotifier(BaseNotifier):
     """Send notifications via Telegram Bot API"""
 
     def __init__(self, bot_token: str, chat_id: str):
+        super().__init__()
         self.bot_token = bot_token
         self.chat_id = chat_id
+        self._session: Optional[aiohttp.ClientSession] = None
 
-    def send_notification(self, message: str) -> Optional[int]:
-        """Send notification via Telegram.
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session, created lazily inside the running event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+            )
+        return self._session
 
-        Returns message_id on success (used for optional reactions).
+    def _api_url(self, method: str) -> str:
+        return f"https://api.telegram.org/bot{self.bot_token}/{method}"
+
+    async def deliver(self, message: str, chat_id: Optional[str] = None) -> Optional[int]:
+        """Send a message and return its message_id.
+
+        Raises DeliveryError with Telegram's retry_after on 429, and as permanent on 400
+        (the message itself was rejected, e.g. bad markup) so the outbox does not retry it
+        forever. Other errors, including 401/403/404 from a revoked token or a blocked bot,
+        are retried with backoff so queued alerts survive until the setup is fixed.
         """
+        payload = {
+            'chat_id': chat_id or self.chat_id,
+            'text': message,
+            'parse_mode': 'HTML',
+        }
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            payload = {
-                'chat_id': self.chat_id,
-                'text': message,
-                'parse_mode': 'HTML',
-            }
-
-            response = requests.post(url, json=payload, timeout=20)
-            if response.status_code == 200:
-                data = response.json()
-                msg_id = data.get('result', {}).get('message_id')
-                logger.info("Telegram notification sent successfully")
-                return msg_id
+            with timed('telegram_send'):
+                message_id = await self._post_message(payload)
+        except DeliveryError as e:
+            DELIVERIES.inc(result='rate_limited' if e.retry_after is not None else 'error')
+            raise
+        DELIVERIES.inc(result='success')
+        return message_id
 
-            logger.error(f"Failed to send Telegram notification: {response.text}")
-            return None
+    async def _post_message(self, payload: Dict[str, Any]) -> Optional[int]:
+        try:
+            async with self._get_session().post(self._api_url('sendMessage'), json=payload) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    logger.info("Telegram notification sent successfully")
+                    return data.get('result', {}).get('message_id')
 
+                body = await response.text()
+                if response.status == 429:
+                    retry_after = None
+                    try:
+                        retry_after = (await response.json(content_type=None)).get('parameters', {}).get('retry_after')
+                    except Exception:
+                        pass
+                    raise DeliveryError(f"Telegram rate limit: {body}", retry_after=retry_after)
+                raise DeliveryError(
+                    f"Telegram API error {response.status}: {body}",
+                    permanent=response.status == 400,
+                )
+        except DeliveryError:
+            raise
         except Exception as e:
-            logger.error(f"Error sending Telegram notification: {e}")
+            raise DeliveryError(f"Error sending Telegram notification: {e}")
+
+    async def send_notification(self, message: str) -> Optional[int]:
+        """Send notification via Telegram.
+
+        Returns message_id on success (used for optional reactions).
+        """
+        try:
+            return await self.deliver(message)
+        except DeliveryError as e:
+            logger.error(f"Failed to send Telegram notification: {e}")
             return None
 
-    def react_to_message(self, message_id: Any, emoji: str):
+    async def react_to_message(self, message_id: Any, emoji: str):
         """Best-effort: react to a Telegram message (requires Bot API support/permissions)."""
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/setMessageReaction"
             payload = {
                 'chat_id': self.chat_id,
                 'message_id': int(message_id),
                 'reaction': [{'type': 'emoji', 'emoji': emoji}],
             }
-            response = requests.post(url, json=payload, timeout=20)
-            if response.status_code != 200:
-                logger.info(f"Could not add reaction: {response.text}")
+            async with self._get_session().post(self._api_url('setMessageReaction'), json=payload) as response:
+                if response.status != 200:
+                    logger.info(f"Could not add reaction: {await response.text()}")
         except Exception as e:
             logger.info(f"Could not add reaction: {e}")
+
+    async def close(self):
+        """Finish pending reactions and close the HTTP session."""
+        await super().close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,101 @@
+"""Adaptive per-tent polling intervals"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from .state_manager import StateManager
+
+try:
+    from zoneinfo import ZoneInfo
+except Exception:  # pragma: no cover
+    ZoneInfo = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 60
+DEFAULT_MAX_INTERVAL = 900
+DEFAULT_HOT_WINDOW = 1800
+DEFAULT_QUIET_PERIOD = 6 * 3600
+DEFAULT_NIGHT_HOURS = (1, 7)
+# An hour of day counts as a release window once this many changes were seen in it.
+RELEASE_HOUR_MIN_CHANGES = 2
+
+
+def tent_setting(tent: Dict[str, Any], config: Dict[str, Any], key: str, default: Any) -> Any:
+    """A per-tent setting, falling back to the main config and then to `default`."""
+    return tent.get(key, config.get(key, default))
+
+
+def berlin_now() -> datetime:
+    """Current time in Europe/Berlin (falls back to local time without tz data)."""
+    if ZoneInfo is not None:
+        try:
+            return datetime.now(ZoneInfo('Europe/Berlin'))
+        except Exception:
+            pass
+    return datetime.now().astimezone()
+
+
+class AdaptivePollingPolicy:
+    """Chooses the next check interval for a tent from its change history.
+
+    - right after a detected change (hot window): poll at the floor
+    - within an hour of day where releases were seen before: poll at the floor
+    - at night in Europe/Berlin: poll at the ceiling
+    - otherwise: start from check_interval and double it for every quiet period
+      without changes, clamped to [floor, ceiling]
+
+    Settings come from the tent config and fall back to the main config:
+    adaptive_polling, min_check_interval, max_check_interval, hot_window,
+    quiet_period, night_hours ([start, end) hours).
+    """
+
+    def __init__(self, state_manager: StateManager, config: Optional[Dict[str, Any]] = None):
+        self.state_manager = state_manager
+        self.config = config or {}
+
+    def _in_release_window(self, tent_id: str, now: datetime) -> bool:
+        hours = self.state_manager.get_change_hours(tent_id)
+        current = now.hour
+        # Also warm up in the last half hour before a historic release hour.
+        upcoming = (now + timedelta(minutes=30)).hour
+        return any(hours.get(str(h), 0) >= RELEASE_HOUR_MIN_CHANGES for h in {current, upcoming})
+
+    def interval_for(self, tent: Dict[str, Any], now: Optional[datetime] = None) -> float:
+        base = float(tent.get('check_interval', 180))
+        if not tent_setting(tent, self.config, 'adaptive_polling', False):
+            return base
+
+        now = now or berlin_now()
+        floor = float(tent_setting(tent, self.config, 'min_check_interval', DEFAULT_MIN_INTERVAL))
+        ceiling = float(tent_setting(tent, self.config, 'max_check_interval', DEFAULT_MAX_INTERVAL))
+        ceiling = max(floor, ceiling)
+        tent_id = tent['id']
+
+        last_change = self.state_manager.get_last_change(tent_id)
+        since_change = (now - last_change).total_seconds() if last_change else None
+
+        hot_window = float(tent_setting(tent, self.config, 'hot_window', DEFAULT_HOT_WINDOW))
+        if since_change is not None and since_change < hot_window:
+            interval, reason = floor, 'recent change'
+        elif self._in_release_window(tent_id, now):
+            interval, reason = floor, 'release window'
+        else:
+            night_start, night_end = tent_setting(tent, self.config, 'night_hours', DEFAULT_NIGHT_HOURS)
+            if night_start <= night_end:
+                at_night = night_start <= now.hour < night_end
+            else:  # the window wraps midnight, e.g. [23, 6]
+                at_night = now.hour >= night_start or now.hour < night_end
+            if at_night:
+                interval, reason = ceiling, 'night'
+            elif since_change is None:
+                interval, reason = base, 'no history'
+            else:
+                quiet_period = float(tent_setting(tent, self.config, 'quiet_period', DEFAULT_QUIET_PERIOD))
+                quiet_periods = int(since_change // quiet_period)
+                interval, reason = base * (2 ** min(quiet_periods, 16)), 'quiet'
+
+        interval = min(ceiling, max(floor, interval))
+        logger.debug(f"{tent_id}: next check in {interval:.0f}s ({reason})")
+        return interval
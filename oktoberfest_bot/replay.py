@@ -0,0 +1,90 @@
+"""Offline replay of recorded checks through extraction and the state diff"""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .notifiers.base_notifier import BaseNotifier
+from .scrapers.base_scraper import ScrapeResult
+from .scrapers.form_select import FormSelectScraper
+from .scrapers.recording import iter_archive_paths, load_archive
+from .state_manager import StateManager
+
+# Result fields compared between the recorded check and its replay.
+COMPARED_FIELDS = ('success', 'available_dates', 'available_times')
+
+
+class ReplayNotifier(BaseNotifier):
+    """Logs and keeps notifications instead of sending them"""
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__()
+        self.logger = logger
+        self.messages: List[str] = []
+
+    async def send_notification(self, message: str) -> Optional[int]:
+        self.messages.append(message)
+        self.logger.info(f"Notification: {message}")
+        return len(self.messages)
+
+
+def _compared(result: Dict[str, Any], fields=COMPARED_FIELDS) -> Dict[str, Any]:
+    return {key: result.get(key) for key in fields}
+
+
+async def replay_archives(
+    paths: List[str],
+    state_manager: StateManager,
+    notifier: BaseNotifier,
+    process_result: Callable[..., Awaitable[None]],
+    logger: logging.Logger,
+) -> Dict[str, Any]:
+    """Feed archives (oldest first) through FormSelectScraper and process_result.
+
+    Each replay starts from the fingerprint and times the recorded check started from,
+    so cached time slots are reused exactly when they were at the time. A replayed
+    result that differs from the one recorded is reported as a mismatch. If the check
+    reused cached time slots but the replay could not (e.g. archives without that
+    state), the time slots are left out of the comparison: they were never read from
+    the page.
+    """
+    scrapers: Dict[str, FormSelectScraper] = {}
+    seconds: List[float] = []
+    mismatches: List[str] = []
+    unreadable: List[str] = []
+
+    for path in iter_archive_paths(paths):
+        try:
+            archive = load_archive(path)
+            tent_config = archive['log']['_tent']
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"{path}: Unreadable archive: {e}")
+            unreadable.append(str(path))
+            continue
+
+        tent_id = tent_config['id']
+        scraper = scrapers.get(tent_id)
+        if scraper is None or scraper.config != tent_config:
+            scraper = scrapers[tent_id] = FormSelectScraper(tent_config)
+
+        start = time.perf_counter()
+        result: ScrapeResult = await scraper.replay(archive)
+        seconds.append(time.perf_counter() - start)
+
+        recorded = archive['log']['_result']
+        fields = COMPARED_FIELDS
+        if recorded.get('full_scan') is False and result.full_scan:
+            fields = tuple(f for f in COMPARED_FIELDS if f != 'available_times')
+        if _compared(result.to_dict(), fields) != _compared(recorded, fields):
+            logger.warning(f"{tent_config['name']}: Replay of {path.name} differs from the recorded result")
+            mismatches.append(str(path))
+        await process_result(tent_config, result, state_manager, notifier, logger)
+
+    await notifier.close()
+    return {
+        'archives': len(seconds),
+        'seconds': sum(seconds),
+        'mismatches': mismatches,
+        'unreadable': unreadable,
+        'notifications': len(getattr(notifier, 'messages', [])),
+    }
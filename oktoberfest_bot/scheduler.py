@@ -0,0 +1,144 @@
+"""Per-tent check scheduling with a global concurrency limit"""
+
+import asyncio
+import heapq
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 180
+DEFAULT_MAX_CONCURRENT = 3
+DEFAULT_CHECK_TIMEOUT = 300
+
+
+class TentScheduler:
+    """Runs each tent on its own deadline, keeping at most N checks in flight.
+
+    Deadlines live in a min-heap keyed by monotonic time. A tent is rescheduled only
+    after its own check finishes, so a slow page never overlaps with itself and never
+    delays the other tents (beyond the shared concurrency limit).
+    """
+
+    def __init__(
+        self,
+        run_check: Callable[[Dict[str, Any]], Awaitable[Any]],
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        check_timeout: Optional[float] = DEFAULT_CHECK_TIMEOUT,
+        interval_fn: Optional[Callable[[Dict[str, Any]], float]] = None,
+    ):
+        self.run_check = run_check
+        self.interval_fn = interval_fn
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.check_timeout = check_timeout
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        # Heap entries are (deadline, seq, tent_id); an entry is live only while its seq
+        # matches self._pending[tent_id], so rescheduling never needs a heap delete.
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = 0
+        self._pending: Dict[str, int] = {}
+        self._tents: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def interval_for(self, tent: Dict[str, Any]) -> float:
+        """Seconds to wait after a check before checking this tent again."""
+        if self.interval_fn is not None:
+            try:
+                return float(self.interval_fn(tent))
+            except Exception as e:
+                logger.error(f"{tent['id']}: Could not compute check interval - {e}")
+        return float(tent.get('check_interval', DEFAULT_INTERVAL))
+
+    def _push(self, tent_id: str, delay: float):
+        self._counter += 1
+        self._pending[tent_id] = self._counter
+        heapq.heappush(self._heap, (self._now() + max(0.0, delay), self._counter, tent_id))
+        self._wakeup.set()
+
+    def add(self, tent: Dict[str, Any], delay: float = 0.0):
+        """Schedule a tent (or replace its config); first check runs after `delay` seconds."""
+        tent_id = tent['id']
+        self._tents[tent_id] = tent
+        if tent_id not in self._running:
+            self._push(tent_id, delay)
+
+    def update(self, tent: Dict[str, Any]):
+        """Replace a scheduled tent's config; it takes effect with the tent's next check."""
+        if tent['id'] in self._tents:
+            self._tents[tent['id']] = tent
+
+    def remove(self, tent_id: str):
+        """Stop scheduling a tent and cancel its in-flight check, if any."""
+        self._tents.pop(tent_id, None)
+        self._pending.pop(tent_id, None)
+        task = self._running.pop(tent_id, None)
+        if task:
+            task.cancel()
+
+    def tent_ids(self) -> List[str]:
+        return list(self._tents)
+
+    def _pop_due(self) -> Tuple[List[str], Optional[float]]:
+        """Pop all tents whose deadline has passed; return them and the delay to the next one."""
+        now = self._now()
+        due: List[str] = []
+        while self._heap:
+            deadline, seq, tent_id = self._heap[0]
+            if self._pending.get(tent_id) != seq:
+                heapq.heappop(self._heap)
+                continue
+            if deadline > now:
+                return due, deadline - now
+            heapq.heappop(self._heap)
+            del self._pending[tent_id]
+            due.append(tent_id)
+        return due, None
+
+    async def _run_one(self, tent_id: str):
+        try:
+            async with self._semaphore:
+                if tent_id not in self._tents:
+                    return
+                tent = self._tents[tent_id]
+                if self.check_timeout:
+                    await asyncio.wait_for(self.run_check(tent), timeout=self.check_timeout)
+                else:
+                    await self.run_check(tent)
+        except asyncio.TimeoutError:
+            logger.error(f"{tent_id}: Check exceeded {self.check_timeout}s and was cancelled")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"{tent_id}: Unhandled error in scheduled check - {e}")
+        finally:
+            if self._running.get(tent_id) is asyncio.current_task():
+                del self._running[tent_id]
+                tent = self._tents.get(tent_id)
+                if tent is not None:
+                    self._push(tent_id, self.interval_for(tent))
+
+    async def run(self):
+        """Dispatch checks forever as their deadlines come due."""
+        while True:
+            due, wait = self._pop_due()
+            for tent_id in due:
+                self._running[tent_id] = asyncio.create_task(self._run_one(tent_id))
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self):
+        """Cancel in-flight checks and wait for them to unwind."""
+        tasks = list(self._running.values())
+        self._running.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,6 +1,31 @@
-"""Scraper implementations"""
+"""Scraper implementations
 
-from .base_scraper import BaseScraper, ScrapeResult
-from .form_select import FormSelectScraper
+Exports are imported lazily: browser-backed scrapers pull in Playwright and the HTTP
+scraper pulls in aiohttp, which is only worth paying for when they are used.
+"""
 
-__all__ = ['BaseScraper', 'ScrapeResult', 'FormSelectScraper']
+from importlib import import_module
+
+from .base_scraper import BaseScraper, ScrapeResult, TentSpec
+
+_LAZY_EXPORTS = {
+    'BrowserPool': '.browser_pool',
+    'DisplayPool': '.display_pool',
+    'FormSelectScraper': '.form_select',
+    'HttpSelectScraper': '.http_select',
+    'create_http_session': '.http_select',
+    'ResourceFilter': '.resource_filter',
+    'RecordingStore': '.recording',
+    'ScraperRegistry': '.registry',
+    'StorageStateCache': '.storage_cache',
+}
+
+__all__ = ['BaseScraper', 'ScrapeResult', 'TentSpec', 'BrowserPool', 'DisplayPool', 'FormSelectScraper', 'HttpSelectScraper', 'create_http_session', 'ResourceFilter', 'RecordingStore', 'ScraperRegistry', 'StorageStateCache']
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
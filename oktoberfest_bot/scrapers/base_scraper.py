@@ -1,9 +1,55 @@
 """Base scraper interface for checking tent reservations"""
 
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, NamedTuple, Optional, Pattern
 from datetime import datetime
 
+DEFAULT_DATE_SELECTOR = 'select.form-select'
+DEFAULT_SELECTOR_TIMEOUT = 60000
+DEFAULT_WATCH_URL_PATTERN = r'livewire'
+
+
+class TentSpec(NamedTuple):
+    """A tent's config, compiled once: parsed settings and precompiled patterns.
+
+    `config` is a read-only view of the raw tent config for settings without a field.
+    """
+
+    id: str
+    name: str
+    url: str
+    scraper_type: str
+    date_selector: str
+    time_selector: Optional[str]
+    selector_timeout: int
+    fingerprint_pattern: Optional[Pattern]
+    watch_pattern: Pattern
+    config: Mapping[str, Any]
+
+
+def compile_spec(tent_config: Mapping[str, Any]) -> TentSpec:
+    """Build a TentSpec; raises ValueError for invalid settings (e.g. a bad regex)"""
+    fingerprint_pattern = tent_config.get('fingerprint_url_pattern')
+    try:
+        return TentSpec(
+            id=tent_config['id'],
+            name=tent_config['name'],
+            url=tent_config['url'],
+            scraper_type=tent_config.get('scraper_type', 'form_select'),
+            date_selector=tent_config.get('selector', DEFAULT_DATE_SELECTOR),
+            time_selector=tent_config.get('time_selector') or None,
+            selector_timeout=int(tent_config.get('selector_timeout', DEFAULT_SELECTOR_TIMEOUT)),
+            fingerprint_pattern=re.compile(fingerprint_pattern) if fingerprint_pattern else None,
+            watch_pattern=re.compile(tent_config.get('watch_url_pattern', DEFAULT_WATCH_URL_PATTERN)),
+            config=MappingProxyType(dict(tent_config)),
+        )
+    except re.error as e:
+        raise ValueError(f"Tent '{tent_config.get('id')}': invalid pattern: {e}")
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Tent '{tent_config.get('id')}': invalid setting: {e}")
+
 
 class ScrapeResult:
     """Result from a scraping operation"""
@@ -15,6 +61,8 @@ class ScrapeResult:
         available_dates: Optional[List[Dict]] = None,
         available_times: Optional[Dict[str, Dict[str, Any]]] = None,
         error: str = None,
+        fingerprint: Optional[str] = None,
+        full_scan: bool = True,
     ):
         self.success = success
         self.dates_available = dates_available
@@ -23,6 +71,9 @@ class ScrapeResult:
         # Each entry: {"date_text": str, "times": [{"value": str, "text": str}, ...]}
         self.available_times = available_times or {}
         self.error = error
+        # Optional hash of the page content; full_scan is False when cached times were reused.
+        self.fingerprint = fingerprint
+        self.full_scan = full_scan
         self.timestamp = datetime.now().isoformat()
 
     def to_dict(self) -> Dict[str, Any]:
@@ -35,19 +86,46 @@ class ScrapeResult:
             result['dates_available'] = self.dates_available
             result['available_dates'] = self.available_dates
             result['available_times'] = self.available_times
+            result['fingerprint'] = self.fingerprint
+            result['full_scan'] = self.full_scan
         else:
             result['error'] = self.error
         return result
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScrapeResult':
+        """Rebuild a result from to_dict() output"""
+        result = cls(
+            success=bool(data.get('success')),
+            dates_available=data.get('dates_available', False),
+            available_dates=data.get('available_dates'),
+            available_times=data.get('available_times'),
+            error=data.get('error'),
+            fingerprint=data.get('fingerprint'),
+            full_scan=data.get('full_scan', True),
+        )
+        result.timestamp = data.get('timestamp', result.timestamp)
+        return result
+
 
 class BaseScraper(ABC):
     """Abstract base class for tent reservation scrapers"""
 
-    def __init__(self, tent_config: Dict[str, Any]):
-        self.tent_id = tent_config['id']
-        self.tent_name = tent_config['name']
-        self.url = tent_config['url']
-        self.config = tent_config
+    def __init__(self, tent_config: Mapping[str, Any]):
+        self.spec = self.compile_spec(tent_config)
+        self.tent_id = self.spec.id
+        self.tent_name = self.spec.name
+        self.url = self.spec.url
+        self.config = self.spec.config
+        # Set by the caller to allow skipping unchanged work:
+        # {"value": str, "full_scan_at": iso str} and the last known available_times.
+        self.previous_fingerprint: Optional[Dict[str, Any]] = None
+        self.previous_times: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def compile_spec(cls, tent_config: Mapping[str, Any]) -> TentSpec:
+        """Compile a tent config for this scraper type (override to add checks)"""
+        return compile_spec(tent_config)
 
     @abstractmethod
     async def check_availability(self) -> ScrapeResult:
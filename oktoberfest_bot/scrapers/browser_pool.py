@@ -0,0 +1,123 @@
+"""Long-lived Chromium pool shared by all scrapers"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import async_playwright
+
+from ..metrics import timed
+from .display_pool import DisplayPool
+from .recording import RecordingStore
+from .storage_cache import StorageStateCache
+
+logger = logging.getLogger(__name__)
+
+LAUNCH_ARGS: List[str] = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-blink-features=AutomationControlled',
+]
+
+CONTEXT_OPTIONS: Dict[str, Any] = {
+    'user_agent': (
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
+    ),
+    'viewport': {'width': 1365, 'height': 768},
+    'locale': 'de-DE',
+}
+
+
+class BrowserPool:
+    """Keeps one Playwright driver and a warm headless Chromium for the life of the monitor.
+
+    Each check leases a fresh, isolated BrowserContext instead of launching a browser.
+    The driver and browser are started lazily on first use and relaunched if Chromium dies.
+    Headed fallbacks lease an Xvfb display from `displays`; `storage`, if set, keeps
+    per-tent cookies and localStorage between checks; `recorder`, if set, archives the
+    traffic of every check for offline replay.
+    """
+
+    def __init__(
+        self,
+        displays: Optional[DisplayPool] = None,
+        storage: Optional[StorageStateCache] = None,
+        recorder: Optional[RecordingStore] = None,
+    ):
+        self.displays = displays or DisplayPool()
+        self.storage = storage
+        self.recorder = recorder
+        # Long-lived pages of tents in watch mode, keyed by tent id (see LivePage).
+        self.live_pages: Dict[str, Any] = {}
+        self._playwright = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+
+    async def _ensure_playwright(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def launch(self, headless: bool = True, **kwargs) -> Any:
+        """Launch a new Chromium instance on the shared driver.
+
+        Prefers the installed Chrome channel and falls back to bundled Chromium.
+        """
+        p = await self._ensure_playwright()
+        try:
+            return await p.chromium.launch(headless=headless, channel='chrome', args=LAUNCH_ARGS, **kwargs)
+        except Exception:
+            return await p.chromium.launch(headless=headless, args=LAUNCH_ARGS, **kwargs)
+
+    async def get_browser(self) -> Any:
+        """Return the warm headless browser, (re)launching it if needed."""
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._browser is not None:
+                    logger.warning("Shared browser disconnected; relaunching")
+                with timed('browser_launch'):
+                    self._browser = await self.launch(headless=True)
+                logger.info("Shared headless browser launched")
+            return self._browser
+
+    async def new_context(self, browser: Any = None, **options) -> Any:
+        """Create a BrowserContext with the default options; the caller closes it."""
+        if browser is None:
+            browser = await self.get_browser()
+        context_options = dict(CONTEXT_OPTIONS)
+        context_options.update(options)
+        return await browser.new_context(**context_options)
+
+    @asynccontextmanager
+    async def context(self, browser: Any = None, **options) -> AsyncIterator[Any]:
+        """Lease a fresh BrowserContext; it is closed when the block exits."""
+        context = await self.new_context(browser, **options)
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def close(self):
+        """Close the shared browser and stop the Playwright driver."""
+        for live in list(self.live_pages.values()):
+            await live.close()
+        self.live_pages.clear()
+        async with self._lock:
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception:
+                    pass
+                self._browser = None
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception:
+                    pass
+                self._playwright = None
+        await self.displays.close()
@@ -0,0 +1,165 @@
+"""Shared pool of Xvfb displays for headed Chromium"""
+
+import asyncio
+import logging
+import os
+import subprocess
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DISPLAY_COUNT = 2
+DEFAULT_FIRST_DISPLAY = 99
+SCREEN = '1365x768x24'
+# Seconds to wait for a new server to create its socket.
+STARTUP_TIMEOUT = 5.0
+# Seconds a server gets to exit after SIGTERM before it is killed.
+TERMINATE_TIMEOUT = 5.0
+# Display numbers tried past the first one before giving up on a slot.
+MAX_DISPLAY_PROBES = 20
+
+
+def _socket_path(number: int) -> str:
+    return f'/tmp/.X11-unix/X{number}'
+
+
+def _lock_path(number: int) -> str:
+    return f'/tmp/.X{number}-lock'
+
+
+class DisplayPool:
+    """Starts a few Xvfb servers once and leases one display to each headed browser.
+
+    Leases are exclusive, so concurrent headed fallbacks never share a display, and the
+    display reaches Chromium through the launch `env` instead of the process-global
+    os.environ. A server is health-checked on every lease and restarted if it died; a
+    slot whose restart failed stays in the pool and is retried on its next lease.
+    If DISPLAY is already set (a real desktop), that display is handed out instead.
+    """
+
+    def __init__(self, size: int = DEFAULT_DISPLAY_COUNT, first_display: int = DEFAULT_FIRST_DISPLAY):
+        self.size = max(1, int(size))
+        self.first_display = int(first_display)
+        self._servers: Dict[int, subprocess.Popen] = {}
+        self._free: Optional[asyncio.Queue] = None
+        self._unavailable = False
+        self._lock = asyncio.Lock()
+
+    def _healthy(self, number: int) -> bool:
+        proc = self._servers.get(number)
+        return proc is not None and proc.poll() is None and os.path.exists(_socket_path(number))
+
+    async def _spawn(self, number: int) -> bool:
+        """Start Xvfb on :number and wait until it accepts connections."""
+        try:
+            proc = subprocess.Popen(
+                ['Xvfb', f':{number}', '-screen', '0', SCREEN, '-nolisten', 'tcp'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except Exception as e:
+            logger.warning(f"Could not start Xvfb: {e}")
+            self._unavailable = True
+            return False
+
+        self._servers[number] = proc
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STARTUP_TIMEOUT
+        while loop.time() < deadline:
+            if proc.poll() is not None:
+                break
+            if os.path.exists(_socket_path(number)):
+                return True
+            await asyncio.sleep(0.05)
+        await self._terminate(number)
+        return False
+
+    async def _terminate(self, number: int):
+        """Stop a server without blocking the event loop while it exits."""
+        proc = self._servers.pop(number, None)
+        if proc is None:
+            return
+        try:
+            proc.terminate()
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + TERMINATE_TIMEOUT
+            while proc.poll() is None:
+                if loop.time() >= deadline:
+                    proc.kill()
+                    break
+                await asyncio.sleep(0.05)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+    async def _start_one(self, taken: List[int]) -> Optional[int]:
+        """Start a server on the first free display number; returns it or None."""
+        number = max([self.first_display - 1] + taken + list(self._servers)) + 1
+        for candidate in range(number, number + MAX_DISPLAY_PROBES):
+            if self._unavailable:
+                return None
+            if os.path.exists(_lock_path(candidate)):
+                continue  # owned by another X server
+            if await self._spawn(candidate):
+                return candidate
+        return None
+
+    async def _ensure_started(self) -> asyncio.Queue:
+        async with self._lock:
+            if self._free is None:
+                self._free = asyncio.Queue()
+                started: List[int] = []
+                for _ in range(self.size):
+                    number = await self._start_one(started)
+                    if number is None:
+                        break
+                    started.append(number)
+                    self._free.put_nowait(number)
+                if started:
+                    logger.info(f"Started Xvfb display(s): {', '.join(f':{n}' for n in started)}")
+            return self._free
+
+    async def _revive(self, number: int) -> Optional[int]:
+        """Replace a dead server; returns the display number now serving its slot."""
+        logger.warning(f"Xvfb display :{number} is not responding; restarting it")
+        await self._terminate(number)
+        if await self._spawn(number):
+            return number
+        return await self._start_one([])
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Optional[str]]:
+        """Lease a display name such as ':99' (None if no display can be provided)."""
+        existing = os.environ.get('DISPLAY')
+        if existing:
+            yield existing
+            return
+
+        free = await self._ensure_started()
+        if free.empty() and not self._servers:
+            yield None
+            return
+
+        number = await free.get()
+        try:
+            if not self._healthy(number):
+                revived = await self._revive(number)
+                if revived is None:
+                    yield None
+                    return
+                number = revived
+            yield f':{number}'
+        finally:
+            # Also returned when it could not be restarted, so the next lease retries it
+            # instead of the pool shrinking for good.
+            free.put_nowait(number)
+
+    async def close(self):
+        """Stop all Xvfb servers."""
+        async with self._lock:
+            for number in list(self._servers):
+                await self._terminate(number)
+            self._free = None
@@ -1,249 +1,616 @@
 """Scraper for tent reservation pages using form select dropdowns"""
 
 import asyncio
+import hashlib
+import json
 import logging
 import os
-import subprocess
-from typing import Any, Dict, List, Optional, Tuple
-
-from playwright.async_api import async_playwright
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from ..metrics import timed
 from .base_scraper import BaseScraper, ScrapeResult
+from .browser_pool import BrowserPool
+from .live_page import DEFAULT_WATCH_MAX_AGE, LivePage
+from .recording import ReplayPage, previous_state
+from .resource_filter import ResourceFilter
 
 logger = logging.getLogger(__name__)
 
+# Defaults for waiting on the time <select> after choosing a date (milliseconds).
+DEFAULT_TIME_WAIT_TIMEOUT = 3000
+DEFAULT_TIME_WAIT_GRACE = 250
+DEFAULT_TIME_WAIT_SETTLE = 50
+
+# Seconds after which a full time-slot walk is forced even if the page looks unchanged.
+DEFAULT_FINGERPRINT_MAX_AGE = 600
+
+# Arms a one-shot MutationObserver that resolves window.__okbSelectChanged once a <select>
+# other than the date select (or one of its options) changes and the DOM has been quiet for
+# `settle` ms, or resolves false after `cap` ms.
+_ARM_SELECT_MUTATION_JS = """
+([dateSelector, cap, settle]) => {
+  const dateEl = document.querySelector(dateSelector);
+  const isTimeSelectNode = (node) => {
+    const el = node && node.nodeType === 1 ? node : (node && node.parentElement);
+    if (!el || (dateEl && (el === dateEl || dateEl.contains(el)))) return false;
+    return el.tagName === 'SELECT' || !!el.closest('select');
+  };
+  const addsSelect = (node) => node.nodeType === 1 && node !== dateEl &&
+    (node.tagName === 'SELECT' || (!!node.querySelector && !!node.querySelector('select')));
+  window.__okbSelectChanged = new Promise((resolve) => {
+    let settleTimer = null;
+    let capTimer = null;
+    const observer = new MutationObserver((records) => {
+      const relevant = records.some((r) =>
+        isTimeSelectNode(r.target) || Array.from(r.addedNodes).some(addsSelect));
+      if (relevant) {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(() => finish(true), settle);
+      }
+    });
+    const finish = (changed) => {
+      observer.disconnect();
+      clearTimeout(settleTimer);
+      clearTimeout(capTimer);
+      resolve(changed);
+    };
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+    capTimer = setTimeout(() => finish(false), cap);
+  });
+}
+"""
+
+# Enabled, non-placeholder options of a single <select>, extracted in-page. Options without a
+# value attribute are placeholders (o.value would fall back to their text).
+_EXTRACT_SELECT_JS = """
+(selector) => {
+  const sel = document.querySelector(selector);
+  if (!sel || !sel.options) return [];
+  return Array.from(sel.options)
+    .filter((o) => !o.disabled && o.getAttribute('value'))
+    .map((o) => ({value: o.getAttribute('value'), text: (o.innerText || o.text || '').trim()}));
+}
+"""
+
+# All <select> elements with id, name and enabled options, as a single JSON structure.
+_SNAPSHOT_SELECTS_JS = """
+(dateSelector) => {
+  const dateEl = dateSelector ? document.querySelector(dateSelector) : null;
+  return Array.from(document.querySelectorAll('select')).map((sel) => ({
+    id: sel.id || '',
+    name: sel.getAttribute('name') || '',
+    is_date: sel === dateEl,
+    options: Array.from(sel.options)
+      .filter((o) => !o.disabled && o.getAttribute('value'))
+      .map((o) => ({value: o.getAttribute('value'), text: (o.innerText || o.text || '').trim()})),
+  }));
+}
+"""
+
+_TIME_SELECT_TOKENS = ['time', 'uhr', 'booking_list', 'slot', 'termin', 'session']
+_TIME_LABEL_WORDS = ('mittag', 'vormittag', 'nachmittag', 'abend', 'nachts')
+
+# e.g. "Freitag, 25.09.2026" or "25.09.2026"
+_DATE_RE = re.compile(r"\b\d{2}\.\d{2}\.\d{4}\b")
+
+
+def _looks_like_date(text: str) -> bool:
+    return _DATE_RE.search(text) is not None
+
+
+def _looks_like_time(text: str) -> bool:
+    t = (text or '').strip().lower()
+    if not t:
+        return False
+    if _looks_like_date(t):
+        return False
+    # Common patterns/labels
+    if ':' in t or 'uhr' in t:
+        return True
+    if any(word in t for word in _TIME_LABEL_WORDS):
+        return True
+    # Short labels like "Lunch"/"Dinner" etc.
+    if len(t) <= 12:
+        return True
+    return False
+
+
+class _XhrTracker:
+    """Tracks in-flight XHR/fetch requests on a page while a date is being selected."""
+
+    def __init__(self, page: Any):
+        self.page = page
+        self.started = 0
+        self._inflight = set()
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def _on_request(self, request: Any):
+        if request.resource_type in ('xhr', 'fetch'):
+            self.started += 1
+            self._inflight.add(request)
+            self.idle.clear()
+
+    def _on_done(self, request: Any):
+        self._inflight.discard(request)
+        if not self._inflight:
+            self.idle.set()
+
+    def __enter__(self):
+        self.page.on('request', self._on_request)
+        self.page.on('requestfinished', self._on_done)
+        self.page.on('requestfailed', self._on_done)
+        return self
+
+    def __exit__(self, *exc):
+        self.page.remove_listener('request', self._on_request)
+        self.page.remove_listener('requestfinished', self._on_done)
+        self.page.remove_listener('requestfailed', self._on_done)
+
 
 class FormSelectScraper(BaseScraper):
     """Scraper for tents using select dropdown detection"""
 
-    def _start_xvfb(self) -> Tuple[Optional[subprocess.Popen], Optional[str]]:
-        """Start a temporary Xvfb display for headed Chromium (helps with some bot protection).
+    def __init__(self, tent_config: Dict[str, Any], browser_pool: Optional[BrowserPool] = None):
+        super().__init__(tent_config)
+        self.browser_pool = browser_pool
 
-        Returns (proc, display). If Xvfb cannot be started, returns (None, None).
-        """
-        if os.environ.get('DISPLAY'):
-            return None, None
-
-        display = ':99'
-        try:
-            proc = subprocess.Popen(
-                ['Xvfb', display, '-screen', '0', '1365x768x24', '-nolisten', 'tcp'],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-            return proc, display
-        except Exception:
-            return None, None
-
-    async def _extract_select_handle(self, select_element: Any) -> List[Dict[str, str]]:
-        """Extract available options from a <select> ElementHandle."""
-        if not select_element:
-            return []
+    async def _extract_select(self, page: Any, selector: str) -> List[Dict[str, str]]:
+        """Extract available options from a <select> via CSS selector (one roundtrip)."""
+        return await page.evaluate(_EXTRACT_SELECT_JS, selector)
 
-        options = await select_element.query_selector_all('option')
+    async def _snapshot_selects(self, page: Any, date_selector: str) -> List[Dict[str, Any]]:
+        """Return every <select> on the page with its id, name and enabled options (one roundtrip)."""
+        return await page.evaluate(_SNAPSHOT_SELECTS_JS, date_selector)
 
-        available_options: List[Dict[str, str]] = []
-        for option in options:
-            is_disabled = await option.get_attribute('disabled')
-            value = await option.get_attribute('value')
-            text = await option.inner_text()
+    def _guess_time_options(self, selects: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Heuristic: pick the options of a secondary <select> that likely represents time slots.
 
-            # Skip placeholders
-            if not is_disabled and value and value != "":
-                available_options.append({'value': value, 'text': (text or '').strip()})
+        Works on a snapshot from _snapshot_selects; returns [] if no candidate has options.
+        """
+        preferred: List[Dict[str, Any]] = []
+        other: List[Dict[str, Any]] = []
+        for cand in selects:
+            if cand.get('is_date'):
+                continue
+            # First pass: look for selects with recognizable id/name.
+            blob = f"{cand.get('id') or ''} {cand.get('name') or ''}".lower()
+            if any(token in blob for token in _TIME_SELECT_TOKENS):
+                preferred.append(cand)
+            else:
+                other.append(cand)
+
+        for group in (preferred, other):
+            for cand in group:
+                if cand.get('options'):
+                    return cand['options']
+        return []
+
+    async def _select_date_and_wait(self, page: Any, date_select: Any, date_selector: str, value: str):
+        """Select a date and wait only as long as the page needs to update its time <select>.
+
+        If no XHR/fetch was triggered, returns as soon as the time select mutates or the grace
+        period passes (a static page). Otherwise it also waits for the requests to finish, since
+        an early mutation may only be the select being disabled while loading, and then for the
+        DOM to apply the response. All of it is capped by `time_wait_timeout`.
+        """
+        cap_ms = int(self.config.get('time_wait_timeout', DEFAULT_TIME_WAIT_TIMEOUT))
+        grace = int(self.config.get('time_wait_grace', DEFAULT_TIME_WAIT_GRACE)) / 1000
+        settle_ms = int(self.config.get('time_wait_settle', DEFAULT_TIME_WAIT_SETTLE))
 
-        return available_options
+        await page.evaluate(_ARM_SELECT_MUTATION_JS, [date_selector, cap_ms, settle_ms])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + cap_ms / 1000
 
-    async def _extract_select(self, page: Any, selector: str) -> List[Dict[str, str]]:
-        """Extract available options from a <select> via CSS selector."""
-        select_element = await page.query_selector(selector)
-        return await self._extract_select_handle(select_element)
+        with _XhrTracker(page) as xhr:
+            await date_select.select_option(value=value)
+            changed = asyncio.ensure_future(page.evaluate('() => window.__okbSelectChanged'))
+            # The in-page promise always resolves by itself; never leave its errors unretrieved.
+            changed.add_done_callback(lambda f: f.cancelled() or f.exception())
 
-    async def _guess_time_select(self, page: Any, date_selector: str) -> Any:
-        """Heuristic: pick a secondary <select> that likely represents a time slot dropdown.
+            done, _ = await asyncio.wait({changed}, timeout=grace)
+            if not xhr.started:
+                return
 
-        Returns an ElementHandle or None.
+            try:
+                await asyncio.wait_for(xhr.idle.wait(), timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                return
+            # Requests are done; give the DOM a moment to apply the response.
+            remaining = max(0.0, deadline - loop.time())
+            if done:
+                # The one-shot observer already fired (e.g. on the loading state).
+                await asyncio.sleep(min(remaining, settle_ms / 1000))
+            else:
+                await asyncio.wait({changed}, timeout=min(remaining, grace))
+
+    def _capture_responses(self, page: Any) -> Tuple[List[Any], Callable[[], None]]:
+        """Collect bodies of XHR/fetch responses whose URL matches `fingerprint_url_pattern`.
+
+        Returns a list that fills with body-reading tasks while the page loads, and a
+        function that stops the capture.
         """
+        regex = self.spec.fingerprint_pattern
+        tasks: List[Any] = []
+        if regex is None:
+            return tasks, lambda: None
+
+        def _on_response(response: Any):
+            if response.request.resource_type in ('xhr', 'fetch') and regex.search(response.url):
+                tasks.append(asyncio.ensure_future(response.body()))
+
+        page.on('response', _on_response)
+        return tasks, lambda: page.remove_listener('response', _on_response)
+
+    async def _fingerprint(self, page: Any, date_selector: str, response_bodies: List[Any]) -> str:
+        """Hash every select's options plus the captured response bodies."""
+        selects = await self._snapshot_selects(page, date_selector)
+        body_hashes: List[str] = []
+        if response_bodies:
+            done, pending = await asyncio.wait(response_bodies, timeout=2)
+            for task in pending:
+                task.cancel()
+            for task in done:
+                if not task.exception():
+                    body_hashes.append(hashlib.sha256(task.result()).hexdigest())
+        payload = json.dumps({'selects': selects, 'responses': sorted(body_hashes)}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _can_reuse_times(self, fingerprint: str) -> bool:
+        """True if the page matches the previous check and the last full scan is recent enough."""
+        previous = self.previous_fingerprint or {}
+        if not fingerprint or previous.get('value') != fingerprint or not previous.get('full_scan_at'):
+            return False
         try:
-            date_el = await page.query_selector(date_selector)
-            selects = await page.query_selector_all('select')
-            candidates = [s for s in selects if s != date_el]
-
-            # 1) First pass: look for selects with recognizable id/name.
-            preferred: List[Any] = []
-            other: List[Any] = []
-            for cand in candidates:
-                _id = (await cand.get_attribute('id')) or ''
-                _name = (await cand.get_attribute('name')) or ''
-                blob = f"{_id} {_name}".lower()
-                if any(token in blob for token in ['time', 'uhr', 'booking_list', 'slot', 'termin', 'session']):
-                    preferred.append(cand)
-                else:
-                    other.append(cand)
-
-            for group in (preferred, other):
-                for cand in group:
-                    opts = await self._extract_select_handle(cand)
-                    if len(opts) >= 1:
-                        return cand
+            age = (datetime.now() - datetime.fromisoformat(previous['full_scan_at'])).total_seconds()
+        except ValueError:
+            return False
+        return age < float(self.config.get('fingerprint_max_age', DEFAULT_FINGERPRINT_MAX_AGE))
+
+    async def _scan_times(self, page: Any, dates: List[Dict[str, str]], date_selector: str) -> Dict[str, Dict[str, Any]]:
+        """Select each date in turn on one page and collect its time options."""
+        time_selector = self.spec.time_selector
+        date_select = await page.query_selector(date_selector)
+        available_times: Dict[str, Dict[str, Any]] = {}
+        for date in dates:
+            try:
+                await self._select_date_and_wait(page, date_select, date_selector, date['value'])
 
-        except Exception:
-            return None
+                if time_selector:
+                    times = await self._extract_select(page, time_selector)
+                else:
+                    # Auto-detect after selecting a date (some pages create the time dropdown dynamically)
+                    times = self._guess_time_options(await self._snapshot_selects(page, date_selector))
 
-        return None
+                # Filter out bogus "times" that are actually dates or other long labels
+                times = [t for t in times if _looks_like_time(t.get('text', ''))]
 
-    async def check_availability(self) -> ScrapeResult:
-        """Check for available dates (and optionally times) on the reservation page."""
-        logger.info(f"Checking availability for {self.tent_name}...")
+                if times:
+                    available_times[date['value']] = {
+                        'date_text': date['text'],
+                        'times': times,
+                    }
+            except Exception as e:
+                logger.info(f"{self.tent_name}: Failed to extract times for date {date.get('text')}: {e}")
+        return available_times
+
+    async def _scan_times_on_new_page(
+        self, context: Any, dates: List[Dict[str, str]], date_selector: str,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Load the tent in an extra page of the same context and scan a share of the dates."""
+        page = await context.new_page()
+        page.set_default_timeout(30000)
+        try:
+            await self._load(page)
+            await page.wait_for_selector(date_selector, timeout=self.spec.selector_timeout)
+            return await self._scan_times(page, dates, date_selector)
+        finally:
+            try:
+                await page.close()
+            except Exception:
+                pass
 
-        async with async_playwright() as p:
-            async def _launch(headless: bool):
-                args = [
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-blink-features=AutomationControlled',
-                ]
-                try:
-                    return await p.chromium.launch(headless=headless, channel='chrome', args=args)
-                except Exception:
-                    return await p.chromium.launch(headless=headless, args=args)
-
-            async def _run_once(browser) -> ScrapeResult:
-                page = await browser.new_page(
-                    user_agent=(
-                        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
-                        '(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
-                    ),
-                    viewport={'width': 1365, 'height': 768},
-                    locale='de-DE',
-                )
-                page.set_default_timeout(30000)
+    async def _scan_all_times(self, page: Any, dates: List[Dict[str, str]], date_selector: str) -> Dict[str, Dict[str, Any]]:
+        """Collect time options for all dates, split across up to `time_slot_parallelism` pages.
 
-                logger.info(f"Loading page: {self.url}")
-                await page.goto(self.url, wait_until='domcontentloaded')
-                try:
-                    await page.wait_for_load_state('networkidle', timeout=15000)
-                except Exception:
-                    pass
+        Each page has its own form state, so selections on one never disturb another.
+        Page 0 is the already loaded one; the others are opened in the same context.
+        """
+        workers = min(len(dates), max(1, int(self.config.get('time_slot_parallelism', 1))))
+        if workers <= 1:
+            return await self._scan_times(page, dates, date_selector)
+
+        shares = [dates[i::workers] for i in range(workers)]
+        logger.info(f"{self.tent_name}: Scanning time slots of {len(dates)} dates on {workers} pages")
+        results = await asyncio.gather(
+            self._scan_times(page, shares[0], date_selector),
+            *(self._scan_times_on_new_page(page.context, share, date_selector) for share in shares[1:]),
+            return_exceptions=True,
+        )
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for share, result in zip(shares, results):
+            if isinstance(result, BaseException):
+                logger.info(f"{self.tent_name}: Parallel time-slot scan failed, retrying {len(share)} dates: {result}")
+                result = await self._scan_times(page, share, date_selector)
+            merged.update(result)
+        # Keep the order of the date dropdown.
+        return {d['value']: merged[d['value']] for d in dates if d['value'] in merged}
+
+    async def _run_once(self, context: Any) -> ScrapeResult:
+        """Load the page in a leased BrowserContext and extract dates (and optionally times)."""
+        resource_filter = ResourceFilter(self.config)
+        await resource_filter.attach(context)
+        try:
+            return await self._extract(context)
+        finally:
+            if resource_filter.enabled:
+                logger.info(f"{self.tent_name}: Page load {resource_filter.summary()}")
+
+    async def _extract(self, context: Any) -> ScrapeResult:
+        page = await context.new_page()
+        page.set_default_timeout(30000)
+
+        fingerprinting = bool(self.config.get('content_fingerprint', False))
+        if not fingerprinting:
+            await self._load(page)
+            return await self._read(page, [])
+
+        # Only the responses of the page load go into the fingerprint, not the time-slot walk.
+        response_bodies, stop_capture = self._capture_responses(page)
+        try:
+            await self._load(page)
+        finally:
+            stop_capture()
+        try:
+            return await self._read(page, response_bodies)
+        finally:
+            for task in response_bodies:
+                task.cancel()
+            await asyncio.gather(*response_bodies, return_exceptions=True)
+
+    async def _load(self, page: Any):
+        """Navigate to the tent page and wait for it to settle."""
+        logger.info(f"Loading page: {self.url}")
+        with timed('page_goto', self.tent_id):
+            await page.goto(self.url, wait_until='domcontentloaded')
+        try:
+            with timed('networkidle', self.tent_id):
+                await page.wait_for_load_state('networkidle', timeout=15000)
+        except Exception:
+            pass
 
-                date_selector = self.config.get('selector', 'select.form-select')
-                time_selector = self.config.get('time_selector')
-
-                try:
-                    await page.wait_for_selector(date_selector, timeout=60000)
-                except Exception:
-                    # Capture a tiny hint for debugging (often a bot-check page).
-                    try:
-                        body_head = (await page.inner_text('body'))[:200].replace('\n', ' ')
-                        logger.warning(f"Date select not found; body starts with: {body_head!r}")
-                    except Exception:
-                        pass
-                    return ScrapeResult(success=False, error='Select element not found')
-
-                # Dates
-                available_dates = await self._extract_select(page, date_selector)
-                logger.info(f"Found {len(available_dates)} available date options")
-
-                # Times (optional; auto-detect if not configured)
-                available_times: Dict[str, Dict[str, Any]] = {}
-                if available_dates:
-                    date_select = await page.query_selector(date_selector)
-
-                    guessed_time_select = None
-
-                    def _looks_like_date(text: str) -> bool:
-                        # e.g. "Freitag, 25.09.2026" or "25.09.2026"
-                        import re
-                        return bool(re.search(r"\b\d{2}\.\d{2}\.\d{4}\b", text))
-
-                    def _looks_like_time(text: str) -> bool:
-                        t = (text or '').strip().lower()
-                        if not t:
-                            return False
-                        if _looks_like_date(t):
-                            return False
-                        # Common patterns/labels
-                        if ':' in t or 'uhr' in t:
-                            return True
-                        if any(word in t for word in ['mittag', 'vormittag', 'nachmittag', 'abend', 'nachts']):
-                            return True
-                        # Short labels like "Lunch"/"Dinner" etc.
-                        if len(t) <= 12:
-                            return True
-                        return False
-
-                    for date in available_dates:
-                        try:
-                            await date_select.select_option(value=date['value'])
-                            await asyncio.sleep(2)
-
-                            # For auto-detect, re-guess after selecting a date (some pages create the time dropdown dynamically)
-                            if not time_selector:
-                                guessed_time_select = await self._guess_time_select(page, date_selector)
-
-                            if time_selector:
-                                times = await self._extract_select(page, time_selector)
-                            elif guessed_time_select:
-                                times = await self._extract_select_handle(guessed_time_select)
-                            else:
-                                times = []
-
-                            # Filter out bogus "times" that are actually dates or other long labels
-                            times = [t for t in times if _looks_like_time(t.get('text', ''))]
-
-                            if times:
-                                available_times[date['value']] = {
-                                    'date_text': date['text'],
-                                    'times': times,
-                                }
-                        except Exception as e:
-                            logger.info(f"{self.tent_name}: Failed to extract times for date {date.get('text')}: {e}")
+    async def _read(self, page: Any, response_bodies: List[Any]) -> ScrapeResult:
+        """Extract dates (and optionally times) from a loaded page."""
+        fingerprinting = bool(self.config.get('content_fingerprint', False))
+        date_selector = self.spec.date_selector
 
+        try:
+            with timed('wait_for_selector', self.tent_id):
+                await page.wait_for_selector(date_selector, timeout=self.spec.selector_timeout)
+        except Exception:
+            # Capture a tiny hint for debugging (often a bot-check page).
+            try:
+                body_head = (await page.inner_text('body'))[:200].replace('\n', ' ')
+                logger.warning(f"Date select not found; body starts with: {body_head!r}")
+            except Exception:
+                pass
+            return ScrapeResult(success=False, error='Select element not found')
+
+        # Dates
+        available_dates = await self._extract_select(page, date_selector)
+        logger.info(f"Found {len(available_dates)} available date options")
+
+        fingerprint = None
+        if fingerprinting:
+            fingerprint = await self._fingerprint(page, date_selector, response_bodies)
+            if self._can_reuse_times(fingerprint):
+                logger.info(f"{self.tent_name}: Page unchanged; reusing cached time slots")
                 return ScrapeResult(
                     success=True,
                     dates_available=len(available_dates) > 0,
                     available_dates=available_dates,
-                    available_times=available_times,
+                    available_times={
+                        d['value']: self.previous_times[d['value']]
+                        for d in available_dates if d['value'] in self.previous_times
+                    },
+                    fingerprint=fingerprint,
+                    full_scan=False,
                 )
 
-            browser = None
-            xvfb_proc = None
-            old_display = os.environ.get('DISPLAY')
+        # Times (optional; auto-detect if not configured)
+        available_times: Dict[str, Dict[str, Any]] = {}
+        if available_dates:
+            with timed('time_slots', self.tent_id):
+                available_times = await self._scan_all_times(page, available_dates, date_selector)
+
+        return ScrapeResult(
+            success=True,
+            dates_available=len(available_dates) > 0,
+            available_dates=available_dates,
+            available_times=available_times,
+            fingerprint=fingerprint,
+        )
+
+    def _storage(self, pool: BrowserPool) -> Any:
+        """The pool's storage cache, unless this tent opts out of persist_storage."""
+        return pool.storage if self.config.get('persist_storage', True) else None
+
+    async def _store_state(self, storage: Any, context: Any, result: ScrapeResult, seeded: bool):
+        """Save the context's storage after a success; drop a seed that preceded a failure."""
+        if storage is None:
+            return
+        if result.success:
             try:
-                # First try: headless (cheap)
-                browser = await _launch(headless=True)
-                result = await _run_once(browser)
-                if result.success:
-                    return result
+                storage.save(self.tent_id, await context.storage_state())
+            except Exception as e:
+                logger.warning(f"{self.tent_name}: Could not save browser storage: {e}")
+        elif seeded:
+            # Stale cookies may be the reason for the failure; start cold next time.
+            storage.discard(self.tent_id)
+
+    async def _run_in_context(self, pool: BrowserPool, browser: Any = None) -> ScrapeResult:
+        """Run one check in a fresh context, seeded from and saved to the storage cache."""
+        storage = self._storage(pool)
+        storage_state = storage.load(self.tent_id) if storage else None
+        options = {'storage_state': storage_state} if storage_state else {}
+        logger.debug(f"{self.tent_name}: Starting {'warm' if storage_state else 'cold'} browser context")
+
+        recorder = pool.recorder if self.config.get('record_sessions', True) else None
+        async with pool.context(browser, **options) as context:
+            recording = recorder.start(self.config) if recorder else None
+            if recording:
+                recording.attach(context)
+                context = recording.wrap(context)
+            result = await self._run_once(context)
+            if recording:
+                await self._save_recording(recorder, recording, result)
+            await self._store_state(storage, context, result, seeded=bool(storage_state))
+        return result
+
+    async def _save_recording(self, recorder: Any, recording: Any, result: ScrapeResult):
+        try:
+            archive = await recording.finish(result, self.previous_fingerprint, self.previous_times)
+            # Compressing a large archive takes a while; keep it off the event loop.
+            path = await asyncio.get_running_loop().run_in_executor(None, recorder.save, self.tent_id, archive)
+            logger.debug(f"{self.tent_name}: Recorded session to {path}")
+        except Exception as e:
+            logger.warning(f"{self.tent_name}: Could not save session recording: {e}")
+
+    async def replay(self, archive: Dict[str, Any]) -> ScrapeResult:
+        """Run the extraction against a recorded session instead of the live site."""
+        self.previous_fingerprint, self.previous_times = previous_state(archive)
+        page = ReplayPage(archive)
+        fingerprinting = bool(self.config.get('content_fingerprint', False))
+        response_bodies = page.response_bodies(self.spec.fingerprint_pattern) if fingerprinting else []
+        try:
+            return await self._read(page, response_bodies)
+        except Exception as e:
+            return ScrapeResult(success=False, error=str(e))
+
+    async def _open_live(self, pool: BrowserPool) -> LivePage:
+        """Open a page for watch mode, load it once and capture its data requests."""
+        storage = self._storage(pool)
+        storage_state = storage.load(self.tent_id) if storage else None
+        context = await pool.new_context(**({'storage_state': storage_state} if storage_state else {}))
+        try:
+            await ResourceFilter(self.config).attach(context)
+            page = await context.new_page()
+            page.set_default_timeout(30000)
+            live = LivePage(context, page, self.spec.watch_pattern)
+
+            live.capturing = True
+            await self._load(page)
+            live.last_result = await self._read(page, [])
+            live.capturing = False
+        except BaseException:
+            await context.close()
+            raise
+
+        await self._store_state(storage, context, live.last_result, seeded=bool(storage_state))
+        if live.overflowed:
+            logger.info(f"{self.tent_name}: Watching live page (too many data requests to replay, reloading)")
+        else:
+            logger.info(f"{self.tent_name}: Watching live page ({len(live.requests)} data request(s) captured)")
+        return live
+
+    async def _poll_live(self, live: LivePage) -> ScrapeResult:
+        """Re-check an open page: replay its data requests, reloading only on a change."""
+        if self.config.get('watch_refresh', 'request') == 'request' and live.requests and not live.overflowed:
+            with timed('watch_replay', self.tent_id):
+                digest = await live.replay()
+            if digest is not None and digest == live.response_digest:
+                logger.info(f"{self.tent_name}: Live page unchanged")
+                last = live.last_result
+                return ScrapeResult(
+                    success=True,
+                    dates_available=last.dates_available,
+                    available_dates=last.available_dates,
+                    available_times=last.available_times,
+                    fingerprint=last.fingerprint,
+                    full_scan=False,
+                )
+            live.response_digest = digest
 
-                # Fallback: headed Chromium inside Xvfb (often passes bot-protection)
-                await browser.close()
-                browser = None
+        with timed('watch_reload', self.tent_id):
+            await live.page.reload(wait_until='domcontentloaded')
+        return await self._read(live.page, [])
 
-                xvfb_proc, display = self._start_xvfb()
-                if display:
-                    os.environ['DISPLAY'] = display
+    async def _check_live(self, pool: BrowserPool) -> ScrapeResult:
+        """Watch mode: keep one open page per tent in the pool and poll it."""
+        max_age = float(self.config.get('watch_max_age', DEFAULT_WATCH_MAX_AGE))
+        live = pool.live_pages.get(self.tent_id)
+        if live is not None and not live.usable(max_age):
+            await live.close()
+            del pool.live_pages[self.tent_id]
+            live = None
 
-                browser = await _launch(headless=False)
-                result2 = await _run_once(browser)
-                return result2
+        try:
+            if live is None:
+                live = await self._open_live(pool)
+                pool.live_pages[self.tent_id] = live
+                result = live.last_result
+            else:
+                result = await self._poll_live(live)
+        except Exception as e:
+            logger.info(f"{self.tent_name}: Live page check failed: {e}")
+            result = ScrapeResult(success=False, error=str(e))
+
+        if result.success:
+            live.last_result = result
+            return result
+        # Start from a fresh page next time.
+        pool.live_pages.pop(self.tent_id, None)
+        if live is not None:
+            await live.close()
+        return result
 
-            except Exception as e:
-                logger.error(f"Error checking page: {e}")
-                return ScrapeResult(success=False, error=str(e))
-            finally:
+    async def check_availability(self) -> ScrapeResult:
+        """Check for available dates (and optionally times) on the reservation page."""
+        logger.info(f"Checking availability for {self.tent_name}...")
+
+        # Without a shared pool (e.g. one-off checks), use a private one for this call only.
+        owns_pool = self.browser_pool is None
+        pool = BrowserPool() if owns_pool else self.browser_pool
+
+        browser = None
+        try:
+            # Watch mode reuses an open page across checks (needs the shared pool).
+            if self.config.get('watch_mode') and not owns_pool:
+                result = await self._check_live(pool)
+                if result.success:
+                    return result
+
+            # First try: headless context on the warm shared browser (cheap)
+            result = await self._run_in_context(pool)
+            if result.success:
+                return result
+
+            # Fallback: headed Chromium inside Xvfb (often passes bot-protection)
+            async with pool.displays.lease() as display:
+                env = {**os.environ, 'DISPLAY': display} if display else None
+                with timed('browser_launch_headed', self.tent_id):
+                    browser = await pool.launch(headless=False, env=env)
                 try:
-                    if browser:
-                        await browser.close()
-                except Exception:
-                    pass
-                if xvfb_proc:
+                    return await self._run_in_context(pool, browser)
+                finally:
+                    # Close before the display goes back to the pool.
                     try:
-                        xvfb_proc.terminate()
+                        await browser.close()
                     except Exception:
                         pass
-                # Restore DISPLAY
-                if old_display is not None:
-                    os.environ['DISPLAY'] = old_display
-                elif 'DISPLAY' in os.environ:
-                    del os.environ['DISPLAY']
+                    browser = None
+
+        except Exception as e:
+            logger.error(f"Error checking page: {e}")
+            return ScrapeResult(success=False, error=str(e))
+        finally:
+            try:
+                if browser:
+                    await browser.close()
+            except Exception:
+                pass
+            if owns_pool:
+                await pool.close()
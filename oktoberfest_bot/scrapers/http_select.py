@@ -0,0 +1,226 @@
+"""Browser-less scraper for reservation pages that render the date <select> server-side"""
+
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .base_scraper import BaseScraper, ScrapeResult
+from .browser_pool import CONTEXT_OPTIONS, BrowserPool
+from .form_select import FormSelectScraper
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = 20
+
+# Lower-cased fragments that indicate a bot check / challenge page instead of the form.
+BOT_CHECK_MARKERS = [
+    'challenge-platform',
+    'cf-chl-',
+    'cf-browser-verification',
+    'just a moment...',
+    'checking your browser',
+    'ddos-guard',
+    'captcha',
+    'enable javascript and cookies',
+]
+BOT_CHECK_STATUS = {403, 429, 503}
+
+_SELECTOR_RE = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<parts>(?:#[\w-]+|\.[\w-]+|\[[^\]]+\])*)$')
+_SELECTOR_PART_RE = re.compile(r'#([\w-]+)|\.([\w-]+)|\[\s*([\w-]+)\s*(?:=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\]\s]*))\s*)?\]')
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Create a keep-alive HTTP session shared by all HTTP scrapers."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=20, limit_per_host=4, ttl_dns_cache=300),
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+        headers={
+            'User-Agent': CONTEXT_OPTIONS['user_agent'],
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
+        },
+    )
+
+
+def _parse_selector(selector: str) -> Tuple[Optional[str], List[Tuple[str, str, Optional[str]]]]:
+    """Parse a simple compound CSS selector (tag, #id, .class, [attr], [attr="v"]).
+
+    Returns (tag, conditions). Raises ValueError for anything more complex.
+    """
+    m = _SELECTOR_RE.match((selector or '').strip())
+    if not m:
+        raise ValueError(f"Unsupported selector for HTTP scraping: {selector!r}")
+
+    conditions: List[Tuple[str, str, Optional[str]]] = []
+    for part in _SELECTOR_PART_RE.finditer(m.group('parts') or ''):
+        _id, _class, attr, v1, v2, v3 = part.groups()
+        if _id:
+            conditions.append(('attr', 'id', _id))
+        elif _class:
+            conditions.append(('class', 'class', _class))
+        else:
+            value = next((v for v in (v1, v2, v3) if v is not None), None)
+            conditions.append(('attr', attr.lower(), value))
+    return (m.group('tag') or '').lower() or None, conditions
+
+
+def _matches(tag: str, attrs: Dict[str, str], selector: Tuple[Optional[str], List]) -> bool:
+    sel_tag, conditions = selector
+    if sel_tag and sel_tag != tag:
+        return False
+    for kind, name, value in conditions:
+        if kind == 'class':
+            if value not in (attrs.get('class') or '').split():
+                return False
+        elif name not in attrs or (value is not None and attrs.get(name) != value):
+            return False
+    return True
+
+
+class _SelectOptionsParser(HTMLParser):
+    """Collect the options of the first <select> matching a simple selector."""
+
+    def __init__(self, selector: str):
+        super().__init__(convert_charrefs=True)
+        self.selector = _parse_selector(selector)
+        self.found = False
+        self.options: List[Dict[str, str]] = []
+        self._in_select = False
+        self._done = False
+        self._group_disabled = False
+        self._option: Optional[Dict[str, Any]] = None
+
+    def _close_option(self):
+        opt = self._option
+        self._option = None
+        if opt is None:
+            return
+        text = ' '.join(''.join(opt['text']).split())
+        value = opt['value']
+        # Skip placeholders (no or empty value attribute) and disabled entries,
+        # same rules as the browser scraper
+        if not opt['disabled'] and value:
+            self.options.append({'value': value, 'text': text})
+
+    def handle_starttag(self, tag: str, attrs_list: List[Tuple[str, Optional[str]]]):
+        if self._done:
+            return
+        attrs = {k.lower(): (v if v is not None else '') for k, v in attrs_list}
+        if not self._in_select:
+            if tag == 'select' and _matches(tag, attrs, self.selector):
+                self.found = True
+                self._in_select = True
+            return
+        if tag == 'optgroup':
+            self._close_option()
+            self._group_disabled = 'disabled' in attrs
+        elif tag == 'option':
+            self._close_option()
+            self._option = {
+                'value': attrs.get('value'),
+                'disabled': 'disabled' in attrs or self._group_disabled,
+                'text': [],
+            }
+
+    def handle_endtag(self, tag: str):
+        if not self._in_select:
+            return
+        if tag == 'option':
+            self._close_option()
+        elif tag == 'optgroup':
+            self._close_option()
+            self._group_disabled = False
+        elif tag == 'select':
+            self._close_option()
+            self._in_select = False
+            self._done = True
+
+    def handle_data(self, data: str):
+        if self._option is not None:
+            self._option['text'].append(data)
+
+
+def _looks_like_bot_check(html_text: str) -> bool:
+    head = html_text[:20000].lower()
+    return any(marker in head for marker in BOT_CHECK_MARKERS)
+
+
+class HttpSelectScraper(BaseScraper):
+    """Reads the date <select> from the initial HTML with a single GET.
+
+    Falls back to FormSelectScraper when the select is missing or a bot check is served.
+    Time slots are not collected on the HTTP path, so tents with a time_selector are always
+    checked in the browser.
+    """
+
+    def __init__(
+        self,
+        tent_config: Dict[str, Any],
+        browser_pool: Optional[BrowserPool] = None,
+        http_session: Optional[aiohttp.ClientSession] = None,
+    ):
+        super().__init__(tent_config)
+        self.browser_pool = browser_pool
+        self.http_session = http_session
+        self._browser_scraper: Optional[FormSelectScraper] = None
+
+    async def _fetch(self) -> Tuple[int, str]:
+        owns_session = self.http_session is None
+        session = create_http_session() if owns_session else self.http_session
+        try:
+            async with session.get(self.url, allow_redirects=True) as response:
+                return response.status, await response.text(errors='replace')
+        finally:
+            if owns_session:
+                await session.close()
+
+    async def _fallback(self, reason: str) -> ScrapeResult:
+        logger.info(f"{self.tent_name}: {reason}; falling back to browser scraper")
+        # Built once: the fallback shares this tent's compiled spec and lifetime.
+        if self._browser_scraper is None:
+            self._browser_scraper = FormSelectScraper(self.config, browser_pool=self.browser_pool)
+        scraper = self._browser_scraper
+        scraper.previous_fingerprint = self.previous_fingerprint
+        scraper.previous_times = self.previous_times
+        return await scraper.check_availability()
+
+    async def check_availability(self) -> ScrapeResult:
+        """Check for available dates using a plain HTTP request."""
+        if self.spec.time_selector:
+            return await self._fallback("Time slots need the browser")
+        logger.info(f"Checking availability for {self.tent_name} (HTTP)...")
+
+        date_selector = self.spec.date_selector
+        try:
+            parser = _SelectOptionsParser(date_selector)
+        except ValueError as e:
+            return await self._fallback(str(e))
+
+        try:
+            status, html_text = await self._fetch()
+        except Exception as e:
+            return await self._fallback(f"HTTP request failed ({e})")
+
+        if status in BOT_CHECK_STATUS:
+            return await self._fallback(f"Bot check detected (HTTP {status})")
+        if status >= 400:
+            return ScrapeResult(success=False, error=f"HTTP {status}")
+
+        parser.feed(html_text)
+        parser.close()
+        if not parser.found:
+            # Markers are only trusted when the form is missing (forms often embed a captcha widget)
+            if _looks_like_bot_check(html_text):
+                return await self._fallback("Bot check detected")
+            return await self._fallback("Date select not in initial HTML")
+
+        available_dates = parser.options
+        logger.info(f"Found {len(available_dates)} available date options")
+        return ScrapeResult(
+            success=True,
+            dates_available=len(available_dates) > 0,
+            available_dates=available_dates,
+        )
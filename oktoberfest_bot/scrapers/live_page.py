@@ -0,0 +1,81 @@
+"""Long-lived page per tent for watch mode"""
+
+import hashlib
+import logging
+import re
+import time
+from typing import Any, List, Optional, Pattern, Union
+
+from .base_scraper import DEFAULT_WATCH_URL_PATTERN
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCH_MAX_AGE = 1800
+# Component requests replayed per poll (about one per offered date). A page that makes more
+# is reloaded on every poll instead, since replaying only some of them would miss changes.
+MAX_CAPTURED_REQUESTS = 100
+
+
+class LivePage:
+    """An open page kept between checks, plus the data requests it made.
+
+    While `capturing`, XHR/fetch requests whose URL matches `url_pattern` (Livewire
+    component updates by default) are recorded. `replay()` re-issues them through the
+    context's cookies and returns a digest of the responses, so an unchanged component
+    can be detected without reloading the page at all. If the page made more requests
+    than MAX_CAPTURED_REQUESTS, `overflowed` is set and the page must be reloaded instead.
+    """
+
+    def __init__(self, context: Any, page: Any, url_pattern: Union[str, Pattern] = DEFAULT_WATCH_URL_PATTERN):
+        self.context = context
+        self.page = page
+        self.opened_at = time.monotonic()
+        self.url_regex = re.compile(url_pattern)
+        self.requests: List[Any] = []
+        self.response_digest: Optional[str] = None
+        self.last_result: Any = None
+        self.capturing = False
+        self.overflowed = False
+        self._seen = set()
+        page.on('request', self._on_request)
+
+    def _on_request(self, request: Any):
+        if not self.capturing:
+            return
+        if request.resource_type not in ('xhr', 'fetch') or not self.url_regex.search(request.url):
+            return
+        key = (request.method, request.url, request.post_data)
+        if key in self._seen:
+            return
+        if len(self.requests) >= MAX_CAPTURED_REQUESTS:
+            self.overflowed = True
+            return
+        self._seen.add(key)
+        self.requests.append(request)
+
+    def usable(self, max_age: float) -> bool:
+        """False once the page was closed, its browser died or it is older than max_age."""
+        try:
+            browser = self.context.browser
+            if self.page.is_closed() or (browser is not None and not browser.is_connected()):
+                return False
+        except Exception:
+            return False
+        return time.monotonic() - self.opened_at < max_age
+
+    async def replay(self) -> Optional[str]:
+        """Re-issue the captured requests; digest of their bodies, or None if any failed."""
+        digest = hashlib.sha256()
+        for request in self.requests:
+            response = await self.page.request.fetch(request)
+            if not response.ok:
+                logger.debug(f"Replayed request returned HTTP {response.status}: {request.url}")
+                return None
+            digest.update(await response.body())
+        return digest.hexdigest()
+
+    async def close(self):
+        try:
+            await self.context.close()
+        except Exception:
+            pass
@@ -0,0 +1,406 @@
+"""Record browser checks as compressed HAR-like archives and replay them offline"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Pattern, Tuple
+
+from .. import __version__
+
+logger = logging.getLogger(__name__)
+
+# All archives together are kept below this size; the oldest are deleted first.
+DEFAULT_RECORDING_MAX_BYTES = 256 * 1024 * 1024
+# Response bodies longer than this are cut (and marked with "_truncated").
+DEFAULT_RECORDING_BODY_LIMIT = 256 * 1024
+
+ARCHIVE_SUFFIX = '.har.json.gz'
+RECORDED_RESOURCE_TYPES = ('document', 'xhr', 'fetch')
+
+
+class ReplayError(Exception):
+    """The scraper asked a replayed page for something the recording does not contain"""
+
+
+def _read_key(method: str, *args: Any) -> str:
+    return json.dumps([method, *args], sort_keys=True, default=str)
+
+
+def _script_id(script: str) -> str:
+    return hashlib.sha1(script.encode()).hexdigest()[:12]
+
+
+def _har_headers(headers: Mapping[str, str]) -> List[Dict[str, str]]:
+    return [{'name': name, 'value': value} for name, value in headers.items()]
+
+
+class SessionRecording:
+    """Traffic and page reads of one check, in the shape of a HAR 1.2 log.
+
+    Responses of the types in RECORDED_RESOURCE_TYPES become HAR entries. Everything the
+    scraper reads from a page (evaluate results, selector waits, text) is stored in
+    `reads`, keyed by call and by the date selected on that page at the time, so that
+    ReplayPage can answer the same calls later. A DOM snapshot is taken once the date
+    select appeared (or did not).
+    """
+
+    def __init__(self, tent_config: Mapping[str, Any], body_limit: int = DEFAULT_RECORDING_BODY_LIMIT):
+        self.tent_config = dict(tent_config)
+        self.body_limit = body_limit
+        self.started = datetime.now()
+        self.entries: List[Dict[str, Any]] = []
+        self.reads: Dict[str, Dict[str, Any]] = {}
+        self.dom: List[Dict[str, Any]] = []
+        self._pending: List[asyncio.Future] = []
+
+    def attach(self, context: Any):
+        """Record responses of every page opened in `context`."""
+        context.on('response', self._on_response)
+
+    def wrap(self, context: Any) -> '_RecordingContext':
+        """A context whose pages record what the scraper reads from them."""
+        return _RecordingContext(context, self)
+
+    def _on_response(self, response: Any):
+        if response.request.resource_type in RECORDED_RESOURCE_TYPES:
+            self._pending.append(asyncio.ensure_future(self._entry(response, time.time())))
+
+    async def _entry(self, response: Any, received: float) -> Dict[str, Any]:
+        request = response.request
+        content: Dict[str, Any] = {'mimeType': response.headers.get('content-type', ''), 'size': -1}
+        try:
+            body = await response.body()
+        except Exception:
+            body = None  # redirects and aborted requests have no body
+        if body is not None:
+            content['size'] = len(body)
+            if len(body) > self.body_limit:
+                body = body[:self.body_limit]
+                content['_truncated'] = True
+            try:
+                content['text'] = body.decode('utf-8')
+            except UnicodeDecodeError:
+                content['text'] = base64.b64encode(body).decode('ascii')
+                content['encoding'] = 'base64'
+
+        entry = {
+            'startedDateTime': datetime.fromtimestamp(received).isoformat(),
+            'request': {
+                'method': request.method,
+                'url': request.url,
+                'headers': _har_headers(request.headers),
+            },
+            'response': {
+                'status': response.status,
+                'statusText': response.status_text,
+                'headers': _har_headers(response.headers),
+                'content': content,
+            },
+            '_resourceType': request.resource_type,
+        }
+        if request.post_data:
+            entry['request']['postData'] = {
+                'mimeType': request.headers.get('content-type', ''),
+                'text': request.post_data,
+            }
+        return entry
+
+    def record(self, key: str, value: Any = None, error: Optional[BaseException] = None):
+        self.reads[key] = {'error': str(error)} if error is not None else {'value': value}
+
+    async def snapshot_dom(self, page: Any, label: str):
+        try:
+            self.dom.append({'label': label, 'url': page.url, 'html': await page.content()})
+        except Exception as e:
+            logger.debug(f"DOM snapshot failed: {e}")
+
+    async def finish(
+        self,
+        result: Any,
+        previous_fingerprint: Optional[Dict[str, Any]] = None,
+        previous_times: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """The complete archive, once pending response bodies were read (or timed out).
+
+        The scraper's previous fingerprint and times are kept so a replay can reuse cached
+        time slots exactly when the recorded check did.
+        """
+        if self._pending:
+            done, pending = await asyncio.wait(self._pending, timeout=5)
+            for task in pending:
+                task.cancel()
+            self.entries = [t.result() for t in done if not t.cancelled() and not t.exception()]
+            self.entries.sort(key=lambda e: e['startedDateTime'])
+        return {
+            'log': {
+                'version': '1.2',
+                'creator': {'name': 'oktoberfest_bot', 'version': __version__},
+                'pages': [{
+                    'id': 'page_1',
+                    'title': self.tent_config.get('url', ''),
+                    'startedDateTime': self.started.isoformat(),
+                }],
+                'entries': self.entries,
+                '_tent': self.tent_config,
+                '_reads': self.reads,
+                '_dom': self.dom,
+                '_result': result.to_dict(),
+                '_previous': {'fingerprint': previous_fingerprint, 'times': previous_times or {}},
+            },
+        }
+
+
+class _RecordingContext:
+    """Proxy for a BrowserContext whose new pages record their reads."""
+
+    def __init__(self, context: Any, recording: SessionRecording):
+        self._context = context
+        self.recording = recording
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
+
+    async def new_page(self) -> '_RecordingPage':
+        return _RecordingPage(await self._context.new_page(), self)
+
+
+class _RecordingPage:
+    """Proxy for a Page that stores the results of the calls the scrapers read from."""
+
+    def __init__(self, page: Any, context: _RecordingContext):
+        self._page = page
+        self.context = context
+        self.recording = context.recording
+        # Value of the date option last selected on this page.
+        self.selected: Optional[str] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._page, name)
+
+    async def _call(self, key: str, coro: Any) -> Any:
+        try:
+            value = await coro
+        except Exception as e:
+            self.recording.record(key, error=e)
+            raise
+        self.recording.record(key, value)
+        return value
+
+    async def evaluate(self, script: str, arg: Any = None) -> Any:
+        key = _read_key('evaluate', _script_id(script), arg, self.selected)
+        return await self._call(key, self._page.evaluate(script, arg))
+
+    async def inner_text(self, selector: str, **kwargs) -> str:
+        return await self._call(_read_key('inner_text', selector, self.selected), self._page.inner_text(selector, **kwargs))
+
+    async def wait_for_selector(self, selector: str, **kwargs) -> Any:
+        key = _read_key('wait_for_selector', selector, self.selected)
+        try:
+            return await self._call(key, self._found(selector, **kwargs))
+        finally:
+            await self.recording.snapshot_dom(self._page, f"wait_for_selector {selector}")
+
+    async def _found(self, selector: str, **kwargs) -> bool:
+        await self._page.wait_for_selector(selector, **kwargs)
+        return True
+
+    async def query_selector(self, selector: str) -> Any:
+        element = await self._page.query_selector(selector)
+        return _RecordingElement(element, self) if element is not None else None
+
+
+class _RecordingElement:
+    def __init__(self, element: Any, page: _RecordingPage):
+        self._element = element
+        self._page = page
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._element, name)
+
+    async def select_option(self, value: Optional[str] = None, **kwargs) -> Any:
+        selected = await self._element.select_option(value=value, **kwargs)
+        self._page.selected = value
+        return selected
+
+
+class ReplayPage:
+    """Stands in for a Page by answering from a recorded archive.
+
+    Navigation and event hooks are no-ops, so extraction runs at full speed. A call that
+    was not recorded raises ReplayError (e.g. after the in-page scripts were changed).
+    """
+
+    def __init__(self, archive: Dict[str, Any], context: Optional['ReplayContext'] = None):
+        self.archive = archive
+        self.reads: Dict[str, Dict[str, Any]] = archive['log']['_reads']
+        self.context = context or ReplayContext(archive)
+        self.url = archive['log']['_tent'].get('url', '')
+        self.selected: Optional[str] = None
+
+    def _answer(self, key: str) -> Any:
+        recorded = self.reads.get(key)
+        if recorded is None:
+            raise ReplayError(f"Not in recording: {key}")
+        if 'error' in recorded:
+            raise ReplayError(recorded['error'])
+        return recorded['value']
+
+    async def evaluate(self, script: str, arg: Any = None) -> Any:
+        return self._answer(_read_key('evaluate', _script_id(script), arg, self.selected))
+
+    async def inner_text(self, selector: str, **kwargs) -> str:
+        return self._answer(_read_key('inner_text', selector, self.selected))
+
+    async def wait_for_selector(self, selector: str, **kwargs) -> bool:
+        return self._answer(_read_key('wait_for_selector', selector, self.selected))
+
+    async def query_selector(self, selector: str) -> 'ReplayElement':
+        return ReplayElement(self)
+
+    def response_bodies(self, pattern: Optional[Pattern]) -> List[asyncio.Future]:
+        """Recorded XHR/fetch bodies whose URL matches `pattern`, as resolved futures."""
+        bodies: List[asyncio.Future] = []
+        if pattern is None:
+            return bodies
+        loop = asyncio.get_running_loop()
+        for entry in self.archive['log']['entries']:
+            content = entry['response']['content']
+            if entry.get('_resourceType') not in ('xhr', 'fetch') or 'text' not in content:
+                continue
+            if not pattern.search(entry['request']['url']):
+                continue
+            body = content['text']
+            future = loop.create_future()
+            future.set_result(base64.b64decode(body) if content.get('encoding') == 'base64' else body.encode('utf-8'))
+            bodies.append(future)
+        return bodies
+
+    async def goto(self, url: str, **kwargs):
+        self.selected = None
+
+    async def reload(self, **kwargs):
+        self.selected = None
+
+    async def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    async def close(self):
+        pass
+
+    def set_default_timeout(self, timeout: float):
+        pass
+
+    def on(self, event: str, handler: Any):
+        pass
+
+    def remove_listener(self, event: str, handler: Any):
+        pass
+
+
+class ReplayElement:
+    def __init__(self, page: ReplayPage):
+        self._page = page
+
+    async def select_option(self, value: Optional[str] = None, **kwargs) -> List[str]:
+        self._page.selected = value
+        return [value]
+
+
+class ReplayContext:
+    """Gives extra pages (parallel time-slot scans) the same recording"""
+
+    def __init__(self, archive: Dict[str, Any]):
+        self.archive = archive
+
+    async def new_page(self) -> ReplayPage:
+        return ReplayPage(self.archive, self)
+
+    async def close(self):
+        pass
+
+
+class RecordingStore:
+    """Directory of gzipped archives, one subdirectory per tent, capped at `max_bytes`."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_RECORDING_MAX_BYTES, body_limit: int = DEFAULT_RECORDING_BODY_LIMIT):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.body_limit = body_limit
+
+    def start(self, tent_config: Mapping[str, Any]) -> SessionRecording:
+        return SessionRecording(tent_config, self.body_limit)
+
+    def save(self, tent_id: str, archive: Dict[str, Any]) -> Path:
+        """Write an archive (atomic replace) and rotate out the oldest ones."""
+        directory = self.directory / re.sub(r'[^A-Za-z0-9_.-]', '_', tent_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}{ARCHIVE_SUFFIX}"
+        tmp = path.with_name(f".{path.name}.tmp")
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump(archive, f)
+        os.replace(tmp, path)
+        self.rotate()
+        return path
+
+    def rotate(self):
+        """Delete the oldest archives until all of them fit in max_bytes."""
+        if not self.max_bytes:
+            return
+        files = []
+        for path in self.directory.glob(f"*/*{ARCHIVE_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def previous_state(archive: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """The previous fingerprint and times a recorded check started from.
+
+    `full_scan_at` is moved so that it is as old now as it was when the check ran.
+    """
+    log = archive['log']
+    previous = log.get('_previous') or {}
+    fingerprint = previous.get('fingerprint')
+    if fingerprint and fingerprint.get('full_scan_at'):
+        try:
+            started = datetime.fromisoformat(log['pages'][0]['startedDateTime'])
+            age = started - datetime.fromisoformat(fingerprint['full_scan_at'])
+            fingerprint = dict(fingerprint, full_scan_at=(datetime.now() - age).isoformat())
+        except (KeyError, IndexError, ValueError):
+            fingerprint = None
+    return fingerprint, previous.get('times') or {}
+
+
+def iter_archive_paths(paths: List[str]) -> Iterator[Path]:
+    """Archive files named in `paths` (directories are searched), oldest first per argument."""
+    for name in paths:
+        path = Path(name)
+        if path.is_dir():
+            found = sorted(path.rglob(f"*{ARCHIVE_SUFFIX}"), key=lambda p: p.name)
+            yield from found
+        else:
+            yield path
+
+
+def load_archive(path: Path) -> Dict[str, Any]:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,126 @@
+"""Scraper type registry: built-in types plus plugins registered as entry points"""
+
+import inspect
+import logging
+from importlib import import_module
+from typing import Any, Dict, Mapping, Optional, Tuple, Type
+
+from .base_scraper import BaseScraper, TentSpec, compile_spec
+
+logger = logging.getLogger(__name__)
+
+# Third-party packages add scraper types with e.g. in pyproject.toml:
+#   [project.entry-points."oktoberfest_bot.scrapers"]
+#   my_site = "my_package.scraper:MySiteScraper"
+ENTRY_POINT_GROUP = 'oktoberfest_bot.scrapers'
+
+# scraper_type -> "module:Class", imported on first use
+BUILTIN_SCRAPERS = {
+    'form_select': 'oktoberfest_bot.scrapers.form_select:FormSelectScraper',
+    'http_select': 'oktoberfest_bot.scrapers.http_select:HttpSelectScraper',
+}
+
+
+def _entry_point_scrapers() -> Dict[str, str]:
+    """scraper_type -> "module:Class" for every installed plugin."""
+    try:
+        from importlib.metadata import entry_points
+        found = entry_points()
+        if hasattr(found, 'select'):
+            group = found.select(group=ENTRY_POINT_GROUP)
+        else:  # Python < 3.10 returns a dict of groups
+            group = found.get(ENTRY_POINT_GROUP, [])
+        return {ep.name: ep.value for ep in group}
+    except Exception as e:
+        logger.warning(f"Could not read scraper plugins: {e}")
+        return {}
+
+
+def _import_object(path: str):
+    module_name, _, name = path.partition(':')
+    return getattr(import_module(module_name), name)
+
+
+class ScraperRegistry:
+    """Resolves scraper_type names to classes and keeps one scraper per tent.
+
+    Plugins are discovered once, classes are imported on first use, and a tent's scraper
+    (with its compiled TentSpec) is reused until its config, browser pool or HTTP session
+    changes.
+    """
+
+    def __init__(self, include_plugins: bool = True):
+        self.include_plugins = include_plugins
+        self._types: Optional[Dict[str, str]] = None
+        self._classes: Dict[str, Type[BaseScraper]] = {}
+        # tent id -> (config it was built from, browser pool, http session, scraper)
+        self._instances: Dict[str, Tuple[Mapping[str, Any], Any, Any, BaseScraper]] = {}
+
+    def types(self) -> Dict[str, str]:
+        """All known scraper types; built-ins cannot be replaced by plugins."""
+        if self._types is None:
+            types = dict(BUILTIN_SCRAPERS)
+            if self.include_plugins:
+                for name, target in _entry_point_scrapers().items():
+                    if name in types:
+                        logger.warning(f"Ignoring scraper plugin {target}: type {name!r} is built in")
+                        continue
+                    types[name] = target
+            self._types = types
+        return self._types
+
+    def load(self, scraper_type: str) -> Type[BaseScraper]:
+        """Import the class for a scraper type (ValueError if unknown or not a scraper)"""
+        scraper_class = self._classes.get(scraper_type)
+        if scraper_class is not None:
+            return scraper_class
+        target = self.types().get(scraper_type)
+        if target is None:
+            raise ValueError(f"Unknown scraper type: {scraper_type}")
+        scraper_class = _import_object(target)
+        if not (isinstance(scraper_class, type) and issubclass(scraper_class, BaseScraper)):
+            raise ValueError(f"Scraper type {scraper_type!r} ({target}) is not a BaseScraper subclass")
+        self._classes[scraper_type] = scraper_class
+        return scraper_class
+
+    def compile_spec(self, tent_config: Mapping[str, Any]) -> TentSpec:
+        """Check a tent's settings without starting a browser (ValueError if invalid).
+
+        Built-in types use the shared compile step and are not imported, so validation works on
+        hosts without Playwright; a plugin is imported because it may add its own checks.
+        """
+        scraper_type = tent_config.get('scraper_type', 'form_select')
+        if scraper_type in BUILTIN_SCRAPERS:
+            return compile_spec(tent_config)
+        return self.load(scraper_type).compile_spec(tent_config)
+
+    def create(self, tent_config: Mapping[str, Any], browser_pool=None, http_session=None) -> BaseScraper:
+        """Build a new scraper, passing only the shared resources its constructor takes."""
+        scraper_class = self.load(tent_config.get('scraper_type', 'form_select'))
+        params = inspect.signature(scraper_class.__init__).parameters
+        kwargs = {}
+        if 'browser_pool' in params:
+            kwargs['browser_pool'] = browser_pool
+        if 'http_session' in params:
+            kwargs['http_session'] = http_session
+        return scraper_class(tent_config, **kwargs)
+
+    def get(self, tent_config: Mapping[str, Any], browser_pool=None, http_session=None) -> BaseScraper:
+        """The tent's cached scraper, rebuilt if its config or shared resources changed."""
+        tent_id = tent_config['id']
+        cached = self._instances.get(tent_id)
+        if cached is not None:
+            config, pool, session, scraper = cached
+            if pool is browser_pool and session is http_session and (config is tent_config or config == tent_config):
+                return scraper
+        scraper = self.create(tent_config, browser_pool, http_session)
+        self._instances[tent_id] = (tent_config, browser_pool, http_session, scraper)
+        return scraper
+
+    def forget(self, tent_id: str):
+        """Drop a tent's cached scraper (e.g. after it was removed from tents.json)."""
+        self._instances.pop(tent_id, None)
+
+
+# Shared by the orchestrator and workers for the life of the process.
+default_registry = ScraperRegistry()
@@ -0,0 +1,134 @@
+"""Request interception that skips resources irrelevant to reading a <select>"""
+
+from collections import Counter
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+
+DEFAULT_BLOCKED_RESOURCE_TYPES: List[str] = ['image', 'media', 'font']
+
+# Analytics, tag managers, consent banners, ad/tracking pixels and video embeds.
+DEFAULT_BLOCKED_DOMAINS: List[str] = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'facebook.net',
+    'facebook.com',
+    'hotjar.com',
+    'clarity.ms',
+    'matomo.cloud',
+    'etracker.com',
+    'usercentrics.eu',
+    'cookiebot.com',
+    'tiktok.com',
+    'pinterest.com',
+    'linkedin.com',
+    'bing.com',
+    'youtube.com',
+    'vimeo.com',
+]
+
+
+def _host(url: str) -> str:
+    try:
+        return (urlparse(url).hostname or '').lower()
+    except Exception:
+        return ''
+
+
+def _site(host: str) -> str:
+    """Approximate registrable domain (last two labels)."""
+    return '.'.join(host.split('.')[-2:])
+
+
+def _host_matches(host: str, domains: List[str]) -> bool:
+    return any(host == d or host.endswith('.' + d) for d in domains)
+
+
+class ResourceFilter:
+    """Per-tent route filter for a BrowserContext.
+
+    Tent settings:
+        block_resources: enable the filter (default True). "report" blocks nothing but
+            counts what would have been blocked, including its bytes, to measure savings
+        blocked_resource_types: resource types to abort (default image, media, font)
+        blocked_domains: domains to abort (default: common analytics/tracking hosts)
+        block_third_party: abort every request outside the tent's site (default False)
+        allowed_domains: domains never blocked, e.g. a CDN the form needs
+    """
+
+    def __init__(self, tent_config: Dict[str, Any]):
+        mode = tent_config.get('block_resources', True)
+        self.report_only = mode == 'report'
+        self.enabled = bool(mode)
+        self.blocked_types = set(tent_config.get('blocked_resource_types', DEFAULT_BLOCKED_RESOURCE_TYPES))
+        self.blocked_domains = [d.lower() for d in tent_config.get('blocked_domains', DEFAULT_BLOCKED_DOMAINS)]
+        self.allowed_domains = [d.lower() for d in tent_config.get('allowed_domains', [])]
+        self.block_third_party = bool(tent_config.get('block_third_party', False))
+        self.site = _site(_host(tent_config.get('url', '')))
+
+        self.blocked_by_type: Counter = Counter()
+        self.blocked_bytes = 0
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+
+    @property
+    def blocked_requests(self) -> int:
+        return sum(self.blocked_by_type.values())
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Decide whether a request can be aborted without affecting the form."""
+        if resource_type == 'document':
+            return False
+        host = _host(url)
+        if not host or _host_matches(host, self.allowed_domains):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        if _host_matches(host, self.blocked_domains):
+            return True
+        if self.block_third_party and self.site and _site(host) != self.site:
+            return True
+        return False
+
+    async def _handle_route(self, route: Any):
+        request = route.request
+        try:
+            if self.should_block(request.url, request.resource_type):
+                self.blocked_by_type[request.resource_type] += 1
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception:
+            # The page or context may already be closed
+            pass
+
+    def _on_response(self, response: Any):
+        try:
+            size = int(response.headers.get('content-length') or 0)
+        except (TypeError, ValueError):
+            size = 0
+        request = response.request
+        if self.report_only and self.should_block(request.url, request.resource_type):
+            self.blocked_by_type[request.resource_type] += 1
+            self.blocked_bytes += size
+            return
+        self.allowed_requests += 1
+        self.allowed_bytes += size
+
+    async def attach(self, context: Any):
+        """Install the filter on a BrowserContext (no-op when disabled)."""
+        if not self.enabled:
+            return
+        if not self.report_only:
+            await context.route('**/*', self._handle_route)
+        context.on('response', self._on_response)
+
+    def summary(self) -> str:
+        """One-line report of what was blocked and what was loaded."""
+        by_type = ', '.join(f"{t}={n}" for t, n in self.blocked_by_type.most_common()) or 'none'
+        if self.report_only:
+            blocked = f"would block {self.blocked_requests} request(s), {self.blocked_bytes / 1024:.0f} KB ({by_type})"
+        else:
+            blocked = f"blocked {self.blocked_requests} request(s) ({by_type})"
+        return f"{blocked}; loaded {self.allowed_requests} request(s), {self.allowed_bytes / 1024:.0f} KB"
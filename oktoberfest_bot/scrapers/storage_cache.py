@@ -0,0 +1,66 @@
+"""Per-tent cache of browser storage state (cookies, localStorage)"""
+
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORAGE_TTL = 6 * 3600
+
+
+class StorageStateCache:
+    """Keeps Playwright storage state per tent on disk so checks start warm.
+
+    A tent that passed the site's bot challenge once keeps its cookies across checks and
+    restarts instead of facing the challenge (and a cold asset load) every time. Entries
+    older than `ttl` seconds are ignored and removed.
+    """
+
+    def __init__(self, directory: str, ttl: float = DEFAULT_STORAGE_TTL):
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def _path(self, tent_id: str) -> Path:
+        return self.directory / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', tent_id)}.json"
+
+    def load(self, tent_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached storage state for a tent, or None if missing or expired."""
+        path = self._path(tent_id)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if self.ttl and age > self.ttl:
+            logger.debug(f"{tent_id}: Cached browser storage expired ({age:.0f}s old)")
+            self.discard(tent_id)
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"{tent_id}: Ignoring unreadable browser storage cache: {e}")
+            self.discard(tent_id)
+            return None
+
+    def save(self, tent_id: str, state: Dict[str, Any]):
+        """Store a tent's storage state (atomic replace)."""
+        path = self._path(tent_id)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        # Cookies may carry session tokens; keep them private to the bot user.
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+
+    def discard(self, tent_id: str):
+        """Forget a tent's storage state (e.g. after a failed check)."""
+        try:
+            self._path(tent_id).unlink()
+        except FileNotFoundError:
+            pass
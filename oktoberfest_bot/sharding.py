@@ -0,0 +1,490 @@
+"""Sharded mode: a coordinator leases tents to scraper worker processes"""
+
+import asyncio
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import socket
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from .scheduler import DEFAULT_CHECK_TIMEOUT, DEFAULT_MAX_CONCURRENT, TentScheduler
+from .scrapers.base_scraper import ScrapeResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_HOST = '127.0.0.1'
+DEFAULT_SHARD_PORT = 8765
+DEFAULT_SHARD_WORKERS = 2
+DEFAULT_LEASE_TTL = 60.0
+# Seconds to wait for the coordinator to acknowledge a result.
+ACK_TIMEOUT = 30.0
+RECONNECT_MAX_DELAY = 30.0
+# Longest protocol line in bytes (asyncio's 64 KiB default is too small for the config
+# sent with `welcome` or a result with many time slots).
+STREAM_LIMIT = 16 * 1024 * 1024
+# Config keys never sent to workers.
+_PRIVATE_KEYS = {'telegram_bot_token', 'telegram_chat_id', 'shard_token'}
+
+
+def is_loopback_host(host: str) -> bool:
+    """True if `host` only accepts connections from this machine."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+async def _send(writer: asyncio.StreamWriter, message: Dict[str, Any]):
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+
+
+async def _receive(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class _Lease:
+    """Exclusive right of one worker to check one tent; `token` fences stale results."""
+
+    def __init__(self, worker_id: str, token: int, ttl: float):
+        self.worker_id = worker_id
+        self.token = token
+        self.expires = time.monotonic() + ttl
+
+
+class _WorkerConnection:
+    def __init__(self, worker_id: str, capacity: int, writer: asyncio.StreamWriter):
+        self.worker_id = worker_id
+        self.capacity = max(1, capacity)
+        self.writer = writer
+        self.tents: Set[str] = set()
+        self.lock = asyncio.Lock()
+
+    @property
+    def load(self) -> float:
+        return len(self.tents) / self.capacity
+
+    async def send(self, message: Dict[str, Any]):
+        async with self.lock:
+            await _send(self.writer, message)
+
+
+class ShardCoordinator:
+    """Assigns tents to connected workers and processes their results centrally.
+
+    Every tent is leased to exactly one worker. Workers renew their leases with
+    heartbeats; a worker that disconnects or misses `lease_ttl` loses its tents, which
+    are reassigned. Each lease carries a token and results with a stale token are
+    dropped, so a tent that moved never produces duplicate alerts. State and
+    notifications stay in the coordinator (`process_result`).
+
+    process_result(tent, result) stores the result and notifies.
+    interval_fn(tent) gives the delay until the tent's next check.
+    before_check(tent) is called for every accepted result before processing.
+    tent_state(tent) returns extra fields for the worker (e.g. previous fingerprint).
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        tents: List[Dict[str, Any]],
+        process_result: Callable[[Dict[str, Any], ScrapeResult], Awaitable[None]],
+        interval_fn: Callable[[Dict[str, Any]], float],
+        before_check: Optional[Callable[[Dict[str, Any]], None]] = None,
+        tent_state: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        initial_delay: Optional[Callable[[Dict[str, Any]], float]] = None,
+    ):
+        self.config = config
+        self.host = config.get('shard_host', DEFAULT_SHARD_HOST)
+        self.port = int(config.get('shard_port', DEFAULT_SHARD_PORT))
+        self.lease_ttl = float(config.get('shard_lease_ttl', DEFAULT_LEASE_TTL))
+        self.secret = config.get('shard_token')
+        self.process_result = process_result
+        self.interval_fn = interval_fn
+        self.before_check = before_check
+        self.tent_state = tent_state
+        self.initial_delay = initial_delay
+        self.tents: Dict[str, Dict[str, Any]] = {t['id']: t for t in tents}
+        self._workers: Dict[str, _WorkerConnection] = {}
+        self._leases: Dict[str, _Lease] = {}
+        self._token = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._processes: List[asyncio.subprocess.Process] = []
+
+    def worker_config(self) -> Dict[str, Any]:
+        return {k: v for k, v in self.config.items() if k not in _PRIVATE_KEYS}
+
+    async def _assign(self, tent_id: str, worker: _WorkerConnection, delay: float = 0.0):
+        self._token += 1
+        self._leases[tent_id] = _Lease(worker.worker_id, self._token, self.lease_ttl)
+        worker.tents.add(tent_id)
+        tent = self.tents[tent_id]
+        message = {'type': 'assign', 'tent': tent, 'token': self._token, 'delay': delay}
+        if self.tent_state:
+            message.update(self.tent_state(tent))
+        try:
+            await worker.send(message)
+        except (ConnectionError, OSError) as e:
+            # The worker's connection handler notices the broken connection and drops it.
+            logger.warning(f"{tent_id}: Could not assign to {worker.worker_id}: {e}")
+
+    async def _revoke(self, tent_id: str):
+        lease = self._leases.pop(tent_id, None)
+        if lease is None:
+            return
+        worker = self._workers.get(lease.worker_id)
+        if worker is not None:
+            worker.tents.discard(tent_id)
+            try:
+                await worker.send({'type': 'revoke', 'tent': tent_id})
+            except Exception:
+                pass
+
+    def _initial_delay(self, tent_id: str) -> float:
+        return self.initial_delay(self.tents[tent_id]) if self.initial_delay else 0.0
+
+    async def rebalance(self):
+        """Lease unowned tents and even out the load across workers."""
+        if not self._workers:
+            return
+        workers = list(self._workers.values())
+        for tent_id in list(self.tents):
+            if tent_id not in self._leases:
+                worker = min(workers, key=lambda w: w.load)
+                await self._assign(tent_id, worker, self._initial_delay(tent_id))
+
+        # Move tents from the busiest to the idlest worker while that helps.
+        while len(workers) > 1:
+            busiest = max(workers, key=lambda w: w.load)
+            idlest = min(workers, key=lambda w: w.load)
+            if len(busiest.tents) - 1 < 1 or (len(busiest.tents) - 1) / busiest.capacity < (len(idlest.tents) + 1) / idlest.capacity:
+                break
+            tent_id = sorted(busiest.tents)[0]
+            await self._revoke(tent_id)
+            await self._assign(tent_id, idlest, self._initial_delay(tent_id))
+
+        summary = ', '.join(f"{w.worker_id}={len(w.tents)}" for w in workers)
+        logger.info(f"Tent assignment: {summary}")
+
+    def add(self, tent: Dict[str, Any], delay: float = 0.0):
+        """Start checking a new tent (leased on the next rebalance, which runs right away)."""
+        self.tents[tent['id']] = tent
+        asyncio.ensure_future(self.rebalance())
+
+    def update(self, tent: Dict[str, Any]):
+        """Replace a tent's config; the leasing worker applies it with its next check."""
+        tent_id = tent['id']
+        if tent_id not in self.tents:
+            return
+        self.tents[tent_id] = tent
+        lease = self._leases.get(tent_id)
+        worker = self._workers.get(lease.worker_id) if lease else None
+        if worker is not None:
+            asyncio.ensure_future(worker.send({'type': 'update', 'tent': tent}))
+
+    def remove(self, tent_id: str):
+        """Stop checking a tent and take it back from its worker."""
+        self.tents.pop(tent_id, None)
+        asyncio.ensure_future(self._revoke(tent_id))
+
+    async def _drop_worker(self, worker_id: str, reason: str):
+        worker = self._workers.pop(worker_id, None)
+        if worker is None:
+            return
+        for tent_id in list(worker.tents):
+            lease = self._leases.get(tent_id)
+            if lease and lease.worker_id == worker_id:
+                del self._leases[tent_id]
+        logger.warning(f"Worker {worker_id} {reason}; reassigning {len(worker.tents)} tent(s)")
+        worker.writer.close()
+        await self.rebalance()
+
+    async def _on_result(self, worker: _WorkerConnection, message: Dict[str, Any]):
+        tent_id = message.get('tent')
+        lease = self._leases.get(tent_id)
+        if lease is None or lease.worker_id != worker.worker_id or lease.token != message.get('token'):
+            logger.info(f"{tent_id}: Ignoring result from {worker.worker_id} without a current lease")
+            await worker.send({'type': 'ack', 'tent': tent_id, 'id': message.get('id'), 'revoked': True})
+            return
+
+        lease.expires = time.monotonic() + self.lease_ttl
+        tent = self.tents.get(tent_id)
+        if tent is None:
+            # Removed from tents.json; its revoke has not gone out yet.
+            await worker.send({'type': 'ack', 'tent': tent_id, 'id': message.get('id'), 'revoked': True})
+            return
+        if self.before_check:
+            self.before_check(tent)
+        try:
+            await self.process_result(tent, ScrapeResult.from_dict(message.get('result') or {}))
+        except Exception as e:
+            logger.error(f"{tent_id}: Failed to process result from {worker.worker_id} - {e}")
+
+        ack = {'type': 'ack', 'tent': tent_id, 'id': message.get('id'), 'interval': self.interval_fn(tent)}
+        if self.tent_state:
+            ack.update(self.tent_state(tent))
+        await worker.send(ack)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        worker = None
+        try:
+            hello = await asyncio.wait_for(_receive(reader), timeout=10)
+            if not hello or hello.get('type') != 'hello':
+                return
+            if self.secret and not hmac.compare_digest(str(hello.get('secret') or '').encode(), self.secret.encode()):
+                logger.warning(f"Rejected worker {hello.get('worker')}: bad shard_token")
+                return
+            worker_id = str(hello.get('worker'))
+            if worker_id in self._workers:
+                await self._drop_worker(worker_id, 'reconnected')
+            capacity = int(hello.get('capacity') or self.config.get('max_concurrent_checks', DEFAULT_MAX_CONCURRENT))
+            worker = _WorkerConnection(worker_id, capacity, writer)
+            self._workers[worker_id] = worker
+            logger.info(f"Worker {worker_id} connected (capacity {worker.capacity})")
+            await worker.send({'type': 'welcome', 'config': self.worker_config(), 'lease_ttl': self.lease_ttl})
+            await self.rebalance()
+
+            while True:
+                message = await _receive(reader)
+                if message is None:
+                    break
+                if message.get('type') == 'renew':
+                    expires = time.monotonic() + self.lease_ttl
+                    for tent_id in worker.tents:
+                        lease = self._leases.get(tent_id)
+                        if lease and lease.worker_id == worker_id:
+                            lease.expires = expires
+                elif message.get('type') == 'result':
+                    await self._on_result(worker, message)
+        except (asyncio.TimeoutError, ConnectionError, ValueError) as e:
+            logger.debug(f"Worker connection error: {e}")
+        finally:
+            if worker is not None and self._workers.get(worker.worker_id) is worker:
+                await self._drop_worker(worker.worker_id, 'disconnected')
+            else:
+                writer.close()
+
+    async def _expire_leases(self):
+        """Drop workers whose leases ran out (hung process, network partition)."""
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            now = time.monotonic()
+            stale = {lease.worker_id for lease in self._leases.values() if lease.expires < now}
+            for worker_id in stale:
+                await self._drop_worker(worker_id, 'missed its lease')
+
+    async def _supervise_local_workers(self, count: int):
+        """Run `count` worker processes on this host and restart them when they exit."""
+        address = f"{'127.0.0.1' if self.host in ('0.0.0.0', '') else self.host}:{self.port}"
+        env = dict(os.environ)
+        if self.secret:
+            env['OKTOBERFEST_SHARD_TOKEN'] = self.secret
+
+        async def _run(index: int):
+            delay = 1.0
+            while True:
+                started = time.monotonic()
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable, '-m', 'oktoberfest_bot.main', '--worker', address,
+                    '--worker-id', f"{socket.gethostname()}-{index}", env=env,
+                )
+                self._processes.append(process)
+                code = await process.wait()
+                self._processes.remove(process)
+                delay = 1.0 if time.monotonic() - started > 60 else min(RECONNECT_MAX_DELAY, delay * 2)
+                logger.warning(f"Local worker {index} exited with code {code}; restarting in {delay:.0f}s")
+                await asyncio.sleep(delay)
+
+        await asyncio.gather(*(_run(i) for i in range(count)))
+
+    async def run(self):
+        """Accept workers and keep all tents leased, forever."""
+        if not self.secret and not is_loopback_host(self.host):
+            # Anyone who can connect could report results and trigger alerts.
+            raise ValueError(f"shard_host {self.host} is reachable from other machines; set shard_token")
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=STREAM_LIMIT)
+        logger.info(f"Shard coordinator listening on {self.host}:{self.port}")
+        tasks = [asyncio.create_task(self._expire_leases())]
+        local = int(self.config.get('shard_workers', DEFAULT_SHARD_WORKERS))
+        if local > 0:
+            tasks.append(asyncio.create_task(self._supervise_local_workers(local)))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+        for worker in list(self._workers.values()):
+            worker.writer.close()
+        self._workers.clear()
+        for process in list(self._processes):
+            try:
+                process.terminate()
+            except ProcessLookupError:
+                pass
+        await asyncio.gather(*(p.wait() for p in list(self._processes)), return_exceptions=True)
+
+
+class ShardWorker:
+    """Connects to a coordinator and checks the tents it is leased.
+
+    scrape(tent, previous_fingerprint, previous_times, config) runs one check; results
+    are sent back and the coordinator's ack decides when the tent is checked next.
+    release(tent_id), if given, frees per-tent resources (e.g. a watch-mode page) once a
+    tent is revoked or its config changes.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        worker_id: str,
+        scrape: Callable[..., Awaitable[ScrapeResult]],
+        capacity: Optional[int] = None,
+        secret: Optional[str] = None,
+        release: Optional[Callable[[str], Awaitable[None]]] = None,
+    ):
+        host, _, port = address.rpartition(':')
+        self.host = host or DEFAULT_SHARD_HOST
+        self.port = int(port or DEFAULT_SHARD_PORT)
+        self.worker_id = worker_id
+        self.scrape = scrape
+        self.capacity = capacity
+        self.secret = secret
+        self.release = release
+        self.config: Dict[str, Any] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._send_lock = asyncio.Lock()
+        self._tokens: Dict[str, int] = {}
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._intervals: Dict[str, float] = {}
+        self._acks: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self.scheduler: Optional[TentScheduler] = None
+
+    async def _send(self, message: Dict[str, Any]):
+        async with self._send_lock:
+            await _send(self._writer, message)
+
+    def _interval_for(self, tent: Dict[str, Any]) -> float:
+        return self._intervals.pop(tent['id'], float(tent.get('check_interval', 180)))
+
+    async def _run_check(self, tent: Dict[str, Any]):
+        tent_id = tent['id']
+        token = self._tokens.get(tent_id)
+        state = self._state.get(tent_id, {})
+        result = await self.scrape(tent, state.get('fingerprint'), state.get('times'), self.config)
+        if self._tokens.get(tent_id) != token:
+            return  # revoked while checking
+
+        self._next_id += 1
+        message_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._acks[message_id] = future
+        try:
+            await self._send({
+                'type': 'result', 'id': message_id, 'tent': tent_id, 'token': token,
+                'result': result.to_dict(),
+            })
+            ack = await asyncio.wait_for(future, timeout=ACK_TIMEOUT)
+        finally:
+            self._acks.pop(message_id, None)
+        if ack.get('revoked'):
+            self._drop(tent_id)
+            return
+        if ack.get('interval') is not None:
+            self._intervals[tent_id] = float(ack['interval'])
+        self._state[tent_id] = {'fingerprint': ack.get('fingerprint'), 'times': ack.get('times')}
+
+    def _drop(self, tent_id: str):
+        self._tokens.pop(tent_id, None)
+        self._state.pop(tent_id, None)
+        if self.scheduler is not None:
+            self.scheduler.remove(tent_id)
+        self._release(tent_id)
+
+    def _release(self, tent_id: str):
+        if self.release is not None:
+            asyncio.ensure_future(self.release(tent_id))
+
+    async def _heartbeat(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self._send({'type': 'renew'})
+
+    async def _session(self):
+        reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=STREAM_LIMIT)
+        await self._send({
+            'type': 'hello', 'worker': self.worker_id, 'capacity': self.capacity or 0, 'secret': self.secret,
+        })
+        welcome = await _receive(reader)
+        if not welcome or welcome.get('type') != 'welcome':
+            raise ConnectionError('coordinator rejected this worker')
+        self.config = welcome['config']
+        self.scheduler = TentScheduler(
+            self._run_check,
+            max_concurrent=self.capacity or self.config.get('max_concurrent_checks', DEFAULT_MAX_CONCURRENT),
+            check_timeout=self.config.get('check_timeout', DEFAULT_CHECK_TIMEOUT),
+            interval_fn=self._interval_for,
+        )
+        logger.info(f"Worker {self.worker_id} connected to {self.host}:{self.port}")
+
+        tasks = [
+            asyncio.create_task(self.scheduler.run()),
+            asyncio.create_task(self._heartbeat(float(welcome.get('lease_ttl', DEFAULT_LEASE_TTL)) / 3)),
+        ]
+        try:
+            while True:
+                message = await _receive(reader)
+                if message is None:
+                    raise ConnectionError('coordinator closed the connection')
+                kind = message.get('type')
+                if kind == 'assign':
+                    tent = message['tent']
+                    self._tokens[tent['id']] = message['token']
+                    self._state[tent['id']] = {'fingerprint': message.get('fingerprint'), 'times': message.get('times')}
+                    self.scheduler.add(tent, delay=float(message.get('delay') or 0))
+                    logger.info(f"{tent['id']}: Leased to this worker")
+                elif kind == 'update':
+                    self.scheduler.update(message['tent'])
+                    self._release(message['tent']['id'])
+                elif kind == 'revoke':
+                    self._drop(message['tent'])
+                    logger.info(f"{message['tent']}: Lease moved to another worker")
+                elif kind == 'ack':
+                    future = self._acks.get(message.get('id'))
+                    if future is not None and not future.done():
+                        future.set_result(message)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.scheduler.close()
+            for tent_id in list(self._tokens):
+                self._drop(tent_id)
+            self._writer.close()
+
+    async def run(self):
+        """Serve the coordinator forever, reconnecting with backoff."""
+        delay = 1.0
+        while True:
+            try:
+                await self._session()
+                delay = 1.0
+            except (ConnectionError, OSError, ValueError) as e:
+                logger.warning(f"Worker {self.worker_id}: {e}; reconnecting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(RECONNECT_MAX_DELAY, delay * 2)
+
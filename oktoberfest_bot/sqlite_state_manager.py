@@ -0,0 +1,207 @@
+"""SQLite-backed state with an append-only history of availability transitions"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .state_manager import StateManager
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tent_state (
+    tent_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS availability_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tent_id TEXT NOT NULL,
+    observed_at REAL NOT NULL,
+    event TEXT NOT NULL CHECK (event IN ('appeared', 'vanished')),
+    date_value TEXT NOT NULL,
+    date_text TEXT,
+    time_value TEXT,
+    time_text TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_tent_observed ON availability_history (tent_id, observed_at);
+CREATE INDEX IF NOT EXISTS idx_history_observed ON availability_history (observed_at);
+"""
+
+# (tent_id, observed_at, event, date_value, date_text, time_value, time_text)
+HistoryRow = Tuple[str, float, str, str, Optional[str], Optional[str], Optional[str]]
+
+
+def _date_map(dates: List[Dict]) -> Dict[str, str]:
+    return {d['value']: d.get('text', '') for d in dates or [] if d.get('value') is not None}
+
+
+def _time_map(times: Dict[str, Dict[str, Any]]) -> Dict[Tuple[str, str], Tuple[str, str]]:
+    """Flatten available_times to {(date_value, time_value): (date_text, time_text)}."""
+    flat: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    for date_value, info in (times or {}).items():
+        for t in info.get('times', []):
+            if t.get('value') is not None:
+                flat[(date_value, t['value'])] = (info.get('date_text', ''), t.get('text', ''))
+    return flat
+
+
+class SqliteStateManager(StateManager):
+    """StateManager stored in SQLite, recording when dates and time slots appear or vanish.
+
+    Snapshots and history rows are buffered in memory and written in a single
+    transaction per flush().
+    """
+
+    def __init__(self, db_file: str, fsync: bool = False, import_json: Optional[str] = None):
+        self.db_file = db_file
+        self.import_json = import_json
+        self._dirty_tents: Set[str] = set()
+        self._pending_history: List[HistoryRow] = []
+        self.conn: Optional[sqlite3.Connection] = None
+        super().__init__(db_file, fsync=fsync)
+
+    def _load(self) -> Dict[str, Any]:
+        """Open the database (creating the schema) and load all tent snapshots"""
+        Path(self.db_file).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+        self.conn.executescript(_SCHEMA)
+
+        state = {
+            tent_id: json.loads(data)
+            for tent_id, data in self.conn.execute('SELECT tent_id, data FROM tent_state')
+        }
+
+        # One-time migration from an existing JSON state file
+        if not state and self.import_json and os.path.exists(self.import_json):
+            try:
+                with open(self.import_json, 'r') as f:
+                    state = json.load(f)
+                self._dirty_tents.update(state)
+                self._dirty = True
+                logger.info(f"Imported {len(state)} tent state(s) from {self.import_json}")
+            except Exception as e:
+                logger.error(f"Could not import JSON state {self.import_json}: {e}")
+                state = {}
+        return state
+
+    def _save(self):
+        """Write dirty tent snapshots and pending history rows in one transaction"""
+        now = time.time()
+        rows = [
+            (tent_id, json.dumps(self.state[tent_id]), now)
+            for tent_id in self._dirty_tents
+            if tent_id in self.state
+        ]
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO tent_state (tent_id, data, updated_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(tent_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at',
+                rows,
+            )
+            self.conn.executemany(
+                'INSERT INTO availability_history '
+                '(tent_id, observed_at, event, date_value, date_text, time_value, time_text) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self._pending_history,
+            )
+        self._dirty_tents.clear()
+        self._pending_history = []
+
+    def update_tent_state(self, tent_id: str, **kwargs):
+        """Update state for a specific tent"""
+        super().update_tent_state(tent_id, **kwargs)
+        self._dirty_tents.add(tent_id)
+
+    def mark_check_success(
+        self,
+        tent_id: str,
+        dates_available: bool,
+        available_dates: List[Dict] = None,
+        available_times: Dict[str, Dict[str, Any]] = None,
+        fingerprint: Optional[str] = None,
+        full_scan: bool = True,
+    ):
+        """Mark a successful check for a tent and queue the transitions it implies"""
+        now = time.time()
+        old_dates = _date_map(self.get_available_dates(tent_id))
+        new_dates = _date_map(available_dates)
+        old_times = _time_map(self.get_available_times(tent_id))
+        new_times = _time_map(available_times)
+
+        for value in new_dates.keys() - old_dates.keys():
+            self._pending_history.append((tent_id, now, 'appeared', value, new_dates[value], None, None))
+        for value in old_dates.keys() - new_dates.keys():
+            self._pending_history.append((tent_id, now, 'vanished', value, old_dates[value], None, None))
+        for key in new_times.keys() - old_times.keys():
+            date_text, time_text = new_times[key]
+            self._pending_history.append((tent_id, now, 'appeared', key[0], date_text, key[1], time_text))
+        for key in old_times.keys() - new_times.keys():
+            date_text, time_text = old_times[key]
+            self._pending_history.append((tent_id, now, 'vanished', key[0], date_text, key[1], time_text))
+
+        super().mark_check_success(
+            tent_id, dates_available, available_dates, available_times,
+            fingerprint=fingerprint, full_scan=full_scan,
+        )
+
+    def get_history(
+        self,
+        tent_id: Optional[str] = None,
+        since_hours: Optional[float] = None,
+        event: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return recorded transitions, newest first (unflushed ones included)"""
+        self.flush()
+        clauses, params = [], []
+        if tent_id is not None:
+            clauses.append('tent_id = ?')
+            params.append(tent_id)
+        if since_hours is not None:
+            clauses.append('observed_at >= ?')
+            params.append(time.time() - since_hours * 3600)
+        if event is not None:
+            clauses.append('event = ?')
+            params.append(event)
+        sql = (
+            'SELECT tent_id, observed_at, event, date_value, date_text, time_value, time_text '
+            'FROM availability_history'
+        )
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY observed_at DESC, id DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+
+        return [
+            {
+                'tent_id': row[0],
+                'observed_at': datetime.fromtimestamp(row[1]).isoformat(),
+                'event': row[2],
+                'date_value': row[3],
+                'date_text': row[4],
+                'time_value': row[5],
+                'time_text': row[6],
+            }
+            for row in self.conn.execute(sql, params)
+        ]
+
+    def slots_seen_since(self, hours: float, tent_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Dates/time slots that appeared within the last `hours` hours"""
+        return self.get_history(tent_id=tent_id, since_hours=hours, event='appeared')
+
+    def close(self):
+        """Flush pending changes and close the database"""
+        super().close()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -1,17 +1,28 @@
 """State management for tracking tent availability across monitoring sessions"""
 
 import json
+import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from .metrics import timed
+
+logger = logging.getLogger(__name__)
 
 
 class StateManager:
-    """Manages persistent state for all monitored tents"""
+    """Manages persistent state for all monitored tents.
 
-    def __init__(self, state_file: str):
+    Mutations only mark the state dirty; call flush() (the monitor does so periodically
+    and on shutdown) to write all pending changes at once.
+    """
+
+    def __init__(self, state_file: str, fsync: bool = False):
         self.state_file = state_file
+        self.fsync = fsync
+        self._dirty = False
         self.state = self._load()
 
     def _load(self) -> Dict[str, Any]:
@@ -20,16 +31,51 @@ class StateManager:
             try:
                 with open(self.state_file, 'r') as f:
                     return json.load(f)
-            except Exception:
+            except Exception as e:
+                # Keep the unreadable file for inspection instead of silently overwriting it.
+                backup = f"{self.state_file}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                try:
+                    os.replace(self.state_file, backup)
+                    logger.error(f"Could not read state file ({e}); moved it to {backup} and starting fresh")
+                except OSError:
+                    logger.error(f"Could not read state file ({e}); starting fresh")
                 return {}
         return {}
 
     def _save(self):
-        """Save current state to file"""
-        Path(self.state_file).parent.mkdir(parents=True, exist_ok=True)
+        """Atomically write current state: temp file in the same directory, then rename."""
+        path = Path(self.state_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
 
-        with open(self.state_file, 'w') as f:
+        with open(tmp_path, 'w') as f:
             json.dump(self.state, f, indent=2)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        if self.fsync and hasattr(os, 'O_DIRECTORY'):
+            # Persist the rename itself
+            dir_fd = os.open(str(path.parent), os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    @property
+    def dirty(self) -> bool:
+        """True if there are changes not yet written to disk"""
+        return self._dirty
+
+    def flush(self) -> bool:
+        """Write pending changes, if any. Returns True if the file was written."""
+        if not self._dirty:
+            return False
+        with timed('state_save'):
+            self._save()
+        self._dirty = False
+        return True
 
     def get_tent_state(self, tent_id: str) -> Dict[str, Any]:
         """Get state for a specific tent"""
@@ -52,7 +98,7 @@ class StateManager:
         """Update state for a specific tent"""
         tent_state = self.get_tent_state(tent_id)
         tent_state.update(kwargs)
-        self._save()
+        self._dirty = True
 
     def mark_check_success(
         self,
@@ -60,16 +106,24 @@ class StateManager:
         dates_available: bool,
         available_dates: List[Dict] = None,
         available_times: Dict[str, Dict[str, Any]] = None,
+        fingerprint: Optional[str] = None,
+        full_scan: bool = True,
     ):
         """Mark a successful check for a tent"""
+        now = datetime.now().isoformat()
+        previous = self.get_fingerprint(tent_id) or {}
         self.update_tent_state(
             tent_id,
-            last_check=datetime.now().isoformat(),
+            last_check=now,
             dates_available=dates_available,
             available_dates=available_dates or [],
             available_times=available_times or {},
             consecutive_errors=0,
             error_notified=False,
+            fingerprint={
+                'value': fingerprint,
+                'full_scan_at': now if full_scan else previous.get('full_scan_at'),
+            } if fingerprint else None,
         )
 
     def mark_check_error(self, tent_id: str):
@@ -103,3 +157,35 @@ class StateManager:
     def mark_error_notified(self, tent_id: str):
         """Mark that error notification has been sent"""
         self.update_tent_state(tent_id, error_notified=True)
+
+    def get_fingerprint(self, tent_id: str) -> Optional[Dict[str, Any]]:
+        """Get the last page fingerprint ({value, full_scan_at}) for a tent, if any"""
+        return self.get_tent_state(tent_id).get('fingerprint')
+
+    def record_change(self, tent_id: str, when: datetime):
+        """Remember that availability changed (used for adaptive polling).
+
+        `when` should be timezone-aware; its hour of day is counted as a release hour.
+        """
+        tent_state = self.get_tent_state(tent_id)
+        change_hours = dict(tent_state.get('change_hours', {}))
+        change_hours[str(when.hour)] = change_hours.get(str(when.hour), 0) + 1
+        self.update_tent_state(tent_id, last_change=when.isoformat(), change_hours=change_hours)
+
+    def get_last_change(self, tent_id: str) -> Optional[datetime]:
+        """Get the time of the last detected availability change, if any"""
+        value = self.get_tent_state(tent_id).get('last_change')
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+    def get_change_hours(self, tent_id: str) -> Dict[str, int]:
+        """Get number of detected changes per hour of day ("0".."23")"""
+        return self.get_tent_state(tent_id).get('change_hours', {})
+
+    def close(self):
+        """Flush pending changes and release resources"""
+        self.flush()
@@ -0,0 +1,83 @@
+"""CircuitBreaker: state transitions, backoff and resuming after a restart"""
+
+import pytest
+
+from oktoberfest_bot.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from oktoberfest_bot.state_manager import StateManager
+
+TENT = {'id': 'a', 'check_interval': 120, 'breaker_threshold': 2, 'breaker_backoff_base': 300}
+
+
+@pytest.fixture
+def state(tmp_path):
+    return StateManager(str(tmp_path / 'state.json'))
+
+
+def _fail(state, times=1):
+    for _ in range(times):
+        state.mark_check_error('a')
+
+
+def test_stays_closed_below_the_threshold(state):
+    breaker = CircuitBreaker(state)
+    _fail(state)
+    assert breaker.interval_for(TENT) == 120
+    assert breaker.state('a') == CLOSED
+
+
+def test_opens_at_the_threshold_and_doubles_the_backoff(state, monkeypatch):
+    monkeypatch.setattr('random.uniform', lambda a, b: 1.0)
+    breaker = CircuitBreaker(state)
+    _fail(state, 2)
+    assert breaker.interval_for(TENT) == 300
+    assert breaker.state('a') == OPEN
+
+    breaker.before_check(TENT)
+    assert breaker.state('a') == HALF_OPEN
+    _fail(state)
+    assert breaker.interval_for(TENT) == 600
+    assert breaker.state('a') == OPEN
+
+
+def test_backoff_is_capped_and_jittered(state):
+    breaker = CircuitBreaker(state)
+    _fail(state, 30)
+    delays = [breaker.backoff(dict(TENT, breaker_backoff_max=1000)) for _ in range(20)]
+    assert all(800 <= d <= 1200 for d in delays)
+
+
+def test_successful_probe_closes_the_circuit(state):
+    breaker = CircuitBreaker(state)
+    _fail(state, 2)
+    breaker.interval_for(TENT)
+    breaker.before_check(TENT)
+    state.mark_check_success('a', False)
+    assert breaker.interval_for(TENT) == 120
+    assert breaker.state('a') == CLOSED
+
+
+def test_before_check_leaves_a_closed_circuit_alone(state):
+    breaker = CircuitBreaker(state)
+    breaker.before_check(TENT)
+    assert breaker.state('a') == CLOSED
+
+
+def test_can_be_disabled(state):
+    breaker = CircuitBreaker(state, {'circuit_breaker': False})
+    _fail(state, 10)
+    assert breaker.backoff(TENT) is None
+    assert breaker.interval_for(TENT) == 120
+
+
+def test_persisted_failures_delay_the_first_check(state):
+    breaker = CircuitBreaker(state)
+    assert breaker.initial_delay(TENT) == 0.0
+    _fail(state, 3)
+    assert CircuitBreaker(state).initial_delay(TENT) >= 480
+
+
+def test_interval_fn_supplies_the_closed_interval(state):
+    breaker = CircuitBreaker(state, interval_fn=lambda tent: 45)
+    assert breaker.interval_for(TENT) == 45
+    _fail(state, 2)
+    assert breaker.interval_for(TENT) >= 240
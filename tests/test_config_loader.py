@@ -0,0 +1,122 @@
+"""ConfigLoader.reload: change detection, validation and keeping the last good settings"""
+
+import json
+import os
+
+import pytest
+
+from oktoberfest_bot.config_loader import ConfigError, ConfigLoader
+
+CONFIG = {'telegram_bot_token': 'token', 'telegram_chat_id': '1', 'state_file': 's.json', 'log_file': 'bot.log'}
+TENT = {'id': 'a', 'name': 'Tent A', 'url': 'https://example.com/a', 'scraper_type': 'form_select'}
+
+
+def _write(path, data):
+    # Bump the mtime explicitly: rewrites within one timestamp tick would look unchanged.
+    stamp = os.stat(path).st_mtime_ns + 10**9 if os.path.exists(path) else None
+    with open(path, 'w') as f:
+        f.write(data if isinstance(data, str) else json.dumps(data))
+    if stamp:
+        os.utime(path, ns=(stamp, stamp))
+
+
+@pytest.fixture
+def loader(tmp_path):
+    config_path, tents_path = tmp_path / 'config.json', tmp_path / 'tents.json'
+    _write(config_path, CONFIG)
+    _write(tents_path, {'tents': [TENT]})
+    return ConfigLoader(str(config_path), str(tents_path))
+
+
+def test_unchanged_files_are_not_reloaded(loader):
+    assert loader.reload() is False
+
+
+def test_touched_but_identical_files_do_not_count_as_a_change(loader):
+    _write(loader.tents_path, {'tents': [TENT]})
+    assert loader.reload() is False
+
+
+def test_changes_are_swapped_in_and_config_dict_is_updated_in_place(loader):
+    config = loader.get_config()
+    tent_b = dict(TENT, id='b', name='Tent B')
+    _write(loader.config_path, dict(CONFIG, check_interval=60))
+    _write(loader.tents_path, {'tents': [TENT, tent_b, dict(tent_b, id='c', enabled=False)]})
+
+    assert loader.reload() is True
+    assert config is loader.get_config()
+    assert config['check_interval'] == 60
+    assert [t['id'] for t in loader.get_tents()] == ['a', 'b']
+
+
+@pytest.mark.parametrize('tents', [
+    '{"tents": [',
+    {'tents': []},
+    {'tents': [TENT, TENT]},
+    {'tents': [{'id': 'x', 'name': 'X'}]},
+])
+def test_invalid_tents_keep_the_current_settings(loader, tents):
+    _write(loader.tents_path, tents)
+    with pytest.raises(ConfigError):
+        loader.reload()
+    assert loader.get_tents() == [TENT]
+    # The same broken version is reported only once.
+    assert loader.reload() is False
+
+
+def test_validate_problems_reject_the_reload(loader):
+    _write(loader.tents_path, {'tents': [dict(TENT, scraper_type='form_selct')]})
+
+    def validate(config, tents):
+        return [f"Tent '{t['id']}': unknown scraper_type" for t in tents if t['scraper_type'] != 'form_select']
+
+    with pytest.raises(ConfigError, match='unknown scraper_type'):
+        loader.reload(validate=validate)
+    assert loader.get_tents() == [TENT]
+
+
+def test_fixed_files_are_picked_up_after_a_rejected_reload(loader):
+    _write(loader.config_path, {'telegram_bot_token': 'token'})
+    with pytest.raises(ConfigError, match='Missing required config fields'):
+        loader.reload()
+
+    _write(loader.config_path, dict(CONFIG, check_interval=90))
+    assert loader.reload() is True
+    assert loader.get_config()['check_interval'] == 90
+
+
+def test_validate_settings_reports_unknown_types_and_bad_intervals():
+    from oktoberfest_bot.main import validate_settings
+
+    problems = validate_settings(CONFIG, [dict(TENT, scraper_type='form_selct', check_interval=0)])
+    assert len(problems) == 2
+    assert any('check_interval' in p for p in problems)
+    assert any("unknown scraper_type 'form_selct'" in p for p in problems)
+
+
+@pytest.mark.parametrize('host, token, ok', [
+    ('127.0.0.1', None, True),
+    ('localhost', None, True),
+    ('0.0.0.0', None, False),
+    ('0.0.0.0', 'secret', True),
+])
+def test_validate_settings_requires_a_shard_token_off_loopback(host, token, ok):
+    from oktoberfest_bot.main import validate_settings
+
+    config = dict(CONFIG, sharding=True, shard_host=host)
+    if token:
+        config['shard_token'] = token
+    assert (validate_settings(config, [TENT]) == []) is ok
+
+
+def test_validate_settings_compiles_the_tent_spec_without_loading_the_scraper():
+    from oktoberfest_bot.main import validate_settings
+    from oktoberfest_bot.scrapers.registry import ScraperRegistry
+
+    problems = validate_settings(CONFIG, [TENT, dict(TENT, id='b', selector_timeout='abc')])
+    assert len(problems) == 1
+    assert problems[0].startswith("Tent 'b': invalid setting:")
+    # Built-in types are checked without importing Playwright.
+    registry = ScraperRegistry(include_plugins=False)
+    registry.compile_spec(TENT)
+    assert registry._classes == {}
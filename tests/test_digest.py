@@ -0,0 +1,110 @@
+"""Digest merging, batching and the Telegram message length limit"""
+
+import asyncio
+
+from oktoberfest_bot.notifiers.base_notifier import BaseNotifier
+from oktoberfest_bot.notifiers.digest import (
+    MAX_MESSAGE_LENGTH,
+    TENT_SEPARATOR,
+    PendingMessage,
+    build_digests,
+    split_digest,
+    split_message,
+)
+
+
+def test_short_message_is_not_split():
+    assert split_message('hello\nworld') == ['hello\nworld']
+
+
+def test_split_message_respects_limit_and_line_boundaries():
+    lines = [f"line {i:04d} " + 'x' * 40 for i in range(200)]
+    chunks = split_message('\n'.join(lines))
+    assert len(chunks) > 1
+    assert all(len(c) <= MAX_MESSAGE_LENGTH for c in chunks)
+    assert '\n'.join(chunks).split('\n') == lines
+
+
+def test_split_message_breaks_overlong_lines():
+    text = 'a' * (MAX_MESSAGE_LENGTH * 2 + 10)
+    chunks = split_message(text)
+    assert [len(c) for c in chunks] == [MAX_MESSAGE_LENGTH, MAX_MESSAGE_LENGTH, 10]
+    assert ''.join(chunks) == text
+
+
+def test_messages_of_one_tent_share_a_block_with_one_link():
+    digests = build_digests([
+        PendingMessage('A', 'dates', link='https://a'),
+        PendingMessage('B', 'times', reaction='🎉', link='https://b'),
+        PendingMessage('A', 'more dates', link='https://a'),
+    ])
+    assert len(digests) == 1
+    text, reaction = digests[0]
+    blocks = split_digest(text)
+    assert blocks == [
+        'dates\n\nmore dates\n\n🔗 Book now: https://a',
+        'times\n\n🔗 Book now: https://b',
+    ]
+    assert reaction == '🎉'
+
+
+def test_digests_stay_within_limit():
+    items = [PendingMessage(f"tent{i}", f"tent {i} " + 'y' * 1500) for i in range(10)]
+    digests = build_digests(items)
+    assert all(len(text) <= MAX_MESSAGE_LENGTH for text, _ in digests)
+    # Two 1.5k blocks fit per message, a third does not.
+    assert len(digests) == 5
+    assert sum(len(split_digest(text)) for text, _ in digests) == 10
+
+
+def test_oversized_tent_block_is_split_across_messages():
+    text = '\n'.join('slot ' + 'z' * 100 for _ in range(100))
+    digests = build_digests([PendingMessage('A', text, link='https://a')])
+    assert len(digests) > 1
+    assert all(len(d) <= MAX_MESSAGE_LENGTH for d, _ in digests)
+    assert digests[-1][0].endswith('🔗 Book now: https://a')
+
+
+def test_split_digest_keeps_single_message_whole():
+    assert split_digest('only one tent') == ['only one tent']
+    assert split_digest(TENT_SEPARATOR.join(['a', 'b'])) == ['a', 'b']
+
+
+class RecordingNotifier(BaseNotifier):
+    def __init__(self, batch_delay: float):
+        super().__init__()
+        self.batch_delay = batch_delay
+        self.sent = []
+
+    async def send_notification(self, message):
+        await asyncio.sleep(0.02)
+        self.sent.append(message)
+        return len(self.sent)
+
+
+def test_batched_alerts_are_sent_as_one_digest():
+    async def scenario():
+        notifier = RecordingNotifier(batch_delay=0.05)
+        await notifier.send_dates_unavailable('Tent A')
+        await notifier.send_dates_unavailable('Tent B')
+        assert notifier.sent == []
+        await asyncio.sleep(0.15)
+        return notifier.sent
+
+    sent = asyncio.run(scenario())
+    assert len(sent) == 1
+    assert len(split_digest(sent[0])) == 2
+
+
+def test_alert_queued_during_a_flush_is_not_stranded():
+    async def scenario():
+        notifier = RecordingNotifier(batch_delay=0.05)
+        await notifier.send_dates_unavailable('Tent A')
+        await asyncio.sleep(0.06)  # the flush is now sending Tent A
+        await notifier.send_dates_unavailable('Tent B')
+        await asyncio.sleep(0.2)
+        return notifier.sent
+
+    sent = asyncio.run(scenario())
+    assert len(sent) == 2
+    assert 'Tent B' in sent[1]
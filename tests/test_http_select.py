@@ -0,0 +1,113 @@
+"""HttpSelectScraper: option parsing from server-rendered HTML"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('playwright')
+
+from oktoberfest_bot.scrapers.http_select import (  # noqa: E402
+    HttpSelectScraper,
+    _looks_like_bot_check,
+    _parse_selector,
+    _SelectOptionsParser,
+)
+
+PAGE = """
+<form>
+  <select name="other"><option value="x">Not this one</option></select>
+  <select class="form-select date" id="date">
+    <option value="">Bitte wählen</option>
+    <option>No value attribute</option>
+    <option value="19">Fr, 19.09.</option>
+    <option value="20" disabled>Sa, 20.09.</option>
+    <optgroup label="Oktober" disabled><option value="01">Mi, 01.10.</option></optgroup>
+    <optgroup label="Later"><option value="03">Fr,
+        03.10. &amp; more</option></optgroup>
+    <option value="05">So, 05.10.
+  </select>
+  <select class="form-select date"><option value="99">Second match</option></select>
+</form>
+"""
+
+
+def _options(selector: str, html: str = PAGE):
+    parser = _SelectOptionsParser(selector)
+    parser.feed(html)
+    parser.close()
+    return parser.found, parser.options
+
+
+def test_parses_first_matching_select_and_skips_placeholders_and_disabled():
+    found, options = _options('select.form-select')
+    assert found
+    assert options == [
+        {'value': '19', 'text': 'Fr, 19.09.'},
+        {'value': '03', 'text': 'Fr, 03.10. & more'},
+        {'value': '05', 'text': 'So, 05.10.'},
+    ]
+
+
+@pytest.mark.parametrize('selector', [
+    'select#date',
+    '#date',
+    'select.form-select.date',
+    'select[id="date"]',
+    "select[id='date']",
+    'select[class]',
+])
+def test_supported_selectors_match(selector):
+    found, options = _options(selector)
+    assert found
+    assert [o['value'] for o in options] == ['19', '03', '05']
+
+
+def test_missing_select_is_reported():
+    found, options = _options('select#nope')
+    assert not found
+    assert options == []
+
+
+@pytest.mark.parametrize('selector', ['form select', 'select > option', 'select:first-child'])
+def test_complex_selectors_are_rejected(selector):
+    with pytest.raises(ValueError):
+        _parse_selector(selector)
+
+
+def test_bot_check_markers():
+    assert _looks_like_bot_check('<title>Just a moment...</title>')
+    assert not _looks_like_bot_check(PAGE)
+
+
+TENT = {'id': 'a', 'name': 'Tent A', 'url': 'https://example.com', 'scraper_type': 'http_select', 'selector': 'select#date'}
+
+
+def _scraper(tent=TENT):
+    scraper = HttpSelectScraper(tent)
+    scraper.previous_times = {'19': {'times': [{'value': '101'}]}}
+    scraper.fetched = False
+
+    async def fetch():
+        scraper.fetched = True
+        return 200, PAGE
+
+    async def fallback(reason):
+        return reason
+
+    scraper._fetch = fetch
+    scraper._fallback = fallback
+    return scraper
+
+
+def test_http_path_reports_no_time_slots():
+    result = asyncio.run(_scraper().check_availability())
+    assert result.success and result.dates_available
+    assert result.available_times == {}
+    assert result.full_scan is True
+
+
+def test_tents_with_a_time_selector_use_the_browser():
+    scraper = _scraper(dict(TENT, time_selector='select#time'))
+    assert asyncio.run(scraper.check_availability()) == "Time slots need the browser"
+    assert not scraper.fetched
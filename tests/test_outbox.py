@@ -0,0 +1,114 @@
+"""Outbox: ordered delivery, retry_after, permanent errors and restarts"""
+
+import asyncio
+import time
+
+from oktoberfest_bot.notifiers.digest import TENT_SEPARATOR
+from oktoberfest_bot.notifiers.outbox import DeliveryError, Outbox
+
+
+class FakeNotifier:
+    """Records deliveries; `failures` holds errors to raise for the next attempts."""
+
+    def __init__(self, failures=None):
+        self.sent = []
+        self.attempts = []
+        self.reactions = []
+        self.failures = list(failures or [])
+
+    async def deliver(self, message, chat_id=None):
+        self.attempts.append((time.time(), message))
+        if 'BAD' in message:
+            raise DeliveryError('Bad Request', permanent=True)
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append((chat_id, message))
+        return len(self.sent)
+
+    def _maybe_react(self, message_id, reaction):
+        self.reactions.append((message_id, reaction))
+
+
+async def _drain(outbox: Outbox, notifier: FakeNotifier, seconds: float = 0.2, messages=()):
+    # Enqueue inside the loop: the outbox's wakeup event belongs to the running loop.
+    for chat_id, message, *reaction in messages:
+        outbox.enqueue(chat_id, message, *reaction)
+    worker = asyncio.create_task(outbox.run(notifier))
+    await asyncio.sleep(seconds)
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+
+
+def _outbox(tmp_path, **kwargs) -> Outbox:
+    return Outbox(str(tmp_path / 'outbox.sqlite'), **{'min_interval': 0, **kwargs})
+
+
+def test_delivers_in_fifo_order_per_chat(tmp_path):
+    outbox = _outbox(tmp_path)
+    notifier = FakeNotifier()
+    messages = [(chat, f"{chat}{i}") for i in range(3) for chat in 'ab']
+
+    asyncio.run(_drain(outbox, notifier, messages=messages))
+    assert [m for chat, m in notifier.sent if chat == 'a'] == ['a0', 'a1', 'a2']
+    assert [m for chat, m in notifier.sent if chat == 'b'] == ['b0', 'b1', 'b2']
+    assert outbox.pending_count() == 0
+
+
+def test_retry_after_holds_back_the_whole_chat(tmp_path):
+    outbox = _outbox(tmp_path)
+    notifier = FakeNotifier(failures=[DeliveryError('Too Many Requests', retry_after=0.3)])
+    async def scenario():
+        outbox.enqueue('a', 'first')
+        outbox.enqueue('a', 'second')
+        worker = asyncio.create_task(outbox.run(notifier))
+        await asyncio.sleep(0.1)
+        assert notifier.sent == []
+        assert outbox.pending_count() == 2
+        await asyncio.sleep(0.4)
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert notifier.sent == [('a', 'first'), ('a', 'second')]
+    first_try, retry = notifier.attempts[0][0], notifier.attempts[1][0]
+    assert retry - first_try >= 0.3
+
+
+def test_min_interval_spaces_messages(tmp_path):
+    outbox = _outbox(tmp_path, min_interval=0.1)
+    notifier = FakeNotifier()
+    asyncio.run(_drain(outbox, notifier, 0.3, messages=[('a', 'one'), ('a', 'two')]))
+    assert [m for _, m in notifier.sent] == ['one', 'two']
+    assert notifier.attempts[1][0] - notifier.attempts[0][0] >= 0.1
+
+
+def test_pending_messages_survive_a_restart(tmp_path):
+    outbox = _outbox(tmp_path)
+    outbox.enqueue('a', 'queued before the crash', reaction='🎉')
+    outbox.close()
+
+    reopened = _outbox(tmp_path)
+    assert reopened.pending_count() == 1
+    notifier = FakeNotifier()
+    asyncio.run(_drain(reopened, notifier))
+    assert notifier.sent == [('a', 'queued before the crash')]
+    assert notifier.reactions == [(1, '🎉')]
+
+
+def test_permanent_error_drops_single_message(tmp_path):
+    outbox = _outbox(tmp_path)
+    notifier = FakeNotifier()
+    asyncio.run(_drain(outbox, notifier, messages=[('a', 'BAD'), ('a', 'next')]))
+    assert notifier.sent == [('a', 'next')]
+    assert outbox.pending_count() == 0
+
+
+def test_rejected_digest_is_split_and_keeps_order(tmp_path):
+    outbox = _outbox(tmp_path)
+    notifier = FakeNotifier()
+    digest = TENT_SEPARATOR.join(['tent A', 'tent BAD', 'tent C'])
+
+    asyncio.run(_drain(outbox, notifier, messages=[('a', digest, '🎉'), ('a', 'later')]))
+    assert [m for _, m in notifier.sent] == ['tent A', 'tent C', 'later']
+    assert notifier.reactions == [(1, '🎉')]
+    assert outbox.pending_count() == 0
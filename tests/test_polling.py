@@ -0,0 +1,65 @@
+"""AdaptivePollingPolicy: intervals from change history, night hours and quiet periods"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from oktoberfest_bot.polling import AdaptivePollingPolicy
+from oktoberfest_bot.state_manager import StateManager
+
+TENT = {'id': 'a', 'check_interval': 120, 'adaptive_polling': True}
+NOON = datetime(2026, 9, 20, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def state(tmp_path):
+    return StateManager(str(tmp_path / 'state.json'))
+
+
+def test_disabled_policy_returns_check_interval(state):
+    policy = AdaptivePollingPolicy(state)
+    assert policy.interval_for(dict(TENT, adaptive_polling=False), NOON) == 120
+
+
+def test_setting_falls_back_to_main_config(state):
+    policy = AdaptivePollingPolicy(state, {'adaptive_polling': True, 'max_check_interval': 100})
+    assert policy.interval_for({'id': 'a', 'check_interval': 120}, NOON) == 100
+
+
+def test_no_history_uses_check_interval(state):
+    assert AdaptivePollingPolicy(state).interval_for(TENT, NOON) == 120
+
+
+def test_recent_change_polls_at_the_floor(state):
+    state.record_change('a', NOON - timedelta(minutes=10))
+    assert AdaptivePollingPolicy(state).interval_for(TENT, NOON) == 60
+
+
+def test_quiet_periods_double_the_interval_up_to_the_ceiling(state):
+    policy = AdaptivePollingPolicy(state)
+    state.record_change('a', NOON - timedelta(hours=7))
+    assert policy.interval_for(TENT, NOON) == 240
+    state.record_change('a', NOON - timedelta(hours=25))
+    assert policy.interval_for(TENT, NOON) == 900
+
+
+def test_historic_release_hour_polls_at_the_floor(state):
+    for days in (2, 3):
+        state.record_change('a', NOON.replace(hour=9) - timedelta(days=days))
+    policy = AdaptivePollingPolicy(state)
+    assert policy.interval_for(TENT, NOON.replace(hour=9, minute=15)) == 60
+    # Half an hour before the release hour counts as well.
+    assert policy.interval_for(TENT, NOON.replace(hour=8, minute=40)) == 60
+    assert policy.interval_for(TENT, NOON.replace(hour=10, minute=0)) == 900
+
+
+def test_night_polls_at_the_ceiling(state):
+    policy = AdaptivePollingPolicy(state)
+    assert policy.interval_for(TENT, NOON.replace(hour=3)) == 900
+    assert policy.interval_for(dict(TENT, night_hours=[2, 4]), NOON.replace(hour=5)) == 120
+
+
+@pytest.mark.parametrize('hour, interval', [(23, 900), (2, 900), (5, 900), (6, 120), (12, 120), (22, 120)])
+def test_night_window_may_wrap_midnight(state, hour, interval):
+    policy = AdaptivePollingPolicy(state)
+    assert policy.interval_for(dict(TENT, night_hours=[23, 6]), NOON.replace(hour=hour)) == interval
@@ -0,0 +1,132 @@
+"""TentScheduler: per-tent intervals, concurrency limit and removal"""
+
+import asyncio
+
+from oktoberfest_bot.scheduler import TentScheduler
+
+
+async def _run_for(scheduler: TentScheduler, seconds: float):
+    runner = asyncio.create_task(scheduler.run())
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        await scheduler.close()
+
+
+def test_each_tent_runs_on_its_own_interval():
+    calls = {'fast': 0, 'slow': 0}
+
+    async def check(tent):
+        calls[tent['id']] += 1
+
+    async def scenario():
+        scheduler = TentScheduler(check)
+        scheduler.add({'id': 'fast', 'check_interval': 0.05})
+        scheduler.add({'id': 'slow', 'check_interval': 10})
+        await _run_for(scheduler, 0.33)
+
+    asyncio.run(scenario())
+    assert calls['slow'] == 1
+    assert 3 <= calls['fast'] <= 8
+
+
+def test_interval_fn_overrides_check_interval():
+    calls = []
+
+    async def check(tent):
+        calls.append(tent['id'])
+
+    async def scenario():
+        scheduler = TentScheduler(check, interval_fn=lambda tent: 10)
+        scheduler.add({'id': 'a', 'check_interval': 0.01})
+        await _run_for(scheduler, 0.1)
+
+    asyncio.run(scenario())
+    assert calls == ['a']
+
+
+def test_concurrency_limit():
+    running = 0
+    peak = 0
+
+    async def check(tent):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    async def scenario():
+        scheduler = TentScheduler(check, max_concurrent=2)
+        for i in range(5):
+            scheduler.add({'id': f"t{i}", 'check_interval': 10})
+        await _run_for(scheduler, 0.2)
+
+    asyncio.run(scenario())
+    assert peak == 2
+
+
+def test_slow_check_does_not_overlap_with_itself():
+    starts = []
+
+    async def check(tent):
+        starts.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(0.1)
+
+    async def scenario():
+        scheduler = TentScheduler(check)
+        scheduler.add({'id': 'a', 'check_interval': 0.01})
+        await _run_for(scheduler, 0.25)
+
+    asyncio.run(scenario())
+    assert len(starts) >= 2
+    assert all(b - a >= 0.1 for a, b in zip(starts, starts[1:]))
+
+
+def test_remove_cancels_in_flight_check_and_stops_scheduling():
+    cancelled = []
+    calls = []
+
+    async def scenario():
+        in_check = asyncio.Event()
+
+        async def check(tent):
+            calls.append(tent['id'])
+            in_check.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(tent['id'])
+                raise
+
+        scheduler = TentScheduler(check)
+        scheduler.add({'id': 'a', 'check_interval': 0.01})
+        runner = asyncio.create_task(scheduler.run())
+        await asyncio.wait_for(in_check.wait(), timeout=1)
+        scheduler.remove('a')
+        await asyncio.sleep(0.1)
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        assert scheduler.tent_ids() == []
+
+    asyncio.run(scenario())
+    assert calls == ['a']
+    assert cancelled == ['a']
+
+
+def test_check_timeout_reschedules_tent():
+    calls = []
+
+    async def check(tent):
+        calls.append(tent['id'])
+        await asyncio.sleep(10)
+
+    async def scenario():
+        scheduler = TentScheduler(check, check_timeout=0.05)
+        scheduler.add({'id': 'a', 'check_interval': 0.01})
+        await _run_for(scheduler, 0.2)
+
+    asyncio.run(scenario())
+    assert len(calls) >= 2
@@ -0,0 +1,287 @@
+"""Sharded mode: leasing, rebalancing, lease expiry and stale-result fencing"""
+
+import asyncio
+import json
+import socket
+
+import pytest
+
+from oktoberfest_bot.scrapers.base_scraper import ScrapeResult
+from oktoberfest_bot.sharding import ShardCoordinator, ShardWorker
+
+TENTS = [{'id': f"t{i}", 'name': f"Tent {i}", 'check_interval': 10} for i in range(4)]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Harness:
+    """A coordinator on a free local port that records every processed result."""
+
+    def __init__(self, tents=TENTS, initial_delay=None, **config):
+        self.port = _free_port()
+        self.processed = []
+        self.config = {'shard_port': self.port, 'shard_workers': 0, **config}
+        self.coordinator = ShardCoordinator(
+            self.config, tents, self._process, interval_fn=lambda tent: 10, initial_delay=initial_delay,
+        )
+        self._task = None
+
+    async def _process(self, tent, result):
+        self.processed.append((tent['id'], result.available_dates))
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self.coordinator.run())
+        await asyncio.sleep(0.05)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        await self.coordinator.close()
+
+    def owners(self):
+        return {tent_id: lease.worker_id for tent_id, lease in self.coordinator._leases.items()}
+
+
+class RawWorker:
+    """Speaks the worker side of the protocol by hand."""
+
+    @classmethod
+    async def connect(cls, port, worker_id, capacity=2, secret=None):
+        self = cls()
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', port)
+        await self.send({'type': 'hello', 'worker': worker_id, 'capacity': capacity, 'secret': secret})
+        self.welcome = await self.receive()
+        return self
+
+    async def send(self, message):
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        await self.writer.drain()
+
+    async def receive(self, timeout=1.0):
+        line = await asyncio.wait_for(self.reader.readline(), timeout)
+        return json.loads(line) if line else None
+
+    async def assignments(self, count):
+        return {m['tent']['id']: m for m in [await self.receive() for _ in range(count)]}
+
+    def close(self):
+        self.writer.close()
+
+
+def _scraper(calls):
+    async def scrape(tent, previous_fingerprint, previous_times, config):
+        calls.append(tent['id'])
+        return ScrapeResult(success=True, dates_available=True, available_dates=[{'value': tent['id']}])
+    return scrape
+
+
+def test_worker_checks_every_leased_tent_once():
+    calls = []
+
+    async def scenario():
+        async with Harness() as harness:
+            worker = ShardWorker(f"127.0.0.1:{harness.port}", 'w1', _scraper(calls), capacity=4)
+            task = asyncio.create_task(worker.run())
+            await asyncio.sleep(0.3)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return harness.processed
+
+    processed = asyncio.run(scenario())
+    assert sorted(calls) == ['t0', 't1', 't2', 't3']
+    assert sorted(processed) == [(t['id'], [{'value': t['id']}]) for t in TENTS]
+
+
+def test_tents_are_spread_over_workers_and_never_leased_twice():
+    async def scenario():
+        async with Harness() as harness:
+            first = await RawWorker.connect(harness.port, 'w1')
+            assert first.welcome['type'] == 'welcome'
+            await first.assignments(4)
+            second = await RawWorker.connect(harness.port, 'w2')
+            await asyncio.sleep(0.1)
+            owners = harness.owners()
+            first.close()
+            second.close()
+            return owners
+
+    owners = asyncio.run(scenario())
+    assert sorted(owners) == ['t0', 't1', 't2', 't3']
+    assert sorted(owners.values()) == ['w1', 'w1', 'w2', 'w2']
+
+
+def test_moved_tents_keep_their_initial_delay():
+    async def scenario():
+        async with Harness(initial_delay=lambda tent: 7.0) as harness:
+            first = await RawWorker.connect(harness.port, 'w1')
+            initial = await first.assignments(4)
+            second = await RawWorker.connect(harness.port, 'w2')
+            moved = await second.assignments(2)
+            first.close()
+            second.close()
+            return initial, moved
+
+    initial, moved = asyncio.run(scenario())
+    assert [m['delay'] for m in initial.values()] == [7.0] * 4
+    assert [m['delay'] for m in moved.values()] == [7.0] * 2
+
+
+def test_tents_of_a_disconnected_worker_are_reassigned():
+    async def scenario():
+        async with Harness() as harness:
+            first = await RawWorker.connect(harness.port, 'w1')
+            second = await RawWorker.connect(harness.port, 'w2')
+            await asyncio.sleep(0.1)
+            first.close()
+            await asyncio.sleep(0.1)
+            owners = harness.owners()
+            second.close()
+            return owners
+
+    owners = asyncio.run(scenario())
+    assert sorted(owners) == ['t0', 't1', 't2', 't3']
+    assert set(owners.values()) == {'w2'}
+
+
+def test_results_with_a_stale_token_are_fenced_off():
+    async def scenario():
+        async with Harness() as harness:
+            worker = await RawWorker.connect(harness.port, 'w1')
+            assigned = await worker.assignments(4)
+            token = assigned['t0']['token']
+            result = ScrapeResult(success=True, dates_available=True, available_dates=[{'value': 'x'}]).to_dict()
+
+            await worker.send({'type': 'result', 'id': 1, 'tent': 't0', 'token': token - 1, 'result': result})
+            stale = await worker.receive()
+            await worker.send({'type': 'result', 'id': 2, 'tent': 't0', 'token': token, 'result': result})
+            current = await worker.receive()
+            worker.close()
+            return stale, current, harness.processed
+
+    stale, current, processed = asyncio.run(scenario())
+    assert stale['revoked'] is True
+    assert current['id'] == 2 and not current.get('revoked') and current['interval'] == 10
+    assert processed == [('t0', [{'value': 'x'}])]
+
+
+def test_results_larger_than_the_default_stream_limit_are_accepted():
+    async def scenario():
+        async with Harness() as harness:
+            worker = await RawWorker.connect(harness.port, 'w1')
+            assigned = await worker.assignments(4)
+            dates = [{'value': str(i), 'text': 'x' * 1000} for i in range(200)]
+            result = ScrapeResult(success=True, dates_available=True, available_dates=dates).to_dict()
+            await worker.send({'type': 'result', 'id': 1, 'tent': 't0', 'token': assigned['t0']['token'], 'result': result})
+            ack = await worker.receive()
+            worker.close()
+            return ack, harness.processed
+
+    ack, processed = asyncio.run(scenario())
+    assert ack['id'] == 1 and not ack.get('revoked')
+    assert len(processed[0][1]) == 200
+
+
+def test_result_for_a_removed_tent_is_acked_as_revoked():
+    async def scenario():
+        async with Harness() as harness:
+            worker = await RawWorker.connect(harness.port, 'w1')
+            assigned = await worker.assignments(4)
+            # Removed from tents.json, but the revoke has not reached the worker yet.
+            del harness.coordinator.tents['t0']
+            result = ScrapeResult(success=True).to_dict()
+            await worker.send({'type': 'result', 'id': 1, 'tent': 't0', 'token': assigned['t0']['token'], 'result': result})
+            ack = await worker.receive()
+            worker.close()
+            return ack, harness.processed
+
+    ack, processed = asyncio.run(scenario())
+    assert ack['revoked'] is True
+    assert processed == []
+
+
+def test_coordinator_refuses_an_open_host_without_a_token():
+    coordinator = ShardCoordinator({'shard_host': '0.0.0.0', 'shard_workers': 0}, TENTS, None, interval_fn=None)
+    with pytest.raises(ValueError, match='shard_token'):
+        asyncio.run(coordinator.run())
+
+
+def test_worker_that_stops_renewing_loses_its_leases():
+    async def scenario():
+        async with Harness(shard_lease_ttl=0.3) as harness:
+            silent = await RawWorker.connect(harness.port, 'silent')
+            await silent.assignments(4)
+            await asyncio.sleep(0.6)
+            owners = harness.owners()
+            silent.close()
+            return owners
+
+    assert asyncio.run(scenario()) == {}
+
+
+def test_renewing_worker_keeps_its_leases():
+    async def scenario():
+        async with Harness(shard_lease_ttl=0.3) as harness:
+            worker = await RawWorker.connect(harness.port, 'w1')
+            for _ in range(6):
+                await asyncio.sleep(0.1)
+                await worker.send({'type': 'renew'})
+            owners = harness.owners()
+            worker.close()
+            return owners
+
+    assert set(asyncio.run(scenario()).values()) == {'w1'}
+
+
+def test_worker_with_a_wrong_token_is_rejected():
+    async def scenario():
+        async with Harness(shard_token='secret') as harness:
+            rejected = await RawWorker.connect(harness.port, 'w1', secret='guess')
+            accepted = await RawWorker.connect(harness.port, 'w2', secret='secret')
+            owners = harness.owners()
+            rejected.close()
+            accepted.close()
+            return rejected.welcome, accepted.welcome, owners
+
+    rejected, accepted, owners = asyncio.run(scenario())
+    assert rejected is None
+    assert accepted['type'] == 'welcome'
+    assert 'shard_token' not in accepted['config']
+    assert set(owners.values()) == {'w2'}
+
+
+@pytest.mark.parametrize('revoked', [True, False])
+def test_worker_follows_the_ack(revoked):
+    calls = []
+    released = []
+
+    async def release(tent_id):
+        released.append(tent_id)
+
+    async def scenario():
+        worker = ShardWorker('127.0.0.1:1', 'w1', _scraper(calls), release=release)
+        worker._tokens['t0'] = 1
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+            worker._acks[message['id']].set_result({'revoked': revoked, 'interval': 42, 'times': {'d': {}}})
+
+        worker._send = send
+        await worker._run_check(TENTS[0])
+        await asyncio.sleep(0)
+        return worker, sent
+
+    worker, sent = asyncio.run(scenario())
+    assert sent[0]['token'] == 1
+    if revoked:
+        assert 't0' not in worker._tokens
+        assert released == ['t0']
+    else:
+        assert released == []
+        assert worker._interval_for(TENTS[0]) == 42
+        assert worker._state['t0']['times'] == {'d': {}}
@@ -0,0 +1,84 @@
+"""SqliteStateManager: snapshots, availability history and slots_seen_since"""
+
+import json
+import time
+
+import pytest
+
+from oktoberfest_bot.sqlite_state_manager import SqliteStateManager
+
+DATES = [{'value': '19', 'text': 'Fr, 19.09.'}, {'value': '20', 'text': 'Sa, 20.09.'}]
+TIMES = {'19': {'date_text': 'Fr, 19.09.', 'times': [{'value': '101', 'text': 'Mittag'}]}}
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / 'state.sqlite')
+
+
+def _events(history):
+    return sorted((h['event'], h['date_value'], h['time_value'] or '') for h in history)
+
+
+def test_appearing_and_vanishing_dates_and_times_are_recorded(db_file):
+    state = SqliteStateManager(db_file)
+    state.mark_check_success('a', True, DATES, TIMES)
+    assert _events(state.get_history('a')) == [
+        ('appeared', '19', ''), ('appeared', '19', '101'), ('appeared', '20', ''),
+    ]
+
+    state.mark_check_success('a', True, DATES[:1], {})
+    assert _events(state.get_history('a', event='vanished')) == [('vanished', '19', '101'), ('vanished', '20', '')]
+    state.close()
+
+
+def test_unchanged_check_records_no_history(db_file):
+    state = SqliteStateManager(db_file)
+    state.mark_check_success('a', True, DATES, TIMES)
+    state.mark_check_success('a', True, DATES, TIMES)
+    assert len(state.get_history('a')) == 3
+    state.close()
+
+
+def test_snapshots_and_history_survive_a_reopen(db_file):
+    state = SqliteStateManager(db_file)
+    state.mark_check_success('a', True, DATES, TIMES)
+    state.mark_check_error('b')
+    state.close()
+
+    reopened = SqliteStateManager(db_file)
+    assert reopened.get_available_dates('a') == DATES
+    assert reopened.get_available_times('a') == TIMES
+    assert reopened.get_consecutive_errors('b') == 1
+    assert len(reopened.get_history()) == 3
+    reopened.close()
+
+
+def test_slots_seen_since_filters_by_age_and_tent(db_file):
+    state = SqliteStateManager(db_file)
+    state.mark_check_success('a', True, DATES[:1], {})
+    state.mark_check_success('b', True, DATES[1:], {})
+    state.flush()
+    # Age tent a's entries by two hours.
+    with state.conn:
+        state.conn.execute(
+            'UPDATE availability_history SET observed_at = ? WHERE tent_id = ?', (time.time() - 7200, 'a'))
+
+    assert [h['tent_id'] for h in state.slots_seen_since(1)] == ['b']
+    assert {h['tent_id'] for h in state.slots_seen_since(3)} == {'a', 'b'}
+    assert [h['date_value'] for h in state.slots_seen_since(3, tent_id='a')] == ['19']
+    state.close()
+
+
+def test_json_state_is_imported_once(db_file, tmp_path):
+    json_file = tmp_path / 'state.json'
+    json_file.write_text(json.dumps({'a': {'dates_available': True, 'available_dates': DATES}}))
+
+    state = SqliteStateManager(db_file, import_json=str(json_file))
+    assert state.get_available_dates('a') == DATES
+    state.close()
+
+    json_file.write_text(json.dumps({'a': {'dates_available': False, 'available_dates': []}}))
+    reopened = SqliteStateManager(db_file, import_json=str(json_file))
+    assert reopened.get_available_dates('a') == DATES
+    reopened.close()